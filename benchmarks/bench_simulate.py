@@ -0,0 +1,83 @@
+"""Politika karşılaştırması: sentetik DM trafiğini sanal saatle botun döngüsünden geçirir.
+
+Her ayar ayrı bir Python sürecinde ve boş bir veritabanıyla çalışır; Instagram
+yerine API çağrılarını sayan ve saatlik limit aşımında kısıtlama hatası
+veren sahte bir istemci kullanılır.
+
+Kullanım:
+    python benchmarks/bench_simulate.py --days 3 --users 200
+    python benchmarks/bench_simulate.py --interval 25 45 --interval 10 20 --api-limit 150
+    python benchmarks/bench_simulate.py --days 7 --output sim_output.txt
+    python benchmarks/bench_simulate.py --comments 5 --api-limit 0
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SIMULATE_SNIPPET = """
+import sys, json, logging
+sys.path.insert(0, {root!r})
+logging.disable(logging.CRITICAL)
+from instagram_ai import Config
+from instagram_ai.simulator import Simulator
+
+Config.CHECK_INTERVAL = {interval!r}
+Config.CONTROL_SOCKET = ""
+sim = Simulator({workdir!r}, users={users!r}, messages_per_day={rate!r}, days={days!r},
+                api_limit={api_limit!r}, seed={seed!r}, comments_per_day={comments!r})
+print(json.dumps(sim.run()))
+"""
+
+
+def simulate(workdir: str, **settings) -> dict:
+    """Tek ayarı yeni bir süreçte simüle et"""
+    code = SIMULATE_SNIPPET.format(root=ROOT, workdir=workdir, **settings)
+    result = subprocess.run(
+        [sys.executable, '-c', code],
+        cwd=workdir, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--days', type=float, default=1.0)
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--rate', type=float, default=10.0, help='Kullanıcı başına günlük mesaj')
+    parser.add_argument('--interval', type=float, nargs=2, action='append', metavar=('MIN', 'MAX'),
+                        help='Kontrol aralığı (saniye); birden çok verilirse karşılaştırılır')
+    parser.add_argument('--comments', type=float, default=0.0, help='Kullanıcı başına günlük gönderi yorumu')
+    parser.add_argument('--api-limit', type=int, default=200, help='Saatlik API çağrısı limiti (0: sınırsız)')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help='Sonuçları JSON satırı olarak bu dosyaya ekle')
+    args = parser.parse_args()
+
+    results = []
+    for interval in args.interval or [(25.0, 45.0)]:
+        with tempfile.TemporaryDirectory() as workdir:
+            results.append(simulate(workdir, interval=tuple(interval), users=args.users, rate=args.rate,
+                                    days=args.days, api_limit=args.api_limit, seed=args.seed,
+                                    comments=args.comments))
+
+    for r in results:
+        ttr = r['time_to_reply']
+        print(f"interval {r['check_interval'][0]:>5.0f}-{r['check_interval'][1]:<5.0f} "
+              f"msgs {r['messages']:>6} replied {r['replied']:>6} | "
+              f"ttr p50 {ttr['p50_s']:>7} s p95 {ttr['p95_s']:>7} s | "
+              f"comments {r['comment_replies']:>5}/{r['comments']:<5} | "
+              f"api {sum(r['api_calls'].values()):>6} throttled {r['throttle_events']:>4} | "
+              f"wall {r['wall_s']} s")
+
+    if args.output:
+        with open(args.output, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'time': time.time(), 'results': results}) + '\n')
+
+
+if __name__ == '__main__':
+    main()
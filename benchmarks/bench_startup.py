@@ -0,0 +1,111 @@
+"""Soğuk başlangıç ölçümü: import süresi ve ilk mesaj kontrolüne (poll) kadar geçen süre.
+
+Her ölçüm ayrı bir Python sürecinde yapılır; Instagram yerine ilk
+direct_threads çağrısında süreyi raporlayıp çıkan sahte bir istemci kullanılır.
+
+Kullanım:
+    python benchmarks/bench_startup.py --runs 10
+    python benchmarks/bench_startup.py --runs 10 --output bench_output.txt
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SNIPPET = """
+import sys, time, json
+t0 = time.perf_counter()
+sys.path.insert(0, {root!r})
+import main
+print(json.dumps({{'import': time.perf_counter() - t0}}))
+"""
+
+FIRST_POLL_SNIPPET = """
+import sys, os, time, json
+t0 = time.perf_counter()
+sys.path.insert(0, {root!r})
+import main
+t_import = time.perf_counter()
+
+main.Config.DB_FILE = os.path.join({workdir!r}, 'bench.db')
+main.Config.JOURNAL_DIR = os.path.join({workdir!r}, 'journal')
+main.Config.CHECK_INTERVAL = (0, 0)
+
+class FakeClient:
+    user_id = 0
+
+    def direct_threads(self, amount=20):
+        print(json.dumps({{
+            'import': t_import - t0,
+            'first_poll': time.perf_counter() - t0
+        }}))
+        sys.stdout.flush()
+        os._exit(0)
+
+bot = main.InstagramAIBot()
+bot.__dict__['client'] = FakeClient()
+bot.login = lambda: True
+bot.run()
+"""
+
+
+def measure(snippet: str, workdir: str) -> dict:
+    """Snippet'i yeni bir süreçte çalıştır, süreleri (ve toplam süreç süresini) döndür"""
+    code = snippet.format(root=ROOT, workdir=workdir)
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-c', code],
+        cwd=workdir, capture_output=True, text=True, check=True
+    )
+    wall = time.perf_counter() - start
+
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    timings['process'] = wall
+    return timings
+
+
+def summarize(samples: list) -> dict:
+    keys = samples[0].keys()
+    return {
+        key: {
+            'median_ms': round(statistics.median(s[key] for s in samples) * 1000, 1),
+            'min_ms': round(min(s[key] for s in samples) * 1000, 1)
+        }
+        for key in keys
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--output', help='Sonuçları JSON satırı olarak bu dosyaya ekle')
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        results['import'] = summarize([measure(IMPORT_SNIPPET, workdir) for _ in range(args.runs)])
+
+        first_poll = []
+        for _ in range(args.runs):
+            # Her koşu boş bir veritabanıyla başlar (gerçek soğuk başlangıç)
+            with tempfile.TemporaryDirectory() as run_dir:
+                first_poll.append(measure(FIRST_POLL_SNIPPET, run_dir))
+        results['first_poll'] = summarize(first_poll)
+
+    for name, metrics in results.items():
+        for key, value in metrics.items():
+            print(f"{name:>10} {key:>10}: median {value['median_ms']:>8} ms  min {value['min_ms']:>8} ms")
+
+    if args.output:
+        with open(args.output, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'time': time.time(), 'runs': args.runs, 'results': results}) + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""Instagram AI asistan botu.
+
+Alt modüller ilk erişimde içe aktarılır; `import instagram_ai` soğuk
+başlangıçta hiçbir ağır bağımlılığı yüklemez.
+"""
+import importlib
+
+__version__ = "3.0.0"
+
+# Dışa açık ad -> tanımlandığı alt modül
+_EXPORTS = {
+    'Config': 'config',
+    'setup_logger': 'log',
+    'shutdown_logger': 'log',
+    'SystemClock': 'clock',
+    'VirtualClock': 'clock',
+    'TimerWheel': 'timers',
+    'EventJournal': 'journal',
+    'StateProjection': 'journal',
+    'Database': 'database',
+    'RollupStore': 'rollups',
+    'UserStats': 'models',
+    'BotStats': 'models',
+    'NewsItem': 'models',
+    'FeedState': 'models',
+    'CommandCategory': 'models',
+    'SingleFlight': 'providers',
+    'RateHistory': 'rates',
+    'DataProvider': 'providers',
+    'ContentManager': 'content',
+    'Question': 'questions',
+    'QuestionBank': 'questions',
+    'GameState': 'games',
+    'GameStore': 'games',
+    'GameEngine': 'games',
+    'SecurityManager': 'security',
+    'LazyAttribute': 'utils',
+    'Utilities': 'utils',
+    'CostClass': 'commands',
+    'CommandSpec': 'commands',
+    'CommandRegistry': 'commands',
+    'create_registry': 'commands',
+    'MessageChunker': 'chunker',
+    'ReplyBuffer': 'chunker',
+    'Response': 'templates',
+    'ResponseTemplate': 'templates',
+    'ResponseTemplates': 'templates',
+    'create_templates': 'templates',
+    'SessionManager': 'auth',
+    'AdminConsole': 'admin',
+    'ControlServer': 'admin',
+    'CommentPipeline': 'comments',
+    'TokenBucket': 'resilience',
+    'Checkpoint': 'checkpoint',
+    'FairScheduler': 'scheduler',
+    'LoadController': 'load',
+    'PushIngestor': 'ingest',
+    'EventSource': 'ingest',
+    'WebhookSource': 'ingest',
+    'RealtimeSource': 'ingest',
+    'InstagramAIBot': 'bot',
+    'LocalQueue': 'workqueue',
+    'Poller': 'pipeline',
+    'Worker': 'pipeline',
+    'Sender': 'pipeline',
+    'run_mode': 'pipeline',
+    'FakeClient': 'simulator',
+    'Simulator': 'simulator',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,423 @@
+"""Yönetim kanalı: yönetici DM komutları ve yerel kontrol soketi.
+
+Aynı komutlar iki yoldan çalışır:
+    * Config.ADMIN_IDS'teki kullanıcıların '/' ile başlayan DM'leri ("/stats")
+    * Yerel soket: python -m instagram_ai.admin stats
+"""
+import logging
+import os
+import socket
+import socketserver
+import sys
+import threading
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Set, Tuple
+
+from .config import Config
+
+if TYPE_CHECKING:
+    from .bot import InstagramAIBot
+    from .workqueue import LocalQueue
+
+logger = logging.getLogger(__name__)
+
+
+class AdminConsole:
+    """Yönetici komutlarını çözümler ve çalıştırır.
+    
+    Kuyruk modunda (`SHARED_ADMIN`) yönetici DM'i bir işçide, kontrol soketi
+    çekicide çalışır; 'set' ve 'cache' değişiklikleri bu yüzden kuyruk
+    dosyasına yazılır ve diğer süreçler `sync_shared` ile aynı sırayla
+    uygular. Diğer komutlar ya zaten ortak veritabanından okur (engeller)
+    ya da yalnızca çalıştığı sürecin durumunu gösterir (stats, load).
+    """
+    
+    SHARED_COMMANDS = ('set', 'cache')
+    
+    def __init__(self, bot: 'InstagramAIBot'):
+        self.bot = bot
+        self.last_challenge: Optional[Dict] = None
+        
+        # Süreçler arası yönetim değişiklikleri
+        self._shared_queue: Optional['LocalQueue'] = None
+        self._shared_version = 0
+        self._shared_checked = 0.0
+        self._published: Set[int] = set()
+        self._applying = False
+        self._commands: Dict[str, Tuple[Callable[[List[str]], str], str]] = {
+            'help': (self._help, "- Komut listesi"),
+            'stats': (self._stats, "- Kuyruklar, önbellek isabetleri, en yavaş komutlar"),
+            'load': (self._load, "- Aşırı yük modu ve atlanan işler"),
+            'limits': (self._limits, "<user_id> - Kullanıcının hız sınırı durumu"),
+            'get': (self._get, "[parametre] - Ayarlanabilir parametreleri göster"),
+            'set': (self._set, "<parametre> <değer> - Çalışırken ayarla "
+                               "(poll_interval, rate_limit, command_limit, cache_ttl, news_workers)"),
+            'cache': (self._cache, "flush [komut] | warm - Önbelleği temizle / ısıt"),
+            'block': (self._block, "<user_id> [dakika] - Kullanıcıyı engelle (süre verilmezse kalıcı)"),
+            'unblock': (self._unblock, "<user_id> - Engeli kaldır"),
+            'blocked': (self._blocked, "- Engelli kullanıcılar"),
+            'activity': (self._activity, "[hour|day] [adet] - Mesaj etkinliği"),
+            'deadletters': (self._dead_letters, "[adet] - Karantinadaki mesajlar"),
+            'challenge': (self._challenge, "<kod> - Instagram doğrulama kodunu gönder"),
+        }
+        
+        # Çalışırken değiştirilebilen parametreler: ad -> (okuyucu, yazıcı)
+        self.tunables: Dict[str, Tuple[Callable[[], str], Callable[[List[str]], None]]] = {
+            'poll_interval': (lambda: '-'.join(f"{v:g}" for v in Config.CHECK_INTERVAL), self._set_poll_interval),
+            'rate_limit': (lambda: str(Config.MAX_MESSAGES_PER_MINUTE), self._set_rate_limit),
+            'command_limit': (lambda: str(Config.COMMAND_RATE_LIMITS), self._set_command_limit),
+            'cache_ttl': (self._get_cache_ttls, self._set_cache_ttl),
+            'news_workers': (lambda: str(Config.NEWS_WORKERS), self._set_news_workers),
+        }
+    
+    def execute(self, line: str) -> str:
+        """Tek komut satırını çalıştır"""
+        parts = line.strip().split()
+        if not parts:
+            return self._help([])
+        
+        name = parts[0].lower()
+        entry = self._commands.get(name)
+        if entry is None:
+            return f"Bilinmeyen yönetim komutu: {parts[0]}. 'help' yaz."
+        
+        try:
+            response = entry[0](parts[1:])
+        except (ValueError, IndexError, KeyError) as e:
+            return f"Hatalı kullanım: {e}"
+        
+        if name in self.SHARED_COMMANDS and response.startswith(('✅', '🧹', '🔥')):
+            response += self._publish(" ".join([name] + parts[1:]))
+        return response
+    
+    # ---- Süreçler arası değişiklikler ----
+    
+    @property
+    def shared_queue(self) -> 'LocalQueue':
+        if self._shared_queue is None:
+            from .workqueue import LocalQueue
+            
+            self._shared_queue = LocalQueue(clock=self.bot.clock)
+        return self._shared_queue
+    
+    def _publish(self, line: str) -> str:
+        """Başarılı 'set'/'cache' komutunu diğer süreçlere ilet; cevaba eklenecek notu döndürür"""
+        if not Config.SHARED_ADMIN or self._applying:
+            return ""
+        self._published.add(self.shared_queue.publish_admin_change(line))
+        return " (tüm süreçlere iletildi)"
+    
+    def sync_shared(self):
+        """Diğer süreçlerin yayınladığı değişiklikleri sırayla uygula (en fazla `ADMIN_SYNC_INTERVAL`'da bir)"""
+        if not Config.SHARED_ADMIN:
+            return
+        now = self.bot.clock.time()
+        if now - self._shared_checked < Config.ADMIN_SYNC_INTERVAL:
+            return
+        self._shared_checked = now
+        
+        for version, line in self.shared_queue.admin_changes(self._shared_version):
+            self._shared_version = version
+            if version in self._published:
+                self._published.discard(version)
+                continue
+            
+            self._applying = True
+            try:
+                response = self.execute(line)
+            finally:
+                self._applying = False
+            logger.info(f"Applied shared admin change #{version} '{line}': {response}")
+    
+    def on_challenge(self, challenge: Dict):
+        """SessionManager doğrulama kodu istediğinde çağrılır"""
+        self.last_challenge = challenge
+        logger.warning(f"Admin action required: send 'challenge <code>' ({challenge['choice']})")
+    
+    # ---- Komutlar ----
+    
+    def _help(self, args: List[str]) -> str:
+        lines = ["🛠️ Yönetim komutları:"]
+        lines.extend(f"• {name} {desc}" for name, (_, desc) in self._commands.items())
+        return "\n".join(lines)
+    
+    def _stats(self, args: List[str]) -> str:
+        bot = self.bot
+        lines = ["📊 Çalışma durumu", ""]
+        
+        # Kuyruk derinlikleri
+        from .log import queue_depth
+        
+        lines.append(f"Yük modu: {bot.load.mode}")
+        lines.append("")
+        lines.append("Kuyruklar:")
+        lines.append(f"• Gönderim tamponu: {len(bot.outbox)} sohbet")
+        lines.append(f"• Log kuyruğu: {queue_depth()}")
+        if 'db' in bot.__dict__:
+            lines.append(f"• Bekleyen sayaç yazımı: {bot.db.rollups.pending}")
+            lines.append(f"• Aktif oturum: {bot.db.session_count()}")
+        if 'isolator' in bot.__dict__:
+            lines.append(f"• Geri çekilen sohbet: {bot.isolator.backed_off_threads()}")
+        
+        # Önbellek isabet oranları
+        lines.append("")
+        lines.append("Önbellek:")
+        for spec in bot.commands:
+            if not spec.cache_ttl:
+                continue
+            m = bot.commands.metrics[spec.name]
+            total = m.calls + m.cache_hits
+            rate = m.cache_hits / total * 100 if total else 0.0
+            lines.append(f"• {spec.name}: %{rate:.0f} ({m.cache_hits}/{total}, ttl {spec.cache_ttl:g}s)")
+        flights = bot.data_provider.flight_stats()
+        lines.append(f"• upstream birleştirme: {flights['deduplicated']}/{flights['calls']}")
+        lines.append(f"• şablon derleme: {bot.templates.builds}")
+        
+        # En yavaş komutlar
+        slowest = sorted(
+            ((name, m) for name, m in bot.commands.metrics.items() if m.calls),
+            key=lambda item: item[1].avg_time, reverse=True
+        )[:5]
+        lines.append("")
+        lines.append("En yavaş komutlar (ort / en fazla):")
+        if not slowest:
+            lines.append("• Henüz veri yok.")
+        for name, m in slowest:
+            lines.append(f"• {name}: {m.avg_time * 1000:.1f} / {m.max_time * 1000:.1f} ms "
+                         f"({m.calls} çağrı, {m.errors} hata, {m.rate_limited} sınır)")
+        
+        if self.last_challenge:
+            lines.append("")
+            lines.append(f"⚠️ Doğrulama kodu bekleniyor ({self.last_challenge['choice']})")
+        
+        return "\n".join(lines)
+    
+    def _load(self, args: List[str]) -> str:
+        state = self.bot.load.snapshot()
+        lines = [
+            f"⚖️ Mod: {state['mode']}" + (f" ({state['reason']})" if state['reason'] else ""),
+            f"• Bu modda: {state['mode_seconds']:.0f}s | geçiş: {state['transitions']} | "
+            f"toplam kademeli: {state['degraded_seconds']:.0f}s",
+            f"• Son tur: derinlik {state['depth']}, p95 gecikme {state['p95_latency']:.2f}s",
+            f"• Atlanan: günlük {state['shed']['log_message']}, ertelenen {state['shed']['deferred']}, "
+            f"yorum turu {state['shed']['comment_poll']}",
+            f"• Bayat önbellek: {sum(m.stale_hits for m in self.bot.commands.metrics.values())}"
+        ]
+        return "\n".join(lines)
+    
+    def _limits(self, args: List[str]) -> str:
+        user_id = int(args[0])
+        bot = self.bot
+        
+        recent, spam = bot.security.counters.snapshot(user_id)
+        lines = [
+            f"👤 {user_id} hız sınırı durumu:",
+            f"• Mesaj: {recent:.0f}/{Config.MAX_MESSAGES_PER_MINUTE} (son 60 sn)",
+            f"• Spam puanı: {spam}/{Config.BLOCK_THRESHOLD}",
+            f"• Engelli: {'evet' if bot.security.is_user_blocked(user_id) else 'hayır'}"
+        ]
+        for name, (calls, limit) in sorted(bot.commands.usage(user_id).items()):
+            lines.append(f"• {name}: {calls}/{limit if limit else '∞'}")
+        return "\n".join(lines)
+    
+    def _get(self, args: List[str]) -> str:
+        names = args or list(self.tunables)
+        return "\n".join(f"{name} = {self.tunables[name][0]()}" for name in names)
+    
+    def _set(self, args: List[str]) -> str:
+        name = args[0]
+        if name not in self.tunables:
+            return f"Bilinmeyen parametre: {name}. Seçenekler: {', '.join(self.tunables)}"
+        self.tunables[name][1](args[1:])
+        logger.info(f"Runtime setting changed: {name} {' '.join(args[1:])}")
+        return f"✅ {name} = {self.tunables[name][0]()}"
+    
+    def _cache(self, args: List[str]) -> str:
+        action = args[0] if args else 'flush'
+        bot = self.bot
+        
+        if action == 'flush':
+            name = args[1] if len(args) > 1 else None
+            bot.commands.clear_cache(name)
+            if name is None:
+                bot.templates.invalidate()
+                bot.data_provider.clear_feeds()
+            return "🧹 Önbellek temizlendi" + (f" ({name})" if name else "")
+        
+        if action == 'warm':
+            threading.Thread(target=self._warm, name='cache-warm', daemon=True).start()
+            return "🔥 Önbellek ısıtılıyor"
+        
+        raise ValueError("flush [komut] | warm - Önbelleği temizle / ısıt")
+    
+    def _warm(self):
+        """Şablonları derle, paylaşılan verileri önceden çek"""
+        bot = self.bot
+        for name in ('help', 'games_menu', 'bot_info'):
+            bot.templates.get(name)
+        for spec in bot.commands:
+            if spec.module:
+                spec.resolve()
+        try:
+            bot.data_provider.get_exchange_rates()
+            bot.data_provider.get_news()
+        except Exception as e:
+            logger.error(f"Cache warm error: {e}")
+        logger.info("Cache warmed")
+    
+    def _block(self, args: List[str]) -> str:
+        user_id = int(args[0])
+        minutes = float(args[1]) if len(args) > 1 else None
+        self.bot.security.block_user(user_id, minutes * 60 if minutes else None)
+        return f"🚫 {user_id} engellendi" + (f" ({minutes:g} dk)" if minutes else "")
+    
+    def _unblock(self, args: List[str]) -> str:
+        user_id = int(args[0])
+        self.bot.security.unblock_user(user_id)
+        return f"✅ {user_id} engeli kaldırıldı"
+    
+    def _blocked(self, args: List[str]) -> str:
+        entries = self.bot.security.blocklist.entries()
+        if not entries:
+            return "Engelli kullanıcı yok."
+        lines = [f"🚫 Engelli kullanıcılar ({len(entries)}):"]
+        for user_id, until in sorted(entries.items()):
+            remaining = f"{max(0, until - self.bot.clock.time()) / 60:.0f} dk" if until else "kalıcı"
+            lines.append(f"• {user_id} ({remaining})")
+        return "\n".join(lines)
+    
+    def _activity(self, args: List[str]) -> str:
+        granularity = args[0] if args else 'hour'
+        if granularity not in ('hour', 'day'):
+            raise ValueError("hour|day")
+        limit = int(args[1]) if len(args) > 1 else 24
+        
+        rows = self.bot.db.rollups.activity(granularity, limit)
+        if not rows:
+            return "Henüz etkinlik yok."
+        peak = max(count for _, count in rows) or 1
+        lines = [f"📈 Mesaj etkinliği ({granularity}):"]
+        lines.extend(f"{bucket} {'█' * max(1, count * 20 // peak)} {count}" for bucket, count in rows)
+        return "\n".join(lines)
+    
+    def _dead_letters(self, args: List[str]) -> str:
+        rows = self.bot.db.get_dead_letters(int(args[0]) if args else 10)
+        if not rows:
+            return "Karantinada mesaj yok."
+        return "\n".join(
+            f"• {row['message_id']} ({row['user_id']}, {row['attempts']}x): {row['error']}"
+            for row in rows
+        )
+    
+    def _challenge(self, args: List[str]) -> str:
+        if not self.bot.session_manager.submit_challenge_code(args[0]):
+            return "Bekleyen doğrulama isteği yok."
+        self.last_challenge = None
+        return "✅ Kod iletildi, giriş arka planda tamamlanıyor"
+    
+    # ---- Ayar yazıcıları ----
+    
+    @staticmethod
+    def _set_poll_interval(args: List[str]):
+        low, _, high = args[0].partition('-')
+        low, high = float(low), float(high or low)
+        if low < 0 or high < low:
+            raise ValueError("poll_interval <min>-<max>")
+        Config.CHECK_INTERVAL = (low, high)
+    
+    @staticmethod
+    def _set_rate_limit(args: List[str]):
+        Config.MAX_MESSAGES_PER_MINUTE = int(args[0])
+    
+    def _set_command_limit(self, args: List[str]):
+        target, value = args[0], args[1]
+        limit = None if value.lower() in ('none', 'off', '0') else int(value)
+        
+        spec = self.bot.commands.get(target)
+        if spec is not None:
+            spec.rate_limit = limit
+        elif target in Config.COMMAND_RATE_LIMITS:
+            Config.COMMAND_RATE_LIMITS[target] = limit
+        else:
+            raise KeyError(target)
+    
+    def _get_cache_ttls(self) -> str:
+        return ", ".join(f"{spec.name}={spec.cache_ttl:g}" for spec in self.bot.commands if spec.cache_ttl)
+    
+    def _set_cache_ttl(self, args: List[str]):
+        spec = self.bot.commands.get(args[0])
+        if spec is None:
+            raise KeyError(args[0])
+        spec.cache_ttl = float(args[1])
+        self.bot.commands.clear_cache(spec.name)
+    
+    def _set_news_workers(self, args: List[str]):
+        count = int(args[0])
+        if count < 1:
+            raise ValueError("news_workers >= 1")
+        self.bot.data_provider.set_news_workers(count)
+
+class _ControlHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline(4096).decode('utf-8', 'replace')
+        response = self.server.console.execute(line)
+        self.wfile.write(response.encode('utf-8') + b"\n")
+
+class ControlServer:
+    """Yerel kontrol soketi; her bağlantı tek komut satırı gönderir, cevabı alıp kapanır"""
+    
+    def __init__(self, console: AdminConsole, path: Optional[str] = None):
+        self.console = console
+        self.path = path or Config.CONTROL_SOCKET
+        self._server: Optional[socketserver.BaseServer] = None
+    
+    def start(self):
+        if not hasattr(socket, 'AF_UNIX'):
+            logger.warning("Control socket not supported on this platform")
+            return
+        
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        
+        self._server = socketserver.ThreadingUnixStreamServer(self.path, _ControlHandler, bind_and_activate=False)
+        self._server.daemon_threads = True
+        self._server.console = self.console
+        
+        # Soket dosyası bind anında yalnızca sahibine açık oluşur (sonradan chmod arası açık kalmaz)
+        umask = os.umask(0o177)
+        try:
+            self._server.server_bind()
+        finally:
+            os.umask(umask)
+        self._server.server_activate()
+        
+        threading.Thread(target=self._server.serve_forever, name='control-socket', daemon=True).start()
+        logger.info(f"Control socket listening on {self.path}")
+    
+    def stop(self):
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+def send_command(line: str, path: Optional[str] = None, timeout: float = 10.0) -> str:
+    """Çalışan bota kontrol soketi üzerinden komut gönder"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(path or Config.CONTROL_SOCKET)
+        sock.sendall(line.encode('utf-8') + b"\n")
+        
+        chunks = []
+        while True:
+            data = sock.recv(65536)
+            if not data:
+                break
+            chunks.append(data)
+    return b"".join(chunks).decode('utf-8').rstrip("\n")
+
+
+if __name__ == "__main__":
+    print(send_command(" ".join(sys.argv[1:]) or "help"))
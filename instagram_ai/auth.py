@@ -0,0 +1,279 @@
+"""Instagram oturum yönetimi"""
+import json
+import logging
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from .clock import Clock, SystemClock
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class ChallengePending(Exception):
+    """Instagram doğrulama kodu bekleniyor; istemci giriş tamamlanana kadar kullanılamaz"""
+
+class SessionManager:
+    """Kayıtlı oturumu ucuzca doğrular, arka planda yeniler ve doğrulama kodlarını kuyruğa alır.
+    
+    Her başlangıçta tam giriş yapmak yerine önce oturum dosyası denenir; yakın
+    zamanda doğrulanmışsa ağa hiç gidilmez, değilse tek bir hafif istekle
+    kontrol edilir. Tam giriş yalnızca oturum geçersizse yapılır ve cihaz
+    kimlikleri korunur.
+    
+    İstemciye erişim tek bir kilitle sıralanır: ana döngü adımları
+    `using_client()` ile, arka plan yenilemesi ve tam giriş aynı kilitle
+    çalışır. Tam giriş ayrı bir iş parçacığında yapılır; Instagram doğrulama
+    kodu isterse çağıran beklemez, istek bekleyen olarak kaydedilir ve giriş
+    kod geldiğinde arka planda tamamlanır.
+    """
+    
+    def __init__(self, client, settings_file: Optional[str] = None, clock: Optional[Clock] = None):
+        self.client = client
+        self.clock = clock or SystemClock()
+        self.settings_file = settings_file or Config.SESSION_FILE
+        self.validated_at = 0.0
+        self.logins = 0
+        self.validations = 0
+        
+        self._lock = threading.RLock()          # İstemci erişimi
+        self._stop = threading.Event()
+        self._refresher: Optional[threading.Thread] = None
+        
+        # Tam giriş iş parçacığı; `_settled` giriş bitince ya da kod istenince kurulur
+        self._login_guard = threading.Lock()
+        self._login_thread: Optional[threading.Thread] = None
+        self._login_ok = False
+        self._settled = threading.Event()
+        
+        # Doğrulama kodu: input() ile beklemek yerine yönetici kanalına bildirilir
+        self.pending_challenge: Optional[Dict[str, Any]] = None
+        self._challenge_code: Optional[str] = None
+        self._challenge_ready = threading.Event()
+        self._challenge_listeners: List[Callable[[Dict[str, Any]], None]] = []
+        client.challenge_code_handler = self._challenge_code_handler
+    
+    # ---- Giriş ----
+    
+    def login(self) -> bool:
+        """Oturumu hazırla: önce kayıtlı oturum, gerekirse tam giriş"""
+        with self._lock:
+            if self._load():
+                try:
+                    if self.validate():
+                        logger.info("Session restored from file")
+                        return True
+                except Exception as e:
+                    logger.warning(f"Stored session rejected: {e}")
+        
+        return self.relogin()
+    
+    @property
+    def challenge_pending(self) -> bool:
+        return self.pending_challenge is not None
+    
+    def relogin(self) -> bool:
+        """Tam giriş (cihaz kimlikleri korunarak).
+        
+        Giriş bitene ya da doğrulama kodu istenene kadar bekler. Kod
+        istenirse False döner; giriş iş parçacığı kodu bekler ve kod
+        `submit_challenge_code` ile gelince girişi tamamlar.
+        """
+        with self._login_guard:
+            if self.challenge_pending:
+                return False
+            if self._login_thread is None or not self._login_thread.is_alive():
+                self._login_ok = False
+                self._settled.clear()
+                self._login_thread = threading.Thread(target=self._login_worker, name='login', daemon=True)
+                self._login_thread.start()
+        
+        self._settled.wait()
+        return self._login_ok and not self.challenge_pending
+    
+    def _login_worker(self):
+        try:
+            with self._lock:
+                self._login_ok = self._full_login()
+        finally:
+            self._settled.set()
+    
+    def _full_login(self) -> bool:
+        from instagrapi.exceptions import ChallengeRequired, TwoFactorRequired
+        
+        uuids = self.client.get_settings().get('uuids')
+        self.client.set_settings({})
+        if uuids:
+            self.client.set_uuids(uuids)
+        
+        logger.info("Logging in to Instagram...")
+        try:
+            if not self.client.login(Config.INSTA_USER, Config.INSTA_PASS):
+                logger.error("Login failed")
+                return False
+        except ChallengeRequired:
+            logger.error("Challenge required and could not be resolved")
+            return False
+        except TwoFactorRequired:
+            logger.error("Two-factor authentication required")
+            return False
+        except Exception as e:
+            logger.error(f"Login error: {e}")
+            return False
+        
+        self.logins += 1
+        self.validated_at = self.clock.time()
+        self.save()
+        logger.info("Login successful")
+        return True
+    
+    @contextmanager
+    def using_client(self) -> Iterator[Any]:
+        """İstemciyi kullanan işi giriş ve yenilemeyle sırala.
+        
+        Doğrulama kodu beklenirken beklemeden ChallengePending fırlatır;
+        çağıran tur atlayıp diğer işlerine devam eder.
+        """
+        while self.challenge_pending or not self._lock.acquire(timeout=0.5):
+            if self.challenge_pending:
+                raise ChallengePending("Waiting for challenge code")
+        try:
+            yield self.client
+        finally:
+            self._lock.release()
+    
+    def validate(self, force: bool = False) -> bool:
+        """Oturum geçerli mi; yakın zamanda doğrulandıysa ağ isteği yapılmaz"""
+        if not self.client.sessionid or not self.client.user_id:
+            return False
+        if not force and self.clock.time() - self.validated_at < Config.SESSION_VALIDATE_INTERVAL:
+            return True
+        
+        # Tek hafif istek; geçersiz oturumda LoginRequired fırlatır
+        self.client.get_timeline_feed()
+        self.validations += 1
+        self.validated_at = self.clock.time()
+        self.save()
+        return True
+    
+    def reconnect(self):
+        """Geçici ağ hatasından sonra bağlantı havuzunu sıfırla (yeniden giriş yapmadan)"""
+        session = getattr(self.client, 'private', None)
+        if session is not None:
+            session.close()
+        logger.debug("HTTP connections reset")
+    
+    # ---- Kalıcılık ----
+    
+    def _load(self) -> bool:
+        if not os.path.exists(self.settings_file):
+            return False
+        
+        try:
+            with open(self.settings_file, 'r', encoding='utf-8') as f:
+                settings = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to load session: {e}")
+            return False
+        
+        self.validated_at = settings.pop('validated_at', 0.0)
+        self.client.set_settings(settings)
+        return True
+    
+    def save(self):
+        """Oturum ayarlarını atomik olarak yaz (yarım yazılmış dosya kalmaz)"""
+        settings = self.client.get_settings()
+        settings['validated_at'] = self.validated_at
+        
+        directory = os.path.dirname(os.path.abspath(self.settings_file))
+        fd, tmp_path = tempfile.mkstemp(prefix='.session-', dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(settings, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.settings_file)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+    
+    # ---- Arka plan yenileme ----
+    
+    def start_refresh(self):
+        """Oturumu süresi dolmadan periyodik olarak doğrula/yenile"""
+        if self._refresher and self._refresher.is_alive():
+            return
+        self._stop.clear()
+        self._refresher = threading.Thread(target=self._refresh_loop, name='session-refresh', daemon=True)
+        self._refresher.start()
+    
+    def stop(self):
+        self._stop.set()
+        self._challenge_ready.set()
+    
+    def _refresh_loop(self):
+        from instagrapi.exceptions import LoginRequired
+        
+        while not self._stop.wait(Config.SESSION_REFRESH_INTERVAL):
+            if self.challenge_pending:
+                continue
+            try:
+                with self.using_client():
+                    self.validate(force=True)
+                logger.debug("Session refreshed")
+            except ChallengePending:
+                continue
+            except LoginRequired:
+                logger.warning("Session expired, logging in again")
+                self.relogin()
+            except Exception as e:
+                logger.error(f"Session refresh error: {e}")
+    
+    # ---- Doğrulama kodu ----
+    
+    def add_challenge_listener(self, callback: Callable[[Dict[str, Any]], None]):
+        """Doğrulama kodu istendiğinde çağrılacak fonksiyonu ekle (yönetici bildirimi)"""
+        self._challenge_listeners.append(callback)
+    
+    def submit_challenge_code(self, code: str) -> bool:
+        """Yönetici kanalından gelen doğrulama kodunu bekleyen girişe ilet (giriş arka planda sürer)"""
+        if not self.pending_challenge:
+            return False
+        self._challenge_code = code.strip()
+        self._challenge_ready.set()
+        return True
+    
+    def _challenge_code_handler(self, username: str, choice) -> str:
+        """instagrapi kanca noktası; yalnızca giriş iş parçacığında çalışır.
+        
+        İsteği bekleyen olarak kaydeder, yöneticiye bildirir ve `relogin`
+        çağıranını serbest bırakır; kod gelene kadar yalnızca giriş iş
+        parçacığı bekler.
+        """
+        self._challenge_code = None
+        self._challenge_ready.clear()
+        self.pending_challenge = {
+            'username': username,
+            'choice': getattr(choice, 'value', str(choice)),
+            'requested_at': self.clock.time()
+        }
+        
+        logger.warning(f"Challenge code requested via {self.pending_challenge['choice']}; waiting for admin")
+        for callback in self._challenge_listeners:
+            try:
+                callback(self.pending_challenge)
+            except Exception as e:
+                logger.error(f"Challenge listener error: {e}")
+        self._settled.set()
+        
+        self._challenge_ready.wait(Config.CHALLENGE_TIMEOUT)
+        code, self._challenge_code = self._challenge_code, None
+        self.pending_challenge = None
+        
+        if not code:
+            logger.error("Challenge code not received in time")
+        return code or ""
@@ -0,0 +1,525 @@
+"""Ana bot sınıfı"""
+import logging
+import random
+import threading
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Optional, Tuple
+
+from .auth import ChallengePending, SessionManager
+from .chunker import MessageChunker, ReplyBuffer
+from .clock import Clock, SystemClock
+from .commands import create_registry
+from .config import Config
+from .content import ContentManager
+from .models import BotStats, IncomingMessage
+from .providers import DataProvider
+from .resilience import AUTH, CONNECTION, CLIENT, THROTTLE, Backoff, TokenBucket, classify_error
+from .load import DEGRADED, LoadController
+from .scheduler import NETWORK, FairScheduler, classify
+from .templates import create_templates
+from .utils import LazyAttribute, Utilities
+
+if TYPE_CHECKING:
+    from .admin import AdminConsole
+    from .checkpoint import Checkpoint
+    from .comments import CommentPipeline
+    from .database import Database
+    from .games import GameEngine
+    from .resilience import FailureIsolator
+    from .security import SecurityManager
+
+logger = logging.getLogger(__name__)
+
+
+class InstagramAIBot:
+    """Ana bot sınıfı"""
+    
+    def __init__(self, clock: Optional[Clock] = None):
+        # client, db, security ve game_engine ilk erişimde oluşturulur (LazyAttribute)
+        # Tüm zaman okumaları ve beklemeler bu saatten geçer (simülasyonda sanal saat)
+        self.clock = clock or SystemClock()
+        self.data_provider = DataProvider(self.clock)
+        self.content_manager = ContentManager()
+        self.utils = Utilities(self.clock)
+        
+        self.bot_stats = BotStats(start_time=self.clock.now())
+        self.is_running = False
+        
+        # Komut kayıt defteri (eklentiler ilk kullanımda yüklenir)
+        self.commands = create_registry(self.clock)
+        self.templates = create_templates(self.commands)
+        self.chunker = MessageChunker()
+        
+        # Kontrol döngüsü durumu
+        self.answered_messages = set()
+        self.outbox = ReplyBuffer(self.chunker)
+        self.backoff = Backoff()
+        # DM ve yorum cevaplarının ortak gönderim hızı
+        self.outbound = TokenBucket(clock=self.clock)
+        # Mesajlar öncelik sınıfı ve kullanıcı bazında adil sırayla işlenir
+        self.scheduler = FairScheduler(clock=self.clock)
+        # Aşırı yükte kademeli hizmet: bayat önbellek, günlük yazımı ve ağ komutları ertelenir
+        self.load = LoadController(self.clock)
+        self.load.add_listener(lambda mode: setattr(self.commands, 'serve_stale', mode == DEGRADED))
+        
+        logger.info("Bot initialized")
+    
+    @LazyAttribute
+    def client(self):
+        """Instagram istemcisi"""
+        from instagrapi import Client
+        
+        return Client()
+    
+    @LazyAttribute
+    def session_manager(self) -> SessionManager:
+        return SessionManager(self.client, clock=self.clock)
+    
+    @LazyAttribute
+    def admin(self) -> 'AdminConsole':
+        from .admin import AdminConsole
+        
+        console = AdminConsole(self)
+        self.session_manager.add_challenge_listener(console.on_challenge)
+        return console
+    
+    @LazyAttribute
+    def checkpoint(self) -> 'Checkpoint':
+        from .checkpoint import Checkpoint
+        
+        return Checkpoint(clock=self.clock)
+    
+    def _checkpointed(self, name: str, component):
+        """Bileşeni kontrol noktasına kaydet ve varsa önceki durumunu geri yükle"""
+        if Config.CHECKPOINT_FILE:
+            self.checkpoint.register(name, component.dump_state, component.load_state)
+        return component
+    
+    @LazyAttribute
+    def isolator(self) -> 'FailureIsolator':
+        from .resilience import FailureIsolator
+        
+        return self._checkpointed('isolator', FailureIsolator(self.db))
+    
+    @LazyAttribute
+    def db(self) -> 'Database':
+        from .database import Database
+        
+        return Database(self.clock)
+    
+    @LazyAttribute
+    def security(self) -> 'SecurityManager':
+        from .security import SecurityManager
+        
+        return self._checkpointed('security', SecurityManager(self.db, self.clock))
+    
+    @LazyAttribute
+    def game_engine(self) -> 'GameEngine':
+        from .games import GameEngine
+        
+        engine = GameEngine(self.db)
+        self._checkpointed('games', engine.games)
+        return engine
+    
+    @LazyAttribute
+    def comments(self) -> 'CommentPipeline':
+        from .comments import CommentPipeline
+        
+        return self._checkpointed('comments', CommentPipeline(self))
+    
+    def dump_state(self) -> Dict:
+        """Kontrol noktası: cevaplanan mesajlar ve komut önbelleği"""
+        return {
+            'answered_messages': set(self.answered_messages),
+            'total_messages': self.bot_stats.total_messages,
+            'commands': self.commands.dump_state()
+        }
+    
+    def load_state(self, state: Dict):
+        self.answered_messages.update(state['answered_messages'])
+        self.bot_stats.total_messages += state['total_messages']
+        self.commands.load_state(state['commands'])
+    
+    def restore_state(self):
+        """Önceki çalışmanın durumunu geri yükle; tembel bileşenler oluşturulurken kendi bölümlerini alır"""
+        self._checkpointed('bot', self)
+    
+    def _warm_up(self):
+        """Giriş yapılırken veritabanı ve motorları arka planda hazırla, önceki durumu geri yükle"""
+        try:
+            self.restore_state()
+            self.security
+            self.game_engine
+        except Exception as e:
+            logger.error(f"Warm-up error: {e}")
+    
+    def login(self) -> bool:
+        """Instagram'a giriş yap (kayıtlı oturum geçerliyse tam giriş yapılmaz)"""
+        return self.session_manager.login()
+    
+    def process_message(self, user_id: int, username: str, message: str) -> Optional[str]:
+        """Gelen mesajı işle"""
+        # Yönetici komutları hız sınırı ve istatistiklerin dışında
+        if user_id in Config.ADMIN_IDS and message.startswith(Config.ADMIN_PREFIX):
+            return self.admin.execute(message[len(Config.ADMIN_PREFIX):])
+        
+        # Engelli kullanıcı: veritabanı ve regex işinden önce, bellekten reddedilir
+        if self.security.is_user_blocked(user_id):
+            return None
+        
+        # Kullanıcıyı veritabanına ekle
+        self.db.create_user(user_id, username)
+        
+        # Rate limit kontrolü
+        if not self.security.check_rate_limit(user_id):
+            return "⏳ Çok hızlı mesaj gönderiyorsun. Lütfen 1 dakika bekleyin."
+        
+        # Spam kontrolü
+        if self.security.detect_spam(user_id, message):
+            return "🚫 Spam tespit edildi. Mesaj gönderimi engellendi."
+        
+        # İstatistik güncelle
+        self.db.update_user_stats(user_id, 'message_count')
+        self.bot_stats.total_messages += 1
+        
+        # Mesajı küçük harfe çevir ve boşlukları temizle
+        message_lower = message.lower().strip()
+        
+        # Oturum kontrolü
+        session = self.db.get_session(user_id)
+        if session:
+            return self._handle_session(user_id, session, message_lower)
+        
+        # Komutları işle
+        response, command = self._handle_command(user_id, message_lower)
+        
+        # Mesajı logla (aşırı yükte atlanır)
+        if response:
+            if self.load.degraded:
+                self.load.shed('log_message')
+            else:
+                self.db.log_message(user_id, message, response, command)
+        
+        return response
+    
+    def _handle_session(self, user_id: int, session: Dict, message: str) -> Optional[str]:
+        """Oturum tabanlı işlemler"""
+        session_type = session['state']
+        
+        if session_type == 'awaiting_city':
+            self.db.clear_session(user_id)
+            from .plugins.weather import weather_response
+            return weather_response(self, message)
+        
+        elif session_type == 'game':
+            # Yeniden başlatma sonrası durum oturum tablosundan tembel yüklenir
+            game = self.game_engine.games.get(user_id)
+            
+            if game and game.type == self.game_engine.GameType.NUMBER_GUESS.value:
+                return self.game_engine.guess_number(user_id, message)
+            
+            elif game and game.type == self.game_engine.GameType.QUIZ.value:
+                return self.game_engine.check_quiz_answer(user_id, message)
+        
+        return None
+    
+    def _handle_command(self, user_id: int, message: str) -> Tuple[Optional[str], Optional[str]]:
+        """Komutları işle; (cevap, eşleşen komut) döndürür"""
+        # Oyun komutları ('sa'/'bilgi' gibi kısa eşleşmelerden önce bakılır)
+        spec = self.commands.match_prefix(message)
+        if spec:
+            return self.commands.execute(spec, self, user_id, message), spec.name
+        
+        # Özel durumlar
+        if any(word in message for word in ['selam', 'merhaba', 'sa', 'hey', 'hi', 'hello']):
+            return self._get_greeting_response(), None
+        
+        if any(word in message for word in ['nasılsın', 'naber', 'iyi misin']):
+            return self._get_mood_response(), None
+        
+        if any(word in message for word in ['teşekkür', 'sağ ol', 'thanks']):
+            return self._get_thank_you_response(), None
+        
+        # Komutları kontrol et
+        spec = self.commands.match(message)
+        if spec:
+            return self.commands.execute(spec, self, user_id, message), spec.name
+        
+        # Bilinmeyen komut
+        return self._get_unknown_command_response(), None
+    
+    def _get_greeting_response(self) -> str:
+        """Selamlama cevabı"""
+        greetings = [
+            "Selam! 😊 Ben senin Instagram asistanınım.",
+            "Merhaba! 🤖 Size nasıl yardımcı olabilirim?",
+            "Hoş geldin! 🎉 Hadi sohbet edelim!",
+            "Selamlar! ✨ Bugün nasılsın?"
+        ]
+        return f"{random.choice(greetings)}\n\nYardım için 'yardım' yazabilirsin."
+    
+    def _get_mood_response(self) -> str:
+        """Durum cevabı"""
+        moods = [
+            "Harikayım! Seni görmek güzel 😊",
+            "Kodlarım tıkırında, sen nasılsın? 🤖",
+            "CPU'm %100, RAM'im dolu, hazırım! 💻",
+            "Süperim! Yeni özellikler öğreniyorum 🚀",
+            "Her zamankinden iyiyim! Sen? 🌟"
+        ]
+        return random.choice(moods)
+    
+    def _get_thank_you_response(self) -> str:
+        """Teşekkür cevabı"""
+        thanks = [
+            "Rica ederim! 😊",
+            "Her zaman yanındayım! 💙",
+            "Benim için bir zevk! 🤖",
+            "Sorun değil, başka ne yardımım olabilir?",
+            "Yardımcı olabildiğime sevindim! ✨"
+        ]
+        return random.choice(thanks)
+    
+    def _get_unknown_command_response(self) -> str:
+        """Bilinmeyen komut cevabı"""
+        responses = [
+            "Anlayamadım, yardım için 'yardım' yazabilirsin 🤔",
+            "Bu komutu bilmiyorum, 'komutlar' yazarak neler yapabildiğimi görebilirsin 😊",
+            "Üzgünüm, bunu henüz yapamıyorum. Komut listesi için 'yardım' yaz! 📝"
+        ]
+        return random.choice(responses)
+    
+    def poll_once(self) -> int:
+        """Tek kontrol turu: sohbetleri çek, her sohbetin son mesajını işle, cevapları gönder.
+        
+        Anlık (push) alım modunda aynı tur, kaçırılan mesajlar için seyrek
+        bir uzlaştırma taraması olarak çalışır. İşlenen mesaj sayısını döndürür.
+        """
+        threads = self.client.direct_threads(amount=20)
+        received_at = self.clock.time()
+        
+        messages = []
+        for thread in threads:
+            if not thread.messages:
+                continue
+            last_msg = thread.messages[0]
+            messages.append(IncomingMessage(
+                last_msg.id, thread.id, last_msg.user_id,
+                thread.users[0].username if thread.users else "Unknown",
+                last_msg.text, received_at
+            ))
+        
+        # Erteleme süresi dolan ağ komutları bu turda işlenir
+        messages.extend(self.load.due_deferred())
+        return self.handle_messages(messages)
+    
+    def handle_messages(self, messages: Iterable[IncomingMessage]) -> int:
+        """Gelen mesajları işle ve cevapları gönder (yoklama ya da anlık kaynak fark etmez).
+        
+        Mesajlar geliş sırasıyla değil, zamanlayıcının sırasıyla işlenir
+        (yönetici > ucuz komutlar > ağ komutları, sınıf içinde kullanıcılar
+        arasında adil). Bir sınıf bittiğinde biriken cevaplar hemen gönderilir;
+        böylece yavaş ağ komutları ucuz cevapları bekletmez.
+        
+        Bir mesajın ya da sohbetin hatası yalnızca onu etkiler; tur boyu hatalar
+        (bağlantı, kısıtlama) çağırana iletilir. İşlenen mesaj sayısını döndürür.
+        """
+        processed = 0
+        # Önceki tur hatayla kesildiyse kalan mesajlar bu turda yeniden geldi
+        self.scheduler.clear()
+        
+        seen = set()
+        for msg in messages:
+            # Botun kendi mesajını, cevaplanan, bu turda tekrar gelen ya da karantinadaki mesajı yoksay
+            if (msg.user_id == self.client.user_id or 
+                msg.id in self.answered_messages or
+                msg.id in seen or
+                self.isolator.is_quarantined(msg.id) or
+                not self.isolator.thread_ready(msg.thread_id)):
+                continue
+            seen.add(msg.id)
+            
+            # Engelli kullanıcı: sınıflandırma ve komut eşleştirmesinden önce, tek bir küme araması
+            if msg.user_id not in Config.ADMIN_IDS and self.security.is_user_blocked(msg.user_id):
+                self.answered_messages.add(msg.id)
+                continue
+            
+            priority, cost = classify(self, msg.user_id, msg.text)
+            self.scheduler.push(msg.user_id, msg, priority, cost)
+        
+        self.load.observe_depth(len(self.scheduler))
+        started = self.clock.time()  # Alınma zamanı bilinmeyen mesajlar için
+        current = None
+        for priority, msg in self.scheduler.drain():
+            # Aşırı yükte ağ komutları ertelenir; süresi dolunca `due_deferred` ile geri gelir
+            if priority == NETWORK and self.load.should_defer(msg.id, msg):
+                continue
+            
+            # Sınıf değişiminde önceki sınıfın cevaplarını beklemeden gönder;
+            # aşırı yükte cevaplar tur sonunda birleştirilerek gönderilir
+            if priority != current and len(self.outbox) and not self.load.degraded:
+                self._send_replies()
+            current = priority
+            
+            logger.info(f"New message from user {msg.user_id}: {msg.text[:5]}...",
+                        extra={'sampled': True})
+            
+            # Mesajı işle (hata yalnızca bu mesajı etkiler)
+            try:
+                response = self.process_message(msg.user_id, msg.username, msg.text)
+            except Exception as e:
+                logger.error(f"Failed to process message {msg.id}: {e}", exc_info=True)
+                if self.isolator.message_failed(msg.id, msg.thread_id, msg.user_id, msg.text, e):
+                    self.answered_messages.add(msg.id)
+                continue
+            
+            self.isolator.message_succeeded(msg.id)
+            self.load.observe_latency(self.clock.time() - (msg.received_at or started), msg.id)
+            processed += 1
+            
+            # Cevabı sohbetin gönderim tamponuna ekle
+            if response:
+                self.outbox.add(msg.thread_id, msg.id, response)
+        
+        self._send_replies()
+        
+        # Yorumlar: zamanı geldiyse yeni yorumları oku, DM'lerden artan gönderim hakkıyla cevapla
+        if Config.COMMENT_REPLIES:
+            if self.load.degraded:
+                self.load.shed('comment_poll')
+            else:
+                self.comments.run_once()
+        
+        self.load.evaluate()
+        
+        # Cache temizle
+        if len(self.answered_messages) > 1000:
+            self.answered_messages.clear()
+        
+        # İstatistik güncelle
+        self.bot_stats.uptime = self.clock.now() - self.bot_stats.start_time
+        
+        return processed
+    
+    def _send_replies(self):
+        """Tampondaki cevapları gönder (aynı sohbete giden kısa cevaplar tek mesajda birleşir)"""
+        for thread_id, message_ids, chunks in self.outbox.drain():
+            try:
+                for i, chunk in enumerate(chunks):
+                    if i:
+                        self.clock.sleep(1)  # Rate limit için
+                    self.outbound.acquire()
+                    self.client.direct_send(chunk, thread_ids=[thread_id])
+                
+                self.answered_messages.update(message_ids)
+                self.isolator.thread_succeeded(thread_id)
+                logger.info(f"Response sent to thread {thread_id}", extra={'sampled': True})
+            
+            except Exception as e:
+                # Kısıtlama/bağlantı hataları tüm turu ilgilendirir
+                if classify_error(e) in (CONNECTION, THROTTLE, AUTH):
+                    raise
+                delay = self.isolator.thread_failed(thread_id)
+                logger.error(f"Failed to send message to thread {thread_id}: {e}. "
+                             f"Retrying thread in {delay:.0f}s")
+    
+    def run(self, step: Optional[Callable[[], int]] = None,
+            interval: Optional[Tuple[float, float]] = None, control_socket: bool = True):
+        """Botu çalıştır: giriş yap ve `step`'i (varsayılan poll_once) geri çekilmeyle döngüde çağır.
+        
+        Kuyruk modunda çekici ve gönderici süreçler kendi adımlarıyla aynı
+        döngüyü kullanır (bkz. pipeline).
+        """
+        step = step or self.poll_once
+        interval = interval or Config.CHECK_INTERVAL
+        
+        # Giriş ağ üzerinde beklerken veritabanı kurulumu paralel ilerlesin
+        warm_up = threading.Thread(target=self._warm_up, name='warm-up', daemon=True)
+        warm_up.start()
+        
+        # Kontrol soketi girişten önce açılır; doğrulama kodu buradan da gönderilebilir
+        control = None
+        if control_socket and Config.CONTROL_SOCKET:
+            from .admin import ControlServer
+            
+            control = ControlServer(self.admin)
+            try:
+                control.start()
+            except OSError as e:
+                logger.error(f"Control socket error: {e}")
+                control = None
+        
+        if not self.login():
+            if not self.session_manager.challenge_pending:
+                logger.error("Login failed. Exiting.")
+                if control is not None:
+                    control.stop()
+                return
+            # Giriş doğrulama kodunu arka planda bekler; kod kontrol soketinden gönderilir
+            logger.warning("Login waiting for challenge code; continuing without a session")
+        
+        warm_up.join()
+        
+        logger.info("Bot started successfully")
+        self.is_running = True
+        self.db.start_maintenance()
+        self.session_manager.start_refresh()
+        
+        delay = 0.0
+        while self.is_running:
+            try:
+                # Rastgele bekleme (hata sonrası geri çekilme süresi kadar uzar)
+                sleep_time = max(delay, random.uniform(*interval))
+                logger.debug(f"Sleeping for {sleep_time:.1f} seconds")
+                self.clock.sleep(sleep_time)
+                
+                # Kuyruk modunda diğer süreçlerde yapılan 'set'/'cache' değişikliklerini uygula
+                if Config.SHARED_ADMIN:
+                    self.admin.sync_shared()
+                
+                # İstemci arka plan yenilemesi ve yeniden girişle aynı anda kullanılmaz
+                with self.session_manager.using_client():
+                    step()
+                self.backoff.success()
+                delay = 0.0
+                
+                if Config.CHECKPOINT_FILE:
+                    self.checkpoint.maybe_save()
+            
+            except ChallengePending:
+                # Doğrulama kodu gelene kadar tur atlanır; döngü (ve kontrol soketi) çalışmaya devam eder
+                logger.debug("Skipping round while challenge code is pending")
+                if Config.CHECKPOINT_FILE:
+                    self.checkpoint.maybe_save()
+            
+            except KeyboardInterrupt:
+                logger.info("Bot stopped by user")
+                self.is_running = False
+                break
+            
+            except Exception as e:
+                error_class = classify_error(e)
+                delay = self.backoff.failure(error_class)
+                
+                if error_class == CONNECTION:
+                    # Oturum geçerli; yalnızca bağlantılar yenilenir
+                    logger.warning(f"Connection error: {e}. Retrying in {delay:.1f}s")
+                    self.session_manager.reconnect()
+                elif error_class == AUTH:
+                    logger.warning(f"Session invalidated: {e}")
+                    if self.session_manager.relogin():
+                        delay = 0.0
+                elif error_class == THROTTLE:
+                    logger.warning(f"Instagram wait required: {e}. Waiting {delay:.0f}s")
+                elif error_class == CLIENT:
+                    logger.error(f"Instagram client error: {e}. Retrying in {delay:.0f}s")
+                else:
+                    logger.error(f"Unexpected error: {e}. Retrying in {delay:.0f}s", exc_info=True)
+        
+        if control is not None:
+            control.stop()
+        self.session_manager.stop()
+        if Config.CHECKPOINT_FILE:
+            self.checkpoint.save()
+        self.db.shutdown()
+        self.data_provider.shutdown()
+        logger.info("Bot stopped")
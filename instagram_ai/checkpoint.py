@@ -0,0 +1,159 @@
+"""Bellek içi durumun kontrol noktası: sürümlü, sıkıştırılmış ikili dosya, tembel geri yükleme"""
+import logging
+import os
+import pickle
+import struct
+import threading
+import time
+import zlib
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .clock import Clock, SystemClock
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class Checkpoint:
+    """Bileşenlerin bellek içi durumunu (sayaçlar, aktif oyunlar, cevaplanan
+    mesajlar, önbellekler) tek dosyada saklar.
+    
+    Dosya düzeni: başlık <sihirli sayı, sürüm, bölüm sayısı, yazım zamanı>,
+    ardından her bölüm için <ad uzunluğu u8><ad><yük uzunluğu u32><crc32 u32>
+    ve zlib ile sıkıştırılmış pickle yükü. Dosya açılışta tek okumayla
+    belleğe alınır ama bölümler yalnızca sahibi olan bileşen oluşturulurken
+    açılır; hiç kullanılmayan bileşenin bölümü sonraki yazıma aynen taşınır.
+    Yazım geçici dosya + fsync + os.replace ile atomiktir. Dosya yalnızca bu
+    sürecin yazdığı yerel durumdur (pickle güvenilmeyen kaynaktan okunmaz).
+    """
+    
+    MAGIC = b'IGCP'
+    VERSION = 1
+    HEADER = struct.Struct('<4sHHd')   # sihirli sayı, sürüm, bölüm sayısı, yazım zamanı
+    SECTION = struct.Struct('<II')     # yük uzunluğu, crc32
+    
+    def __init__(self, path: Optional[str] = None, clock: Optional[Clock] = None):
+        self.path = path or Config.CHECKPOINT_FILE
+        self.clock = clock or SystemClock()
+        self._lock = threading.Lock()
+        self._providers: Dict[str, Callable[[], Any]] = {}
+        self._pending: Optional[Dict[str, bytes]] = None   # henüz açılmamış bölümler
+        self.saved_at = self.clock.time()
+        self.stats = {'saves': 0, 'restored': 0, 'bytes': 0, 'save_ms': 0.0}
+    
+    # ---- Okuma ----
+    
+    def _read(self) -> Dict[str, bytes]:
+        """Dosyadaki bölümleri sıkıştırılmış halleriyle oku; geçersiz dosya yok sayılır"""
+        try:
+            with open(self.path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return {}
+        
+        try:
+            magic, version, count, written_at = self.HEADER.unpack_from(data)
+            if magic != self.MAGIC:
+                raise ValueError("bad magic")
+            if version != self.VERSION:
+                logger.warning(f"Checkpoint version {version} is not supported, starting cold")
+                return {}
+            
+            sections = {}
+            offset = self.HEADER.size
+            for _ in range(count):
+                name_len = data[offset]
+                name = data[offset + 1:offset + 1 + name_len].decode('utf-8')
+                offset += 1 + name_len
+                length, crc = self.SECTION.unpack_from(data, offset)
+                offset += self.SECTION.size
+                blob = data[offset:offset + length]
+                offset += length
+                if len(blob) != length or zlib.crc32(blob) != crc:
+                    raise ValueError(f"section {name} is truncated or corrupt")
+                sections[name] = blob
+        except (ValueError, IndexError, struct.error) as e:
+            logger.error(f"Corrupt checkpoint ignored: {e}")
+            return {}
+        
+        age = self.clock.time() - written_at
+        logger.info(f"Checkpoint found with {len(sections)} sections ({age:.0f}s old)")
+        return sections
+    
+    def load(self, name: str) -> Any:
+        """Bölümü aç ve döndür (her bölüm bir kez verilir); yoksa None"""
+        with self._lock:
+            if self._pending is None:
+                self._pending = self._read()
+            blob = self._pending.pop(name, None)
+        
+        if blob is None:
+            return None
+        try:
+            return pickle.loads(zlib.decompress(blob))
+        except Exception as e:
+            logger.error(f"Checkpoint section {name} could not be restored: {e}")
+            return None
+    
+    def register(self, name: str, dump: Callable[[], Any], restore: Callable[[Any], None]):
+        """Bileşeni kaydet ve dosyada bölümü varsa hemen geri yükle.
+        
+        `dump` yazım anında durumu döndürür (None: yazılacak bir şey yok);
+        `restore` açılan durumu bileşene uygular.
+        """
+        with self._lock:
+            self._providers[name] = dump
+        
+        state = self.load(name)
+        if state is None:
+            return
+        try:
+            restore(state)
+            self.stats['restored'] += 1
+        except Exception as e:
+            logger.error(f"Checkpoint section {name} could not be applied: {e}")
+    
+    # ---- Yazma ----
+    
+    def save(self):
+        """Tüm kayıtlı bileşenlerin durumunu atomik olarak yaz"""
+        start = time.perf_counter()
+        with self._lock:
+            providers = list(self._providers.items())
+            if self._pending is None:
+                self._pending = self._read()
+            carried = [(name, blob) for name, blob in self._pending.items() if name not in self._providers]
+        
+        sections: List[Tuple[str, bytes]] = []
+        for name, dump in providers:
+            try:
+                state = dump()
+                if state is not None:
+                    sections.append((name, zlib.compress(pickle.dumps(state, pickle.HIGHEST_PROTOCOL),
+                                                         Config.CHECKPOINT_COMPRESSION)))
+            except Exception as e:
+                logger.error(f"Checkpoint section {name} could not be saved: {e}")
+        sections.extend(carried)
+        
+        parts = [self.HEADER.pack(self.MAGIC, self.VERSION, len(sections), self.clock.time())]
+        for name, blob in sections:
+            encoded = name.encode('utf-8')
+            parts += [bytes((len(encoded),)), encoded, self.SECTION.pack(len(blob), zlib.crc32(blob)), blob]
+        data = b''.join(parts)
+        
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        
+        self.saved_at = self.clock.time()
+        self.stats['saves'] += 1
+        self.stats['bytes'] = len(data)
+        self.stats['save_ms'] = round((time.perf_counter() - start) * 1000, 2)
+        logger.debug(f"Checkpoint written: {len(sections)} sections, {len(data)} bytes")
+    
+    def maybe_save(self):
+        if self.clock.time() - self.saved_at >= Config.CHECKPOINT_INTERVAL:
+            self.save()
@@ -0,0 +1,183 @@
+"""Mesaj parçalama: grafem ve kelime sınırlarına saygılı, UTF-16 uzunluklu"""
+import unicodedata
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .config import Config
+
+ZWJ = '\u200d'
+
+# Önceki karaktere yapışan (kendi başına grafem başlatmayan) kod noktası aralıkları
+_EXTEND_RANGES = (
+    (0x200C, 0x200D),    # ZWNJ / ZWJ
+    (0x20E3, 0x20E3),    # keycap
+    (0xFE00, 0xFE0F),    # varyasyon seçicileri
+    (0x1F3FB, 0x1F3FF),  # emoji ten rengi
+    (0xE0020, 0xE007F),  # etiket karakterleri (bayrak alt bölgeleri)
+    (0xE0100, 0xE01EF),  # ek varyasyon seçicileri
+)
+_REGIONAL_INDICATORS = (0x1F1E6, 0x1F1FF)
+
+
+def utf16_len(text: str) -> int:
+    """Instagram'ın saydığı uzunluk (UTF-16 kod birimi)"""
+    return len(text.encode('utf-16-le')) // 2
+
+
+def _is_extend(char: str) -> bool:
+    code = ord(char)
+    if code < 0x300:
+        return False
+    for low, high in _EXTEND_RANGES:
+        if low <= code <= high:
+            return True
+    return unicodedata.category(char) in ('Mn', 'Me', 'Mc')
+
+
+def _is_regional(char: str) -> bool:
+    return _REGIONAL_INDICATORS[0] <= ord(char) <= _REGIONAL_INDICATORS[1]
+
+
+def is_grapheme_boundary(text: str, index: int) -> bool:
+    """text[index-1] ile text[index] arasında grafem sınırı var mı (sadeleştirilmiş UAX #29)"""
+    if index <= 0 or index >= len(text):
+        return True
+    
+    prev, char = text[index - 1], text[index]
+    if prev == '\r' and char == '\n':
+        return False
+    if prev == ZWJ or _is_extend(char):
+        return False
+    
+    if _is_regional(prev) and _is_regional(char):
+        # Bayraklar ikişer ikişer eşleşir
+        run = 0
+        i = index - 1
+        while i >= 0 and _is_regional(text[i]):
+            run += 1
+            i -= 1
+        return run % 2 == 0
+    
+    return True
+
+
+@lru_cache(maxsize=256)
+def chunk_offsets(text: str, max_len: int) -> Tuple[Tuple[int, int], ...]:
+    """Parçaların (başlangıç, bitiş) indeksleri; tercih sırası: satır, kelime, grafem sınırı"""
+    # Hızlı yol: her kod noktası en fazla 2 birim
+    if len(text) * 2 <= max_len or utf16_len(text) <= max_len:
+        return ((0, len(text)),)
+    
+    offsets = []
+    size = len(text)
+    start = 0
+    while start < size:
+        while start < size and text[start].isspace():
+            start += 1
+        if start >= size:
+            break
+        
+        # Sığan en uzun aralık
+        end = start
+        units = 0
+        while end < size:
+            units += 2 if ord(text[end]) > 0xFFFF else 1
+            if units > max_len:
+                break
+            end += 1
+        
+        if end >= size:
+            cut = size
+        else:
+            # Grafemi ortadan bölme
+            while end > start and not is_grapheme_boundary(text, end):
+                end -= 1
+            if end == start:
+                # Tek grafem sınırdan uzun; kod noktası sınırında kesmek zorunlu
+                end = start + max(1, max_len // 2)
+            
+            # Çok kısa parça üretmemek için yalnızca ikinci yarıda satır/kelime arar
+            floor = start + (end - start) // 2
+            cut = text.rfind('\n', floor, end)
+            if cut <= start:
+                cut = max(text.rfind(' ', floor, end), text.rfind('\t', floor, end))
+            if cut <= start:
+                cut = end
+        
+        stop = cut
+        while stop > start and text[stop - 1].isspace():
+            stop -= 1
+        offsets.append((start, stop))
+        start = cut
+    
+    return tuple(offsets)
+
+
+class MessageChunker:
+    """Uzun cevapları hazır indekslerden tembel üretilen parçalara böler"""
+    
+    def __init__(self, max_len: Optional[int] = None, separator: str = "\n\n"):
+        self.max_len = max_len or Config.MAX_MESSAGE_LENGTH
+        self.separator = separator
+    
+    def offsets(self, text: str) -> Tuple[Tuple[int, int], ...]:
+        return chunk_offsets(text, self.max_len)
+    
+    def chunks(self, text: str) -> Iterator[str]:
+        """Parçaları sırayla üret; şablon cevaplarının hazır parçaları doğrudan kullanılır"""
+        precomputed = getattr(text, 'chunks', None)
+        if precomputed:
+            yield from precomputed
+            return
+        
+        for start, end in self.offsets(text):
+            yield text[start:end]
+    
+    def merge(self, replies: Iterable[str]) -> Iterator[str]:
+        """Aynı sohbete giden kısa cevapları sınırı aşmadan tek mesajda birleştir"""
+        pending: List[str] = []
+        units = 0
+        sep_units = utf16_len(self.separator)
+        
+        for reply in replies:
+            length = utf16_len(reply)
+            if pending and units + sep_units + length > self.max_len:
+                yield self.separator.join(pending)
+                pending, units = [], 0
+            
+            if length > self.max_len:
+                yield reply
+                continue
+            
+            units += length + (sep_units if pending else 0)
+            pending.append(reply)
+        
+        if pending:
+            yield self.separator.join(pending) if len(pending) > 1 else pending[0]
+
+
+class ReplyBuffer:
+    """Bir kontrol turunda sohbet başına biriken cevaplar"""
+    
+    def __init__(self, chunker: MessageChunker):
+        self.chunker = chunker
+        self._pending: Dict[str, Tuple[List[str], List[str]]] = {}
+    
+    def add(self, thread_id: str, message_id: str, response: str):
+        replies, message_ids = self._pending.setdefault(thread_id, ([], []))
+        replies.append(response)
+        message_ids.append(message_id)
+    
+    def __len__(self) -> int:
+        return len(self._pending)
+    
+    def drain(self) -> Iterator[Tuple[str, List[str], Iterator[str]]]:
+        """(sohbet, mesaj id'leri, gönderilecek parçalar) üret ve tamponu boşalt"""
+        pending, self._pending = self._pending, {}
+        for thread_id, (replies, message_ids) in pending.items():
+            if len(replies) == 1:
+                chunks = self.chunker.chunks(replies[0])
+            else:
+                chunks = (chunk for merged in self.chunker.merge(replies)
+                          for chunk in self.chunker.chunks(merged))
+            yield thread_id, message_ids, chunks
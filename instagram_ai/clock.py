@@ -0,0 +1,59 @@
+"""Saat soyutlaması: gerçek zaman ya da simülasyon için sanal zaman"""
+import threading
+import time
+from datetime import datetime
+from typing import Optional, Union
+
+
+class SystemClock:
+    """Duvar saati (varsayılan)"""
+    
+    def time(self) -> float:
+        return time.time()
+    
+    def now(self) -> datetime:
+        return datetime.now()
+    
+    def sleep(self, seconds: float):
+        time.sleep(seconds)
+
+class VirtualClock:
+    """Yalnızca ilerletildiğinde akan saat; `sleep` beklemeden zamanı ileri alır.
+    
+    Simülasyonda günlerce süren trafik saniyeler içinde oynatılabilir;
+    bekleme süreleri, hız sınırı pencereleri ve oturum ömürleri aynı sanal
+    zamana göre işler.
+    
+    Saati yalnızca oluşturan iş parçacığı ilerletir; arka plan iş
+    parçacıklarının (bakım, oturum yenileme) `sleep` çağrısı sanal zaman
+    hedefe ulaşana kadar bekler, saati kendisi ileri almaz.
+    """
+    
+    def __init__(self, start: Optional[float] = None):
+        self._now = time.time() if start is None else start
+        self._lock = threading.Lock()
+        self._advanced = threading.Condition(self._lock)
+        self._driver = threading.get_ident()
+    
+    def time(self) -> float:
+        return self._now
+    
+    def now(self) -> datetime:
+        return datetime.fromtimestamp(self._now)
+    
+    def sleep(self, seconds: float):
+        if threading.get_ident() == self._driver:
+            self.advance(seconds)
+            return
+        with self._advanced:
+            until = self._now + max(0.0, seconds)
+            self._advanced.wait_for(lambda: self._now >= until)
+    
+    def advance(self, seconds: float):
+        with self._advanced:
+            self._now += max(0.0, seconds)
+            self._advanced.notify_all()
+
+
+# Saat kabul eden yerler için tip ipucu
+Clock = Union[SystemClock, VirtualClock]
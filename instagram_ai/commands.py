@@ -0,0 +1,253 @@
+"""Komut kayıt defteri: eklenti komutları, takma adlar, maliyet sınıfları ve metrikler"""
+import importlib
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .clock import Clock, SystemClock
+from .config import Config
+from .models import CommandCategory
+
+logger = logging.getLogger(__name__)
+
+# Kelime eşleşmesinde yok sayılan noktalama
+_PUNCTUATION = '.,!?;:()"\'*'
+
+
+class CostClass(Enum):
+    """Komutun maliyet sınıfı; hız sınırı, önbellek ve öncelik buna göre belirlenir"""
+    CHEAP = "cheap"        # Bellekten cevap
+    DB = "db"              # Veritabanı okuması
+    NETWORK = "network"    # Harici API çağrısı
+
+@dataclass
+class CommandSpec:
+    """Komut tanımı"""
+    name: str
+    category: CommandCategory
+    description: str
+    module: Optional[str] = None          # İlk kullanımda yüklenecek eklenti modülü
+    handler_name: str = 'handle'
+    aliases: Tuple[str, ...] = ()
+    prefixes: Tuple[str, ...] = ()        # Mesaj başında aranan (çok kelimeli) tetikleyiciler
+    usage: Optional[str] = None
+    cost: CostClass = CostClass.CHEAP
+    rate_limit: Optional[int] = None      # Kullanıcı başına dakikalık; None ise maliyet sınıfından
+    cache_ttl: float = 0.0                # >0 ise cevap mesaj bazında paylaşımlı önbellekte tutulur
+    hidden: bool = False                  # Ana komut listesinde gösterilmez
+    handler: Optional[Callable[[Any, int, str], str]] = None
+    
+    def resolve(self) -> Callable[[Any, int, str], str]:
+        """İşleyiciyi döndür; gerekirse eklenti modülünü şimdi yükle"""
+        if self.handler is None:
+            module = importlib.import_module(self.module)
+            self.handler = getattr(module, self.handler_name)
+            logger.debug(f"Command plugin loaded: {self.module}.{self.handler_name}")
+        return self.handler
+    
+    @property
+    def limit(self) -> Optional[int]:
+        if self.rate_limit is not None:
+            return self.rate_limit
+        return Config.COMMAND_RATE_LIMITS.get(self.cost.value)
+
+class CommandMetrics:
+    """Komut başına sayaçlar"""
+    
+    __slots__ = ('calls', 'errors', 'cache_hits', 'stale_hits', 'rate_limited', 'total_time', 'max_time')
+    
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.stale_hits = 0
+        self.rate_limited = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+    
+    @property
+    def avg_time(self) -> float:
+        return self.total_time / self.calls if self.calls else 0.0
+    
+    def to_dict(self) -> Dict[str, float]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+class CommandRegistry:
+    """Komut kayıt defteri; eşleştirme sözlük araması, çalıştırma metadata güdümlüdür"""
+    
+    def __init__(self, clock: Optional[Clock] = None):
+        self.clock = clock or SystemClock()
+        self._specs: Dict[str, CommandSpec] = {}
+        self._index: Dict[str, str] = {}              # ad/takma ad -> komut
+        self._prefixes: List[Tuple[str, str]] = []    # (önek, komut)
+        self._lock = threading.Lock()
+        self._cache: Dict[Tuple[str, str], Tuple[float, str]] = {}
+        self._calls: Dict[Tuple[int, str], List[float]] = {}
+        self.metrics: Dict[str, CommandMetrics] = {}
+        self.version = 0
+        # Aşırı yükte süresi dolmuş (LOAD_STALE_MAX_AGE'den genç) önbellek kaydı da kabul edilir
+        self.serve_stale = False
+    
+    def register(self, spec: CommandSpec) -> CommandSpec:
+        """Komutu kaydet (aynı adla varsa değiştir)"""
+        with self._lock:
+            self._specs[spec.name] = spec
+            self.metrics.setdefault(spec.name, CommandMetrics())
+            
+            if not spec.prefixes:
+                for word in (spec.name, *spec.aliases):
+                    self._index[word] = spec.name
+            for prefix in spec.prefixes:
+                self._prefixes.append((prefix, spec.name))
+            # Uzun önekler önce denensin
+            self._prefixes.sort(key=lambda item: len(item[0]), reverse=True)
+            
+            self.version += 1
+        return spec
+    
+    def declare(self, name: str, module: str, **options) -> CommandSpec:
+        """Tembel eklenti komutu tanımla; modül ilk kullanımda içe aktarılır"""
+        return self.register(CommandSpec(name=name, module=module, **options))
+    
+    def command(self, name: str, **options) -> Callable:
+        """Hazır işleyiciyi kaydeden dekoratör"""
+        def decorator(handler: Callable[[Any, int, str], str]) -> Callable:
+            self.register(CommandSpec(name=name, handler=handler, **options))
+            return handler
+        return decorator
+    
+    def get(self, name: str) -> Optional[CommandSpec]:
+        return self._specs.get(name)
+    
+    def __iter__(self) -> Iterator[CommandSpec]:
+        return iter(list(self._specs.values()))
+    
+    def __len__(self) -> int:
+        return len(self._specs)
+    
+    def __contains__(self, name: str) -> bool:
+        return name in self._specs
+    
+    def match_prefix(self, message: str) -> Optional[CommandSpec]:
+        """Mesaj başındaki çok kelimeli tetikleyiciyi bul ('sayı tahmin', 'tkm' ...)"""
+        for prefix, name in self._prefixes:
+            if message.startswith(prefix):
+                return self._specs[name]
+        return None
+    
+    def match(self, message: str) -> Optional[CommandSpec]:
+        """Mesajdaki komutu bul: önce kelime başına O(1) sözlük araması, sonra alt dizi taraması"""
+        for word in message.split():
+            name = self._index.get(word.strip(_PUNCTUATION))
+            if name:
+                return self._specs[name]
+        
+        # Yavaş yol: kelimeye gömülü eşleşmeler (ör. 'istatistiklerim')
+        for spec in self._specs.values():
+            if spec.prefixes:
+                continue
+            if spec.name in message or any(alias in message for alias in spec.aliases):
+                return spec
+        return None
+    
+    def execute(self, spec: CommandSpec, bot: Any, user_id: int, message: str) -> str:
+        """Komutu hız sınırı, önbellek ve metriklerle çalıştır"""
+        metrics = self.metrics[spec.name]
+        
+        if not self._allow(user_id, spec):
+            metrics.rate_limited += 1
+            return "⏳ Bu komutu çok sık kullanıyorsun. Biraz sonra tekrar dene."
+        
+        cache_key = (spec.name, message)
+        if spec.cache_ttl:
+            cached = self._cache.get(cache_key)
+            if cached:
+                now = self.clock.time()
+                if cached[0] > now:
+                    metrics.cache_hits += 1
+                    return cached[1]
+                if self.serve_stale and now - cached[0] < Config.LOAD_STALE_MAX_AGE:
+                    metrics.stale_hits += 1
+                    return cached[1]
+        
+        start = time.perf_counter()
+        try:
+            response = spec.resolve()(bot, user_id, message)
+        except Exception:
+            metrics.errors += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            metrics.calls += 1
+            metrics.total_time += elapsed
+            metrics.max_time = max(metrics.max_time, elapsed)
+        
+        if spec.cache_ttl and response:
+            if len(self._cache) >= Config.COMMAND_CACHE_SIZE:
+                self._cache.pop(next(iter(self._cache)), None)
+            self._cache[cache_key] = (self.clock.time() + spec.cache_ttl, response)
+        
+        return response
+    
+    def _allow(self, user_id: int, spec: CommandSpec) -> bool:
+        limit = spec.limit
+        if not limit:
+            return True
+        
+        now = self.clock.time()
+        key = (user_id, spec.name)
+        with self._lock:
+            calls = [ts for ts in self._calls.get(key, ()) if now - ts < 60]
+            if len(calls) >= limit:
+                self._calls[key] = calls
+                return False
+            calls.append(now)
+            self._calls[key] = calls
+        return True
+    
+    def usage(self, user_id: int) -> Dict[str, Tuple[int, Optional[int]]]:
+        """Kullanıcının son dakikadaki komut kullanımı: komut -> (çağrı, limit)"""
+        now = self.clock.time()
+        with self._lock:
+            items = [(name, calls) for (uid, name), calls in self._calls.items() if uid == user_id]
+        
+        result = {}
+        for name, calls in items:
+            recent = sum(1 for ts in calls if now - ts < 60)
+            if recent and name in self._specs:
+                result[name] = (recent, self._specs[name].limit)
+        return result
+    
+    def dump_state(self) -> Dict:
+        """Kontrol noktası: hâlâ (bayat olarak da) kullanılabilir cevap önbelleği ve son dakikanın komut çağrıları"""
+        now = self.clock.time()
+        with self._lock:
+            cache = {key: entry for key, entry in self._cache.items() if entry[0] > now - Config.LOAD_STALE_MAX_AGE}
+            calls = {key: [ts for ts in stamps if now - ts < 60] for key, stamps in self._calls.items()}
+        return {'cache': cache, 'calls': {key: stamps for key, stamps in calls.items() if stamps}}
+    
+    def load_state(self, state: Dict):
+        with self._lock:
+            for key, entry in state['cache'].items():
+                self._cache.setdefault(key, entry)
+            for key, stamps in state['calls'].items():
+                self._calls.setdefault(key, stamps)
+    
+    def clear_cache(self, name: Optional[str] = None):
+        """Cevap önbelleğini (ya da yalnızca bir komutunkini) temizle"""
+        if name is None:
+            self._cache.clear()
+            return
+        for key in [key for key in self._cache if key[0] == name]:
+            self._cache.pop(key, None)
+
+def create_registry(clock: Optional[Clock] = None) -> CommandRegistry:
+    """Yerleşik komutları tanımlanmış yeni bir kayıt defteri oluştur"""
+    from .plugins import register_builtins
+    
+    registry = CommandRegistry(clock)
+    register_builtins(registry)
+    return registry
@@ -0,0 +1,227 @@
+"""Yorum cevapları: son gönderilerdeki yeni yorumları artımlı okuyup komutlara cevap ver.
+
+Her turda tek bir çağrıyla son gönderiler ve yorum sayıları alınır; yorumları
+yalnızca sayısı artan gönderiler için, kaldığı imleçten okunur. Böylece tur
+maliyeti toplam yorum sayısıyla değil yeni yorumlarla büyür. Gönderi başına
+son görülen yorum (pk) ve imleç veritabanında saklanır, yeniden başlatmada
+eski yorumlar tekrar cevaplanmaz.
+"""
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Optional, Tuple
+
+from .chunker import MessageChunker
+from .commands import CommandSpec
+from .config import Config
+from .resilience import AUTH, CONNECTION, THROTTLE, classify_error
+
+if TYPE_CHECKING:
+    from .bot import InstagramAIBot
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CommentReply:
+    """Gönderilmeyi bekleyen yorum cevabı"""
+    media_id: str
+    comment_pk: str
+    text: str
+
+class CommentPipeline:
+    """Yorum takibi, sınıflandırma ve cevap kuyruğu.
+    
+    Sınıflandırma DM'lerle aynı engel, hız sınırı, spam ve komut mantığını
+    kullanır; yalnızca `COMMENT_COMMANDS` içindeki komutlara cevap verilir,
+    sohbet yorumları cevapsız kalır. Cevaplar sınırlı bir kuyrukta bekler ve
+    DM'lerle paylaşılan giden jeton kovasında (bot.outbound) yer kaldıkça
+    gönderilir; DM cevapları önceliklidir.
+    """
+    
+    def __init__(self, bot: 'InstagramAIBot'):
+        self.bot = bot
+        self.queue: Deque[CommentReply] = deque(maxlen=Config.COMMENT_QUEUE_SIZE)
+        self.chunker = MessageChunker(Config.MAX_MESSAGE_LENGTH - 32)  # '@kullanıcıadı ' için pay
+        self.started = bot.clock.time()
+        self._cursors: Optional[Dict[str, Dict]] = None
+        self._last_poll: Optional[float] = None
+        self.stats = {'polls': 0, 'media_fetches': 0, 'comments': 0, 'replies': 0, 'sent': 0, 'dropped': 0}
+    
+    @property
+    def cursors(self) -> Dict[str, Dict]:
+        if self._cursors is None:
+            self._cursors = self.bot.db.get_media_cursors()
+        return self._cursors
+    
+    def dump_state(self) -> Dict:
+        """Kontrol noktası: gönderilmeyi bekleyen cevaplar ve son kontrol zamanı"""
+        return {'queue': list(self.queue), 'last_poll': self._last_poll}
+    
+    def load_state(self, state: Dict):
+        self.queue.extendleft(reversed(state['queue']))
+        self._last_poll = self._last_poll or state['last_poll']
+    
+    def due(self) -> bool:
+        return self._last_poll is None or self.bot.clock.time() - self._last_poll >= Config.COMMENT_POLL_INTERVAL
+    
+    def run_once(self) -> int:
+        """Zamanı geldiyse yeni yorumları oku, ardından kuyruktaki cevapları gönder"""
+        if self.due():
+            self.poll()
+        return self.flush()
+    
+    # ---- Okuma ----
+    
+    def poll(self) -> int:
+        """Son gönderilerdeki yeni yorumları sınıflandırıp kuyruğa ekle; yeni yorum sayısını döndürür"""
+        client = self.bot.client
+        self._last_poll = self.bot.clock.time()
+        self.stats['polls'] += 1
+        
+        medias = client.user_medias_v1(client.user_id, amount=Config.COMMENT_MEDIA_COUNT)
+        cursors = self.cursors
+        total = 0
+        
+        for media in medias:
+            media_id = str(media.id)
+            state = cursors.get(media_id)
+            count = media.comment_count or 0
+            
+            if state is not None and count <= state['comment_count']:
+                if count < state['comment_count']:  # Silinen yorumlar
+                    self._save(media_id, count, state['last_comment_pk'], state['cursor'])
+                continue
+            if state is None and not count:
+                self._save(media_id, 0, 0, None)
+                continue
+            
+            # Gönderi hatası yalnızca o gönderiyi etkiler
+            try:
+                comments, cursor = self._fetch(media_id, state)
+            except Exception as e:
+                if classify_error(e) in (CONNECTION, THROTTLE, AUTH):
+                    raise
+                logger.error(f"Failed to fetch comments for media {media_id}: {e}")
+                continue
+            
+            watermark = max([int(c.pk) for c in comments], default=state['last_comment_pk'] if state else 0)
+            # Parti dolduysa sayı geride bırakılır; kalanlar bir sonraki turda imleçten okunur
+            seen = count
+            if state is not None and len(comments) >= Config.COMMENT_BATCH_SIZE:
+                seen = min(count, state['comment_count'] + len(comments))
+            
+            # Bot başlamadan önce paylaşılmış gönderinin eski yorumları cevaplanmaz (yalnızca işaretlenir)
+            if state is not None or self._is_new(media):
+                total += len(comments)
+                self._classify(media_id, comments)
+            
+            self._save(media_id, seen, watermark, cursor)
+        
+        tracked = {str(media.id) for media in medias}
+        if len(cursors) > len(tracked):
+            self.bot.db.prune_media_cursors(tracked)
+            self._cursors = {media_id: state for media_id, state in cursors.items() if media_id in tracked}
+        self.stats['comments'] += total
+        return total
+    
+    def _is_new(self, media: Any) -> bool:
+        taken_at = getattr(media, 'taken_at', None)
+        return taken_at is not None and taken_at.timestamp() >= self.started - Config.COMMENT_POLL_INTERVAL
+    
+    def _fetch(self, media_id: str, state: Optional[Dict]) -> Tuple[List[Any], Optional[str]]:
+        """İmleçten itibaren son görülen yorumdan yeni yorumları oku (eskiden yeniye)"""
+        client = self.bot.client
+        watermark = state['last_comment_pk'] if state else 0
+        cursor = state['cursor'] if state else None
+        
+        self.stats['media_fetches'] += 1
+        comments, next_cursor = client.media_comments_chunk(media_id, Config.COMMENT_BATCH_SIZE, min_id=cursor)
+        fresh = [c for c in comments if int(c.pk) > watermark]
+        
+        if cursor and not fresh:
+            # İmleç süresi dolmuş ya da sayfalar bitmiş: en yeni sayfaya bak
+            self.stats['media_fetches'] += 1
+            comments, next_cursor = client.media_comments_chunk(media_id, Config.COMMENT_BATCH_SIZE)
+            fresh = [c for c in comments if int(c.pk) > watermark]
+        
+        fresh.sort(key=lambda c: int(c.pk))
+        return fresh, next_cursor or cursor
+    
+    def _save(self, media_id: str, count: int, last_pk: int, cursor: Optional[str]):
+        self.cursors[media_id] = {'comment_count': count, 'last_comment_pk': last_pk, 'cursor': cursor}
+        self.bot.db.save_media_cursor(media_id, count, last_pk, cursor)
+    
+    # ---- Sınıflandırma ----
+    
+    def _match(self, text: str) -> Optional[CommandSpec]:
+        """Yorumda cevaplanacak komut; oyun gibi oturum isteyen komutlar hariç"""
+        commands = self.bot.commands
+        if commands.match_prefix(text):
+            return None
+        spec = commands.match(text)
+        if spec is None or spec.name not in Config.COMMENT_COMMANDS:
+            return None
+        return spec
+    
+    def _classify(self, media_id: str, comments: List[Any]):
+        """Yeni yorumları toplu sınıflandır: ucuz elemeler önce, komutlar en son çalışır"""
+        security = self.bot.security
+        own_id = str(self.bot.client.user_id)
+        
+        for comment in comments:
+            user_id = int(comment.user.pk)
+            if str(comment.user.pk) == own_id or security.is_user_blocked(user_id):
+                continue
+            
+            text = comment.text.lower().strip()
+            spec = self._match(text)
+            if spec is None:
+                continue
+            
+            # Yorumlarda uyarı yazılmaz; sınırı aşan ya da spam olan yorum sessizce atlanır
+            if not security.check_rate_limit(user_id) or security.detect_spam(user_id, comment.text):
+                continue
+            
+            username = comment.user.username or "Unknown"
+            self.bot.db.create_user(user_id, username)
+            self.bot.db.update_user_stats(user_id, 'message_count')
+            self.bot.bot_stats.total_messages += 1
+            
+            try:
+                response = self.bot.commands.execute(spec, self.bot, user_id, text)
+            except Exception as e:
+                logger.error(f"Failed to process comment {comment.pk}: {e}", exc_info=True)
+                continue
+            
+            self.bot.db.log_message(user_id, comment.text, response, spec.name)
+            self._enqueue(CommentReply(media_id, str(comment.pk),
+                                       f"@{username} {next(self.chunker.chunks(response))}"))
+    
+    def _enqueue(self, reply: CommentReply):
+        if len(self.queue) == self.queue.maxlen:
+            self.stats['dropped'] += 1
+            logger.warning(f"Comment reply queue full, dropping reply to {self.queue[0].comment_pk}")
+        self.queue.append(reply)
+        self.stats['replies'] += 1
+    
+    # ---- Gönderim ----
+    
+    def flush(self) -> int:
+        """Jeton kovası izin verdikçe kuyruktaki cevapları gönder; gönderilen sayısını döndürür"""
+        sent = 0
+        while self.queue and self.bot.outbound.try_acquire():
+            reply = self.queue[0]
+            try:
+                self.bot.client.media_comment(reply.media_id, reply.text, replied_to_comment_id=reply.comment_pk)
+            except Exception as e:
+                if classify_error(e) in (CONNECTION, THROTTLE, AUTH):
+                    raise
+                logger.error(f"Failed to reply to comment {reply.comment_pk}: {e}")
+            else:
+                sent += 1
+                logger.info(f"Comment reply sent on media {reply.media_id}", extra={'sampled': True})
+            self.queue.popleft()
+        
+        self.stats['sent'] += sent
+        return sent
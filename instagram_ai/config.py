@@ -0,0 +1,140 @@
+"""Uygulama konfigürasyonu"""
+import logging
+import os
+
+
+class Config:
+    """Uygulama konfigürasyonu"""
+    INSTA_USER = "instagram-kullanıcı-adınız"
+    INSTA_PASS = "şifreniz"
+    
+    # API Anahtarları (Opsiyonel)
+    WEATHER_API_KEY = ""
+    NEWS_API_KEY = ""
+    TRANSLATE_API_KEY = ""
+    
+    # Database dosyası
+    DB_FILE = "bot_database.db"
+    SESSION_FILE = "insta_session.json"
+    QUESTIONS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "questions.tsv")
+    
+    # Admin kullanıcı ID'leri
+    ADMIN_IDS = [123456789]  # Instagram user_id'ler
+    
+    # Bot ayarları
+    CHECK_INTERVAL = (25, 45)  # Mesaj kontrol aralığı (saniye)
+    MAX_MESSAGE_LENGTH = 2000  # Instagram DM limiti
+    MAX_RETRY_COUNT = 5
+    NEWS_WORKERS = 2           # Haber kaynaklarını paralel çeken iş parçacığı sayısı
+    
+    # Adil zamanlama: bir turdaki mesajlar öncelik sınıfı ve kullanıcı bazında sıralanır
+    SCHEDULER_WEIGHTS = {'admin': 16, 'cheap': 8, 'network': 1}  # Doluyken sınıfların hizmet oranı
+    SCHEDULER_QUANTUM = 0.05         # DRR: kullanıcının tur başına işleme süresi hakkı (saniye)
+    SCHEDULER_MAX_WAIT = 20.0        # Bundan uzun bekleyen mesaj sınıfından bağımsız önce işlenir
+    
+    # Aşırı yük: derinlik ya da gecikme hedefi aşılınca kademeli hizmet moduna geçilir
+    LOAD_DEPTH_HIGH = 15             # Turda bekleyen mesaj; üstü baskı sayılır
+    LOAD_DEPTH_LOW = 5               # Normale dönmek için altında kalınması gereken derinlik
+    LOAD_LATENCY_SLO = 10.0          # Mesajın alınmasından cevaba gecikme hedefi (p95, saniye)
+    LOAD_ENTER_ROUNDS = 2            # Bu kadar ardışık baskılı turda kademeli moda geçilir
+    LOAD_EXIT_ROUNDS = 3             # Bu kadar ardışık rahat turda normale dönülür
+    LOAD_MAX_DEFER = 120.0           # Ağ komutları kademeli modda en fazla bu kadar ertelenir
+    LOAD_STALE_MAX_AGE = 3600.0      # Kademeli modda kabul edilen en eski önbellek kaydı (süre dolumundan beri)
+    
+    # Kuyruk modu (--mode poller/worker/sender/cluster): süreçler arası yerel SQLite kuyruğu
+    QUEUE_FILE = "bot_queue.db"
+    QUEUE_WORKERS = 2                # cluster modunda başlatılan işçi süreci sayısı
+    QUEUE_LEASE_TIMEOUT = 60.0       # Onaylanmayan kayıt bu süreden sonra yeniden dağıtılır
+    QUEUE_POLL_INTERVAL = (0.5, 1.0) # İşçi/gönderici boştayken kuyruk kontrol aralığı
+    QUEUE_BATCH_SIZE = 20
+    QUEUE_RETENTION = 24 * 3600      # Tamamlanan kayıtlar (tekilleştirme için) bu kadar saklanır
+    
+    # Anlık mod (--mode push): DM'ler olay kaynaklarından gelir, yoklama yalnızca uzlaştırma taramasıdır
+    PUSH_SOURCES = ('webhook',)      # 'webhook' ve/veya 'realtime'
+    PUSH_RECONCILE_INTERVAL = 300    # Kaçırılan mesajlar için sohbet listesi tarama aralığı (saniye)
+    PUSH_WAIT = 1.0                  # Bir turda ilk mesaj için en fazla bekleme (saniye)
+    PUSH_BATCH_SIZE = 20             # Bir turda işlenen en fazla mesaj
+    PUSH_QUEUE_SIZE = 1000           # Bekleyen en fazla anlık mesaj (dolarsa tarama yakalar)
+    WEBHOOK_HOST = "127.0.0.1"
+    WEBHOOK_PORT = 8787
+    WEBHOOK_TOKEN = ""               # Ayarlıysa X-Webhook-Token başlığı zorunlu
+    REALTIME_LISTENER = ""           # Anlık bağlantı fabrikası ('paket.modül:fabrika'), istemciyi alır
+    
+    # Giden istek biçimlendirme: DM ve yorum cevapları aynı jeton kovasını paylaşır
+    OUTBOUND_RATE = 0.5              # Saniyede gönderim (uzun vadeli ortalama)
+    OUTBOUND_BURST = 5               # Beklemeden art arda yapılabilecek gönderim
+    
+    # Yorum cevapları: son gönderilerdeki yeni yorumlara komut cevabı
+    COMMENT_REPLIES = True
+    COMMENT_POLL_INTERVAL = 120      # Gönderi listesi ve yeni yorum kontrolü aralığı (saniye)
+    COMMENT_MEDIA_COUNT = 12         # Takip edilen son gönderi sayısı
+    COMMENT_BATCH_SIZE = 50          # Gönderi başına bir turda okunan en fazla yorum
+    COMMENT_QUEUE_SIZE = 200         # Gönderilmeyi bekleyen en fazla yorum cevabı (dolarsa eskiler düşer)
+    COMMENT_COMMANDS = ('yardım', 'fıkra', 'bilgi', 'söz', 'yemek', 'saat', 'döviz', 'hava', 'bot')
+    
+    # Yönetim: ADMIN_IDS'ten gelen '/' ile başlayan DM'ler ve yerel kontrol soketi
+    ADMIN_PREFIX = "/"
+    CONTROL_SOCKET = "bot.sock"  # Boş bırakılırsa soket açılmaz
+    SHARED_ADMIN = False         # Kuyruk modu rolleri açar: 'set' ve 'cache' tüm süreçlere kuyruk dosyasıyla iletilir
+    ADMIN_SYNC_INTERVAL = 2.0    # Diğer süreçlerin yönetim değişikliklerinin kontrol aralığı (saniye)
+    
+    # Güvenlik
+    MAX_MESSAGES_PER_MINUTE = 10
+    BLOCK_THRESHOLD = 100  # Spam için blok eşiği
+    SPAM_BLOCK_DURATION = None  # Spam engelinin süresi (saniye); None: kalıcı
+    
+    # Hız/spam sayaçları: kuyruk modunda süreçler arası paylaşılan mmap tablosu
+    SHARED_COUNTERS = False                  # Kuyruk modu rolleri açar
+    SHARED_COUNTERS_FILE = "bot_counters.bin"
+    SHARED_COUNTER_SLOTS = 65536             # Sabit boyut; dolunca en eski kullanıcı çıkarılır
+    SHARED_COUNTER_STRIPES = 64              # Kilit şeridi sayısı
+    
+    # Komut maliyet sınıfına göre kullanıcı başına dakikalık limit (None: sınırsız)
+    COMMAND_RATE_LIMITS = {'cheap': None, 'db': 20, 'network': 6}
+    COMMAND_CACHE_SIZE = 1024
+    
+    # Döviz kuru geçmişi (mmap halka tampon)
+    EXCHANGE_CURRENCIES = ('USD', 'EUR', 'GBP')
+    RATES_FILE = "rates.bin"
+    RATE_HISTORY_SIZE = 8192     # Para birimi başına saklanan kayıt (dakikalıkla ~5.5 gün)
+    RATE_SAMPLE_INTERVAL = 60    # Bundan sık gelen çekimler son kaydın üzerine yazılır (saniye)
+    RATE_STALE_AFTER = 15 * 60   # Son gerçek kur bundan eskiyse cevapta belirtilir
+    
+    # Instagram oturumu
+    SESSION_VALIDATE_INTERVAL = 15 * 60   # Bu süre içinde doğrulanmış oturum ağsız kabul edilir
+    SESSION_REFRESH_INTERVAL = 6 * 3600   # Arka planda proaktif doğrulama/yenileme aralığı
+    CHALLENGE_TIMEOUT = 15 * 60           # Yöneticinin doğrulama kodu göndermesi için süre
+    RECONNECT_DELAY = 2.0                 # Geçici bağlantı hatasından sonra bekleme (saniye)
+    
+    # Hata sınıfı -> (ilk bekleme, en fazla bekleme) saniye; ardışık hatalarda iki katına çıkar
+    BACKOFF_POLICIES = {
+        'connection': (RECONNECT_DELAY, 120.0),
+        'throttle': (60.0, 900.0),
+        'auth': (30.0, 600.0),
+        'client': (5.0, 300.0),
+        'unexpected': (5.0, 300.0)
+    }
+    POISON_THRESHOLD = 3  # Bu kadar kez işlenemeyen mesaj karantinaya alınır
+    
+    # Kontrol noktası: sayaçlar, aktif oyunlar, cevaplanan mesajlar ve önbellekler
+    CHECKPOINT_FILE = "bot_state.ckpt"   # Boş bırakılırsa kontrol noktası tutulmaz
+    CHECKPOINT_INTERVAL = 300            # Periyodik yazım aralığı (saniye); kapanışta da yazılır
+    CHECKPOINT_COMPRESSION = 1           # zlib seviyesi (hız öncelikli)
+    
+    # Olay günlüğü
+    JOURNAL_DIR = "journal"
+    JOURNAL_SEGMENT_SIZE = 16 * 1024 * 1024  # Segment döndürme eşiği (bayt)
+    JOURNAL_FSYNC_EVERY = 64                 # Bu kadar kayıtta bir fsync
+    JOURNAL_FSYNC_INTERVAL = 1.0             # ...ya da en geç bu kadar saniyede bir
+    SNAPSHOT_EVERY = 10000                   # Bu kadar olayda bir anlık görüntü
+    
+    # Logging
+    LOG_FILE = "bot.log"
+    LOG_LEVEL = logging.INFO
+    LOG_JSON = True                        # Dosyaya satır başına bir JSON kaydı
+    LOG_MAX_BYTES = 10 * 1024 * 1024       # Boyut eşiğinde döndür...
+    LOG_ROTATE_INTERVAL = 24 * 3600        # ...ya da en geç bu kadar saniyede bir
+    LOG_BACKUP_COUNT = 7                   # Saklanan sıkıştırılmış eski dosya sayısı
+    LOG_QUEUE_SIZE = 10000                 # Dolarsa yeni kayıtlar düşürülür (döngü beklemez)
+    LOG_SAMPLE_BURST = 20                  # Örneklenen olaylarda dakikada tamamı yazılan ilk kayıt
+    LOG_SAMPLE_EVERY = 10                  # ...sonrasında her N kayıttan biri
@@ -0,0 +1,60 @@
+"""Bot içerikleri"""
+import random
+from typing import Dict
+
+
+class ContentManager:
+    """Bot içeriğini yönet"""
+    
+    FIKRALAR = [
+        "Geçen gün bi taksi çevirdim hala dönüyor.",
+        "Bi adam gülmüş karısı da papatya",
+        "İki yanlış bir Wi-Fi bağlatmaz!",
+        "Programcı hayatı: 99 başarısızlık, 1 çalışıyor. Çalışanı sil, 99'a geri dön.",
+        "C++: İnsanın kendi ayağına sıkabileceği en güçlü silah."
+    ]
+    
+    BILGILER = [
+        "Zürafaların ses telleri yoktur.",
+        "Bir insanın parmak izi gibi dil izi de benzersizdir.",
+        "Bal bozulmayan tek gıdadır.",
+        "Dünyadaki karıncaların toplam ağırlığı, insanların toplam ağırlığına eşittir.",
+        "Bir insan hayatı boyunca ortalama 35 ton yemek yer.",
+        "Uzayda ağlamak imkansızdır çünkü gözyaşları düşmez."
+    ]
+    
+    SOZLER = [
+        "Hayat bir hıyardır, tuzu olan koşsun.",
+        "Azimle sıçan, duvarı deler.",
+        "Bugünün işini yarına bırakma, yarın başka işin çıkar.",
+        "Kod yazmak: %10 ilham, %90 stackoverflow."
+    ]
+    
+    YEMEKLER = [
+        {"name": "🌯 Dürüm", "desc": "Acılı, soğanlı, bol salatalı", "calories": 450},
+        {"name": "🍕 Pizza", "desc": "Pepperoni, ekstra peynir", "calories": 850},
+        {"name": "🥙 Lahmacun", "desc": "Bol limonlu, kıymalı", "calories": 300},
+        {"name": "🍔 Burger", "desc": "Çift köfte, cheddar, bacon", "calories": 750},
+        {"name": "🍝 Makarna", "desc": "Bolonez soslu", "calories": 500},
+        {"name": "🍣 Sushi", "desc": "Somon, avokado", "calories": 350},
+        {"name": "🥗 Salata", "desc": "Akdeniz usulü", "calories": 250}
+    ]
+    
+    @staticmethod
+    def get_random_fikra() -> str:
+        return random.choice(ContentManager.FIKRALAR)
+    
+    @staticmethod
+    def get_random_bilgi() -> str:
+        return random.choice(ContentManager.BILGILER)
+    
+    @staticmethod
+    def get_random_soz() -> str:
+        return random.choice(ContentManager.SOZLER)
+    
+    @staticmethod
+    def get_random_yemek() -> Dict:
+        yemek = random.choice(ContentManager.YEMEKLER)
+        yemek['price'] = random.randint(30, 150)
+        yemek['rating'] = random.randint(7, 10) / 2  # 3.5-5.0 yıldız
+        return yemek
@@ -0,0 +1,238 @@
+"""Kullanıcı başına hız sınırı ve spam sayaçları: süreç içi ya da süreçler arası paylaşımlı"""
+import mmap
+import os
+import struct
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from .clock import Clock, SystemClock
+from .config import Config
+
+try:
+    import fcntl
+except ImportError:  # Windows: yalnızca süreç içi kilitler
+    fcntl = None
+
+
+class LocalCounters:
+    """Tek süreç için sözlük tabanlı sayaçlar (kayan pencere, tam zaman damgalarıyla)"""
+    
+    def __init__(self, clock: Optional[Clock] = None):
+        self.clock = clock or SystemClock()
+        self.message_timestamps: Dict[int, List[float]] = {}
+        self.spam_detection: Dict[int, int] = {}
+    
+    def allow(self, user_id: int, limit: int, window: float = 60.0) -> bool:
+        """Pencere içindeki mesaj sayısı limitin altındaysa mesajı say ve True döndür"""
+        now = self.clock.time()
+        timestamps = [ts for ts in self.message_timestamps.get(user_id, ()) if now - ts < window]
+        self.message_timestamps[user_id] = timestamps
+        
+        if len(timestamps) >= limit:
+            return False
+        timestamps.append(now)
+        return True
+    
+    def add_spam(self, user_id: int) -> int:
+        self.spam_detection[user_id] = self.spam_detection.get(user_id, 0) + 1
+        return self.spam_detection[user_id]
+    
+    def reset(self, user_id: int):
+        self.spam_detection.pop(user_id, None)
+    
+    def snapshot(self, user_id: int, window: float = 60.0) -> Tuple[float, int]:
+        """(penceredeki mesaj sayısı, spam puanı)"""
+        now = self.clock.time()
+        recent = sum(1 for ts in self.message_timestamps.get(user_id, ()) if now - ts < window)
+        return recent, self.spam_detection.get(user_id, 0)
+    
+    def __len__(self) -> int:
+        return len(self.message_timestamps.keys() | self.spam_detection.keys())
+    
+    def dump_state(self, window: float = 60.0) -> Dict:
+        """Kontrol noktası için durum (süresi dolan pencereler atılır)"""
+        now = self.clock.time()
+        timestamps = {}
+        for user_id, stamps in list(self.message_timestamps.items()):
+            recent = [ts for ts in stamps if now - ts < window]
+            if recent:
+                timestamps[user_id] = recent
+        return {'timestamps': timestamps, 'spam': dict(self.spam_detection)}
+    
+    def load_state(self, state: Dict):
+        self.message_timestamps.update(state['timestamps'])
+        self.spam_detection.update(state['spam'])
+
+class SharedCounters:
+    """Süreçler arası paylaşılan, dosyaya eşlenmiş (mmap) sabit yuvalı hash tablosu.
+    
+    Her yuva bir kullanıcının sayaçlarını tutar: son iki pencerenin mesaj
+    sayısı (kayan pencere yaklaşık olarak `önceki * kalan oran + şimdiki` ile
+    hesaplanır) ve spam puanı. Tablo `stripes` şeride bölünür; kullanıcı
+    şeridini hash'inden alır ve yalnızca o şerit kilitlenir (süreç içinde
+    threading.Lock, süreçler arasında dosyanın ilgili baytına fcntl kilidi).
+    Şerit içinde `PROBE_LIMIT` yuva aranır; boş yuva yoksa en uzun süredir
+    kullanılmayan yuva boşaltılır, böylece tablo boyutu sabit kalır.
+    """
+    
+    MAGIC = b'IGCT'
+    HEADER = struct.Struct('<4sII')        # magic, yuva sayısı, şerit sayısı
+    SLOT = struct.Struct('<QddIII4x')      # anahtar, son kullanım, pencere başı, şimdiki, önceki, spam
+    PROBE_LIMIT = 8
+    
+    def __init__(self, path: Optional[str] = None, slots: Optional[int] = None, stripes: Optional[int] = None,
+                 clock: Optional[Clock] = None):
+        self.path = path or Config.SHARED_COUNTERS_FILE
+        self.clock = clock or SystemClock()
+        slots = slots or Config.SHARED_COUNTER_SLOTS
+        stripes = stripes or Config.SHARED_COUNTER_STRIPES
+        
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        with self._file_lock(0):
+            size = os.fstat(self._fd).st_size
+            if size < self.HEADER.size:
+                os.ftruncate(self._fd, self.HEADER.size + slots * self.SLOT.size)
+                os.pwrite(self._fd, self.HEADER.pack(self.MAGIC, slots, stripes), 0)
+            magic, self.slots, self.stripes = self.HEADER.unpack(os.pread(self._fd, self.HEADER.size, 0))
+            if magic != self.MAGIC:
+                raise ValueError(f"{self.path} is not a counter table")
+        
+        # Tabloyu ilk açan sürecin boyutları geçerlidir
+        self.per_stripe = self.slots // self.stripes
+        self._map = mmap.mmap(self._fd, self.HEADER.size + self.slots * self.SLOT.size)
+        self._locks = [threading.Lock() for _ in range(self.stripes)]
+    
+    # ---- Kilitleme ----
+    
+    def _file_lock(self, byte: int):
+        return _ByteRangeLock(self._fd, byte)
+    
+    def _locate(self, user_id: int) -> Tuple[int, int]:
+        """(şerit, şeritteki ilk yuva) - Fibonacci hash"""
+        h = (user_id * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+        stripe = (h >> 32) % self.stripes
+        return stripe, stripe * self.per_stripe + (h & 0xFFFFFFFF) % self.per_stripe
+    
+    def _probe(self, stripe: int, start: int, key: int) -> Tuple[int, tuple, bool]:
+        """Şerit kilidi altında çağrılır: (yuva konumu, alanlar, kullanıcı bulundu mu).
+        
+        Kullanıcı bulunamazsa ilk boş yuva, o da yoksa en uzun süredir
+        kullanılmayan yuva boş alanlarla döner (ayırma çağıranın işidir).
+        """
+        base = stripe * self.per_stripe
+        victim, victim_used = None, None
+        for i in range(min(self.PROBE_LIMIT, self.per_stripe)):
+            slot = base + (start - base + i) % self.per_stripe
+            offset = self.HEADER.size + slot * self.SLOT.size
+            fields = self.SLOT.unpack_from(self._map, offset)
+            if fields[0] == key:
+                return offset, fields, True
+            if fields[0] == 0:
+                return offset, (key, 0.0, 0.0, 0, 0, 0), False
+            if victim is None or fields[1] < victim_used:
+                victim, victim_used = offset, fields[1]
+        # Şerit dolu: en uzun süredir kullanılmayan kullanıcı çıkarılır
+        return victim, (key, 0.0, 0.0, 0, 0, 0), False
+    
+    def _update(self, user_id: int, fn, allocate: bool = True) -> tuple:
+        """Kullanıcının yuvasını şerit kilidi altında bul/ayır ve `fn` ile güncelle.
+        
+        `allocate=False` ise tabloda olmayan kullanıcı için yuva ayrılmaz
+        (başka bir kullanıcı çıkarılmaz) ve None döner.
+        """
+        stripe, start = self._locate(user_id)
+        with self._locks[stripe], self._file_lock(self.HEADER.size + stripe):
+            offset, fields, found = self._probe(stripe, start, user_id + 1)  # 0: boş yuva
+            if not found and not allocate:
+                return None
+            
+            fields, result = fn(fields)
+            self.SLOT.pack_into(self._map, offset, *fields)
+            return result
+    
+    def _read(self, user_id: int) -> Optional[tuple]:
+        """Kullanıcının yuvasını yalnızca oku; tabloda yoksa None (yuva ayrılmaz, yazılmaz)"""
+        stripe, start = self._locate(user_id)
+        with self._locks[stripe], self._file_lock(self.HEADER.size + stripe):
+            _, fields, found = self._probe(stripe, start, user_id + 1)
+            return fields if found else None
+    
+    # ---- Sayaçlar ----
+    
+    def allow(self, user_id: int, limit: int, window: float = 60.0) -> bool:
+        """Pencere içindeki (tahmini) mesaj sayısı limitin altındaysa mesajı say ve True döndür"""
+        now = self.clock.time()
+        
+        def fn(fields):
+            key, _, started, current, previous, spam = self._roll(fields, now, window)
+            elapsed = (now - started) / window
+            if previous * (1 - elapsed) + current >= limit:
+                return (key, now, started, current, previous, spam), False
+            return (key, now, started, current + 1, previous, spam), True
+        
+        return self._update(user_id, fn)
+    
+    def add_spam(self, user_id: int) -> int:
+        def fn(fields):
+            key, _, started, current, previous, spam = fields
+            return (key, self.clock.time(), started, current, previous, spam + 1), spam + 1
+        
+        return self._update(user_id, fn)
+    
+    def reset(self, user_id: int):
+        def fn(fields):
+            key, used, started, current, previous, _ = fields
+            return (key, used, started, current, previous, 0), None
+        
+        self._update(user_id, fn, allocate=False)
+    
+    def snapshot(self, user_id: int, window: float = 60.0) -> Tuple[float, int]:
+        """(penceredeki tahmini mesaj sayısı, spam puanı); yönetim okuması tabloyu değiştirmez"""
+        fields = self._read(user_id)
+        if fields is None:
+            return 0.0, 0
+        
+        now = self.clock.time()
+        _, _, started, current, previous, spam = self._roll(fields, now, window)
+        return previous * (1 - (now - started) / window) + current, spam
+    
+    @staticmethod
+    def _roll(fields: tuple, now: float, window: float) -> tuple:
+        """Pencere dolduysa şimdiki sayacı öncekine kaydır"""
+        key, used, started, current, previous, spam = fields
+        if now - started >= 2 * window:
+            return key, used, now - (now - started) % window, 0, 0, spam
+        if now - started >= window:
+            return key, used, started + window, 0, current, spam
+        return fields
+    
+    def __len__(self) -> int:
+        """Dolu yuva sayısı"""
+        return sum(1 for slot in range(self.slots)
+                   if self.SLOT.unpack_from(self._map, self.HEADER.size + slot * self.SLOT.size)[0])
+    
+    def dump_state(self) -> None:
+        """Tablo zaten dosyada; kontrol noktasına yazılacak bir şey yok"""
+        return None
+    
+    def load_state(self, state: Dict):
+        pass
+    
+    def close(self):
+        self._map.close()
+        os.close(self._fd)
+
+class _ByteRangeLock:
+    """Dosyanın tek baytı üzerinde süreçler arası özel kilit (fcntl yoksa hiçbir şey yapmaz)"""
+    
+    def __init__(self, fd: int, byte: int):
+        self.fd = fd
+        self.byte = byte
+    
+    def __enter__(self):
+        if fcntl is not None:
+            fcntl.lockf(self.fd, fcntl.LOCK_EX, 1, self.byte)
+    
+    def __exit__(self, *exc):
+        if fcntl is not None:
+            fcntl.lockf(self.fd, fcntl.LOCK_UN, 1, self.byte)
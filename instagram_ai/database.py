@@ -0,0 +1,468 @@
+"""SQLite veritabanı yönetimi"""
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from .clock import Clock, SystemClock
+from .config import Config
+from .journal import EventJournal, StateProjection
+from .rollups import RollupStore
+from .timers import TimerWheel
+
+logger = logging.getLogger(__name__)
+
+
+class Database:
+    """SQLite veritabanı yönetimi"""
+    
+    def __init__(self, clock: Optional[Clock] = None):
+        self.conn = sqlite3.connect(Config.DB_FILE, check_same_thread=False)
+        self.lock = threading.RLock()
+        self.clock = clock or SystemClock()
+        
+        # Oturum ömürleri bellekte tutulur: user_id -> (state, expires)
+        self._sessions: Dict[int, Tuple[str, float]] = {}
+        self._session_expiry = TimerWheel(start=self.clock.time())
+        self._expiry_listeners: List[Callable[[List[int]], None]] = []
+        self._reaper: Optional[threading.Thread] = None
+        
+        self.create_tables()
+        self._load_sessions()
+        
+        # Tüm durum değişiklikleri günlüğe eklenir; sayaçlar ve projeksiyon ondan beslenir
+        self.journal = EventJournal(Config.JOURNAL_DIR, self.clock)
+        self.projection = StateProjection(self.journal)
+        self.rollups = RollupStore(self)
+    
+    def create_tables(self):
+        """Gerekli tabloları oluştur"""
+        cursor = self.conn.cursor()
+        
+        # Kullanıcı istatistikleri
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS users (
+                user_id INTEGER PRIMARY KEY,
+                username TEXT,
+                first_seen TIMESTAMP,
+                last_seen TIMESTAMP,
+                message_count INTEGER DEFAULT 0,
+                fikra_count INTEGER DEFAULT 0,
+                bilgi_count INTEGER DEFAULT 0,
+                game_wins INTEGER DEFAULT 0,
+                is_blocked BOOLEAN DEFAULT 0,
+                blocked_until REAL,
+                settings TEXT DEFAULT '{}'
+            )
+        ''')
+        
+        # Mesaj logları
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS messages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER,
+                message TEXT,
+                response TEXT,
+                timestamp TIMESTAMP,
+                command TEXT,
+                FOREIGN KEY(user_id) REFERENCES users(user_id)
+            )
+        ''')
+        
+        # Eski veritabanları için engel bitiş zamanı (NULL: kalıcı)
+        columns = [row[1] for row in cursor.execute('PRAGMA table_info(users)')]
+        if 'blocked_until' not in columns:
+            cursor.execute('ALTER TABLE users ADD COLUMN blocked_until REAL')
+        
+        # Eski veritabanları için komut sütunu
+        columns = [row[1] for row in cursor.execute('PRAGMA table_info(messages)')]
+        if 'command' not in columns:
+            cursor.execute('ALTER TABLE messages ADD COLUMN command TEXT')
+        
+        # Artımlı toplam sayaçları (liderlik tabloları)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS rollup_counters (
+                metric TEXT,
+                key TEXT,
+                value INTEGER DEFAULT 0,
+                PRIMARY KEY(metric, key)
+            )
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_rollup_top
+            ON rollup_counters (metric, value DESC)
+        ''')
+        
+        # Sayaçların günlükte nereye kadar yazıldığı (çökme sonrası yeniden oynatma için)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS rollup_state (
+                name TEXT PRIMARY KEY,
+                value INTEGER
+            )
+        ''')
+        
+        # Saatlik/günlük aktivite
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS activity_buckets (
+                granularity TEXT,
+                bucket TEXT,
+                messages INTEGER DEFAULT 0,
+                PRIMARY KEY(granularity, bucket)
+            )
+        ''')
+        
+        # Oturum durumları
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS sessions (
+                user_id INTEGER PRIMARY KEY,
+                state TEXT,
+                state_data TEXT,
+                expires TIMESTAMP,
+                FOREIGN KEY(user_id) REFERENCES users(user_id)
+            )
+        ''')
+        
+        # Bilgi yarışmasında görülen sorular (soru id bit kümesi)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS quiz_seen (
+                user_id INTEGER PRIMARY KEY,
+                seen BLOB,
+                FOREIGN KEY(user_id) REFERENCES users(user_id)
+            )
+        ''')
+        
+        # İşlenemeyen (zehirli) mesajlar
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS dead_letters (
+                message_id TEXT PRIMARY KEY,
+                thread_id TEXT,
+                user_id INTEGER,
+                message TEXT,
+                error TEXT,
+                attempts INTEGER,
+                failed_at TIMESTAMP
+            )
+        ''')
+        
+        # API cache
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                value TEXT,
+                expires TIMESTAMP
+            )
+        ''')
+        
+        # Yorum takibi: gönderi başına son görülen yorum ve sayfa imleci
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS media_cursors (
+                media_id TEXT PRIMARY KEY,
+                comment_count INTEGER DEFAULT 0,
+                last_comment_pk INTEGER DEFAULT 0,
+                cursor TEXT,
+                updated_at TIMESTAMP
+            )
+        ''')
+        
+        self.conn.commit()
+    
+    def get_user(self, user_id: int) -> Optional[Dict]:
+        """Kullanıcı bilgilerini getir"""
+        cursor = self.conn.cursor()
+        cursor.execute('SELECT * FROM users WHERE user_id = ?', (user_id,))
+        row = cursor.fetchone()
+        if row:
+            columns = [desc[0] for desc in cursor.description]
+            return dict(zip(columns, row))
+        return None
+    
+    def create_user(self, user_id: int, username: str = ""):
+        """Yeni kullanıcı oluştur"""
+        now = self.clock.now().isoformat()
+        with self.lock:
+            cursor = self.conn.execute('''
+                INSERT OR IGNORE INTO users (user_id, username, first_seen, last_seen)
+                VALUES (?, ?, ?, ?)
+            ''', (user_id, username, now, now))
+            self.conn.commit()
+        
+        if cursor.rowcount == 1:
+            self.journal.append('user_created', user_id=user_id, username=username)
+    
+    def update_user_stats(self, user_id: int, field: str, increment: int = 1):
+        """Kullanıcı istatistiklerini güncelle"""
+        now = self.clock.now()
+        with self.lock:
+            self.conn.execute(f'''
+                UPDATE users 
+                SET {field} = {field} + ?, last_seen = ?
+                WHERE user_id = ?
+            ''', (increment, now.isoformat(), user_id))
+            self.conn.commit()
+        
+        self.journal.append('user_stat', user_id=user_id, field=field, increment=increment)
+    
+    def log_message(self, user_id: int, message: str, response: str, command: Optional[str] = None):
+        """Mesajı logla"""
+        with self.lock:
+            self.conn.execute('''
+                INSERT INTO messages (user_id, message, response, timestamp, command)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (user_id, message, response, self.clock.now().isoformat(), command))
+            self.conn.commit()
+        
+        self.journal.append('message_logged', user_id=user_id, message=message,
+                            response=response, command=command)
+    
+    def block_user(self, user_id: int, blocked: bool = True, until: Optional[float] = None):
+        """Kullanıcıyı engelle / engeli kaldır; `until` verilirse engel o zamanda biter"""
+        until = until if blocked else None
+        with self.lock:
+            cursor = self.conn.execute(
+                'UPDATE users SET is_blocked = ?, blocked_until = ? WHERE user_id = ?',
+                (int(blocked), until, user_id)
+            )
+            self.conn.commit()
+        
+        if cursor.rowcount == 0 and blocked:
+            # Henüz hiç yazmamış kullanıcı (ör. yönetici tarafından önceden engellenen)
+            self.create_user(user_id)
+            return self.block_user(user_id, blocked, until)
+        
+        self.journal.append('user_blocked', user_id=user_id, blocked=blocked, until=until)
+    
+    def get_blocked_users(self) -> Dict[int, Optional[float]]:
+        """Engelli kullanıcılar: user_id -> engel bitiş zamanı (None: kalıcı)"""
+        with self.lock:
+            return dict(self.conn.execute('SELECT user_id, blocked_until FROM users WHERE is_blocked = 1'))
+    
+    def get_media_cursors(self) -> Dict[str, Dict]:
+        """Takip edilen gönderiler: media_id -> {comment_count, last_comment_pk, cursor}"""
+        with self.lock:
+            rows = self.conn.execute('SELECT media_id, comment_count, last_comment_pk, cursor FROM media_cursors')
+            return {
+                media_id: {'comment_count': count, 'last_comment_pk': last_pk, 'cursor': cursor}
+                for media_id, count, last_pk, cursor in rows
+            }
+    
+    def save_media_cursor(self, media_id: str, comment_count: int, last_comment_pk: int,
+                          cursor: Optional[str]):
+        with self.lock:
+            self.conn.execute('''
+                INSERT OR REPLACE INTO media_cursors (media_id, comment_count, last_comment_pk, cursor, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (str(media_id), comment_count, last_comment_pk, cursor, self.clock.now().isoformat()))
+            self.conn.commit()
+    
+    def prune_media_cursors(self, keep: Set[str]):
+        """Artık takip edilmeyen gönderilerin imleçlerini sil"""
+        with self.lock:
+            stale = [row[0] for row in self.conn.execute('SELECT media_id FROM media_cursors')
+                     if row[0] not in keep]
+            self.conn.executemany('DELETE FROM media_cursors WHERE media_id = ?', [(m,) for m in stale])
+            self.conn.commit()
+    
+    def add_dead_letter(self, message_id: str, thread_id: str, user_id: int, message: str,
+                        error: str, attempts: int):
+        """Mesajı karantinaya al"""
+        with self.lock:
+            self.conn.execute('''
+                INSERT OR REPLACE INTO dead_letters
+                (message_id, thread_id, user_id, message, error, attempts, failed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (str(message_id), str(thread_id), user_id, message, error, attempts, self.clock.now().isoformat()))
+            self.conn.commit()
+        
+        self.journal.append('dead_letter', message_id=str(message_id), thread_id=str(thread_id),
+                            user_id=user_id, error=error)
+    
+    def dead_letter_ids(self) -> Set[str]:
+        with self.lock:
+            return {row[0] for row in self.conn.execute('SELECT message_id FROM dead_letters')}
+    
+    def get_dead_letters(self, limit: int = 20) -> List[Dict]:
+        """Son karantinaya alınan mesajlar"""
+        with self.lock:
+            cursor = self.conn.execute(
+                'SELECT * FROM dead_letters ORDER BY failed_at DESC LIMIT ?', (limit,)
+            )
+            columns = [desc[0] for desc in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    
+    def get_quiz_seen(self, user_id: int) -> int:
+        """Kullanıcının gördüğü soruların bit kümesi"""
+        with self.lock:
+            row = self.conn.execute('SELECT seen FROM quiz_seen WHERE user_id = ?', (user_id,)).fetchone()
+        return int.from_bytes(row[0], 'little') if row and row[0] else 0
+    
+    def set_quiz_seen(self, user_id: int, seen: int):
+        """Görülen soru bit kümesini kaydet"""
+        blob = seen.to_bytes((seen.bit_length() + 7) // 8, 'little')
+        with self.lock:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO quiz_seen (user_id, seen) VALUES (?, ?)', (user_id, blob)
+            )
+            self.conn.commit()
+        
+        self.journal.append('quiz_seen', user_id=user_id, seen=blob.hex())
+    
+    def _load_sessions(self):
+        """Yeniden başlatmada oturum ömürlerini yükle, süresi dolanları toplu sil"""
+        now = self.clock.time()
+        expired = []
+        
+        with self.lock:
+            rows = self.conn.execute('SELECT user_id, state, expires FROM sessions').fetchall()
+            for user_id, state, expires in rows:
+                try:
+                    expires_ts = datetime.fromisoformat(expires).timestamp()
+                except (TypeError, ValueError):
+                    expires_ts = 0.0
+                
+                if expires_ts <= now:
+                    expired.append(user_id)
+                else:
+                    self._sessions[user_id] = (state, expires_ts)
+                    self._session_expiry.schedule(user_id, expires_ts)
+            
+            if expired:
+                self.conn.executemany('DELETE FROM sessions WHERE user_id = ?', [(uid,) for uid in expired])
+                self.conn.commit()
+        
+        if expired:
+            logger.info(f"Purged {len(expired)} expired sessions on startup")
+    
+    def set_session(self, user_id: int, state: str, data: Dict, ttl: int = 300):
+        """Oturum durumunu kaydet"""
+        expires_ts = self.clock.time() + ttl
+        expires = datetime.fromtimestamp(expires_ts).isoformat()
+        data_json = json.dumps(data, ensure_ascii=False)
+        
+        with self.lock:
+            self.conn.execute('''
+                INSERT OR REPLACE INTO sessions (user_id, state, state_data, expires)
+                VALUES (?, ?, ?, ?)
+            ''', (user_id, state, data_json, expires))
+            self.conn.commit()
+            
+            self._sessions[user_id] = (state, expires_ts)
+            self._session_expiry.schedule(user_id, expires_ts)
+        
+        self.journal.append('session_set', user_id=user_id, state=state, data=data, expires=expires_ts)
+    
+    def update_session_data(self, user_id: int, fields: Dict):
+        """Oturum verisinde yalnızca verilen alanları güncelle (json_set)"""
+        if not fields:
+            return
+        
+        paths = ", ".join("?, json(?)" for _ in fields)
+        params = []
+        for key, value in fields.items():
+            params.extend((f"$.{key}", json.dumps(value, ensure_ascii=False)))
+        
+        with self.lock:
+            self.conn.execute(
+                f'UPDATE sessions SET state_data = json_set(state_data, {paths}) WHERE user_id = ?',
+                (*params, user_id)
+            )
+            self.conn.commit()
+        
+        self.journal.append('session_data', user_id=user_id, fields=fields)
+    
+    def session_count(self) -> int:
+        """Bellekte ömrü izlenen oturum sayısı (süresi dolup henüz temizlenmemişler dahil)"""
+        return len(self._sessions)
+    
+    def has_session(self, user_id: int) -> bool:
+        """Canlı oturum var mı? (diske dokunmadan, O(1))"""
+        entry = self._sessions.get(user_id)
+        return entry is not None and entry[1] > self.clock.time()
+    
+    def get_session(self, user_id: int) -> Optional[Dict]:
+        """Oturum durumunu getir"""
+        entry = self._sessions.get(user_id)
+        if entry is None or entry[1] <= self.clock.time():
+            return None
+        
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT state, state_data FROM sessions WHERE user_id = ?', (user_id,)
+            ).fetchone()
+        
+        if row:
+            return {
+                'state': row[0],
+                'data': json.loads(row[1]) if row[1] else {},
+                'expires': entry[1]
+            }
+        return None
+    
+    def clear_session(self, user_id: int):
+        """Oturumu temizle"""
+        with self.lock:
+            self.conn.execute('DELETE FROM sessions WHERE user_id = ?', (user_id,))
+            self.conn.commit()
+            
+            self._sessions.pop(user_id, None)
+            self._session_expiry.cancel(user_id)
+        
+        self.journal.append('session_cleared', user_id=user_id)
+    
+    def add_session_expiry_listener(self, listener: Callable[[List[int]], None]):
+        """Süresi dolan oturumlar silindiğinde çağrılacak fonksiyonu kaydet"""
+        self._expiry_listeners.append(listener)
+    
+    def purge_expired_sessions(self) -> int:
+        """Süresi dolan oturumları tek işlemde sil"""
+        with self.lock:
+            expired = self._session_expiry.advance(self.clock.time())
+            if not expired:
+                return 0
+            
+            for user_id in expired:
+                self._sessions.pop(user_id, None)
+            
+            self.conn.executemany('DELETE FROM sessions WHERE user_id = ?', [(uid,) for uid in expired])
+            self.conn.commit()
+        
+        self.journal.append('sessions_expired', user_ids=expired)
+        
+        for listener in self._expiry_listeners:
+            try:
+                listener(expired)
+            except Exception as e:
+                logger.error(f"Session expiry listener error: {e}")
+        
+        logger.debug(f"Purged {len(expired)} expired sessions")
+        return len(expired)
+    
+    def maintain(self):
+        """Periyodik bakım: oturum temizliği, sayaç yazımı, günlük fsync ve anlık görüntü"""
+        self.purge_expired_sessions()
+        self.rollups.flush()
+        self.journal.sync()
+        self.projection.maybe_snapshot()
+    
+    def start_maintenance(self, interval: float = 5.0):
+        """Bakımı arka planda çalıştır"""
+        if self._reaper and self._reaper.is_alive():
+            return
+        
+        def loop():
+            while True:
+                self.clock.sleep(interval)
+                try:
+                    self.maintain()
+                except Exception as e:
+                    logger.error(f"Database maintenance error: {e}")
+        
+        self._reaper = threading.Thread(target=loop, name='db-maintenance', daemon=True)
+        self._reaper.start()
+    
+    def shutdown(self):
+        """Kapanışta bekleyen her şeyi diske yaz"""
+        self.rollups.flush()
+        self.projection.snapshot()
+        self.journal.close()
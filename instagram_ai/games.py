@@ -0,0 +1,308 @@
+"""Oyun motoru ve oyun durumu"""
+import logging
+import random
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple
+
+from .database import Database
+from .questions import QuestionBank
+
+logger = logging.getLogger(__name__)
+
+
+class GameState:
+    """Kompakt oyun durumu; değişen alanlar izlenir ve yalnızca onlar yazılır"""
+    
+    # Alan adı -> oturum satırındaki kısa anahtar
+    FIELDS = {
+        'type': 't',
+        'target': 'n',
+        'min': 'lo',
+        'max': 'hi',
+        'attempts': 'a',
+        'max_attempts': 'm',
+        'question': 'q',
+        'start_time': 's'
+    }
+    
+    __slots__ = ('user_id', 'expires', '_dirty') + tuple(FIELDS)
+    
+    def __init__(self, user_id: int, type: str, target: Optional[int] = None,
+                 min: Optional[int] = None, max: Optional[int] = None,
+                 attempts: int = 0, max_attempts: Optional[int] = None,
+                 question: Any = None, start_time: Optional[int] = None,
+                 expires: float = 0.0):
+        object.__setattr__(self, '_dirty', set())
+        self.user_id = user_id
+        self.expires = expires
+        self.type = type
+        self.target = target
+        self.min = min
+        self.max = max
+        self.attempts = attempts
+        self.max_attempts = max_attempts
+        self.question = question
+        self.start_time = start_time
+        self._dirty.clear()
+    
+    def __setattr__(self, name: str, value: Any):
+        object.__setattr__(self, name, value)
+        if name in self.FIELDS:
+            self._dirty.add(name)
+    
+    def to_data(self) -> Dict:
+        """Oturum satırı için kompakt sözlük"""
+        data = {}
+        for name, short in self.FIELDS.items():
+            value = getattr(self, name)
+            if value is not None:
+                data[short] = value
+        return data
+    
+    def pop_dirty(self) -> Dict:
+        """Son kayıttan beri değişen alanları kısa anahtarlarla döndür"""
+        changed = {self.FIELDS[name]: getattr(self, name) for name in self._dirty}
+        self._dirty.clear()
+        return changed
+    
+    @classmethod
+    def from_data(cls, user_id: int, data: Dict, expires: float) -> 'GameState':
+        """Oturum satırından geri yükle (eski uzun anahtarlı kayıtlar da okunur)"""
+        values = {name: data.get(short, data.get(name)) for name, short in cls.FIELDS.items()}
+        values['attempts'] = values['attempts'] or 0
+        if isinstance(values['start_time'], str):
+            values['start_time'] = int(datetime.fromisoformat(values['start_time']).timestamp())
+        return cls(user_id, expires=expires, **values)
+
+class GameStore:
+    """Oyun durumlarını bellekte tutar, oturum tablosuna artımlı yazar ve
+    yeniden başlatma sonrası ilk erişimde tembel olarak geri yükler"""
+    
+    def __init__(self, db: Database):
+        self.db = db
+        self._games: Dict[int, GameState] = {}
+        db.add_session_expiry_listener(self._on_sessions_expired)
+    
+    def get(self, user_id: int) -> Optional[GameState]:
+        """Aktif oyunu getir; bellekte yoksa oturum tablosundan yükle"""
+        game = self._games.get(user_id)
+        if game is not None:
+            if game.expires > self.db.clock.time():
+                return game
+            self._games.pop(user_id, None)
+            return None
+        
+        # Oturum ömrü bellekte bilindiği için oyunu olmayan kullanıcı diske gitmez
+        session = self.db.get_session(user_id)
+        if not session or session['state'] != 'game' or not session['data']:
+            return None
+        
+        game = GameState.from_data(user_id, session['data'], session['expires'])
+        self._games[user_id] = game
+        logger.info(f"Game state restored for user {user_id}")
+        return game
+    
+    def put(self, game: GameState, ttl: int):
+        """Yeni oyunu kaydet (tam yazım)"""
+        if game.start_time is None:
+            game.start_time = int(self.db.clock.time())
+        game.expires = self.db.clock.time() + ttl
+        self._games[game.user_id] = game
+        self.db.set_session(game.user_id, 'game', game.to_data(), ttl=ttl)
+        game.pop_dirty()
+    
+    def save(self, game: GameState):
+        """Yalnızca değişen alanları yaz"""
+        self.db.update_session_data(game.user_id, game.pop_dirty())
+    
+    def remove(self, user_id: int):
+        """Oyunu bitir ve oturumu temizle"""
+        self._games.pop(user_id, None)
+        self.db.clear_session(user_id)
+    
+    def _on_sessions_expired(self, user_ids: List[int]):
+        for user_id in user_ids:
+            self._games.pop(user_id, None)
+    
+    def __len__(self) -> int:
+        return len(self._games)
+    
+    def dump_state(self) -> Dict[int, Tuple[Dict, float]]:
+        """Kontrol noktası: bellekteki aktif oyunlar (kompakt satır + bitiş zamanı)"""
+        now = self.db.clock.time()
+        return {user_id: (game.to_data(), game.expires)
+                for user_id, game in list(self._games.items()) if game.expires > now}
+    
+    def load_state(self, state: Dict[int, Tuple[Dict, float]]):
+        """Oyunları oturum tablosuna gitmeden belleğe al (daha yeni bellek durumu korunur)"""
+        now = self.db.clock.time()
+        for user_id, (data, expires) in state.items():
+            if expires > now and user_id not in self._games:
+                self._games[user_id] = GameState.from_data(user_id, data, expires)
+
+class GameEngine:
+    """Oyun motoru"""
+    
+    class GameType(Enum):
+        NUMBER_GUESS = "sayı_tahmin"
+        ROCK_PAPER_SCISSORS = "tas_kagit_makas"
+        QUIZ = "bilgi_yarismasi"
+        LOTTERY = "sayisal_loto"
+    
+    def __init__(self, db: Database):
+        self.db = db
+        self.games = GameStore(db)
+        self.question_bank = QuestionBank.default()
+        self._quiz_seen: Dict[int, int] = {}
+    
+    def start_number_game(self, user_id: int, min_num: int = 1, max_num: int = 100) -> str:
+        """Sayı tahmin oyunu başlat"""
+        game = GameState(
+            user_id,
+            type=self.GameType.NUMBER_GUESS.value,
+            target=random.randint(min_num, max_num),
+            min=min_num,
+            max=max_num,
+            max_attempts=10
+        )
+        self.games.put(game, ttl=600)
+        
+        return f"🎯 {min_num} ile {max_num} arasında bir sayı tuttum! 10 deneme hakkın var."
+    
+    def guess_number(self, user_id: int, guess: str) -> str:
+        """Sayı tahmin et"""
+        game = self.games.get(user_id)
+        if not game or game.type != self.GameType.NUMBER_GUESS.value:
+            return "Aktif bir tahmin oyunun yok."
+        
+        try:
+            guess_num = int(guess)
+        except ValueError:
+            return "Lütfen geçerli bir sayı gir!"
+        
+        if guess_num < game.min or guess_num > game.max:
+            return f"Lütfen {game.min}-{game.max} arası bir sayı gir!"
+        
+        game.attempts += 1
+        
+        if guess_num < game.target:
+            status = "⬆️ Daha büyük bir sayı!"
+        elif guess_num > game.target:
+            status = "⬇️ Daha küçük bir sayı!"
+        else:
+            # Kazandı
+            self.games.remove(user_id)
+            self.db.update_user_stats(user_id, 'game_wins')
+            
+            return (
+                f"🎉 TEBRİKLER! {game.attempts} denemede bildin!\n"
+                f"🏆 Kazandığın puan: {100 - game.attempts * 10}"
+            )
+        
+        remaining = game.max_attempts - game.attempts
+        if remaining <= 0:
+            self.games.remove(user_id)
+            return f"😔 Hakkın bitti! Sayı: {game.target}"
+        
+        self.games.save(game)
+        return f"{status} Kalan deneme: {remaining}"
+    
+    def rock_paper_scissors(self, player_choice: str) -> str:
+        """Taş kağıt makas"""
+        choices = {
+            'taş': '🪨', 
+            'kağıt': '📄', 
+            'makas': '✂️'
+        }
+        
+        player_choice = player_choice.lower()
+        if player_choice not in choices:
+            return "Geçerli bir seçim yap: taş, kağıt veya makas"
+        
+        bot_choice = random.choice(list(choices.keys()))
+        
+        # Kazananı belirle
+        rules = {
+            'taş': 'makas',
+            'kağıt': 'taş',
+            'makas': 'kağıt'
+        }
+        
+        if player_choice == bot_choice:
+            result = "🤝 BERABERE!"
+        elif rules[player_choice] == bot_choice:
+            result = "🎉 SEN KAZANDIN!"
+        else:
+            result = "😢 BEN KAZANDIM!"
+        
+        return (
+            f"{choices[player_choice]} vs {choices[bot_choice]}\n\n"
+            f"{result}"
+        )
+    
+    def start_quiz(self, user_id: int, category: Optional[str] = None,
+                   difficulty: Optional[int] = None) -> str:
+        """Bilgi yarışması başlat"""
+        seen = self._get_quiz_seen(user_id)
+        question = self.question_bank.draw(seen, category, difficulty)
+        
+        if question is None:
+            # Havuzdaki tüm sorular görüldüyse bu havuz için baştan başla
+            seen &= ~self.question_bank.pool(category, difficulty)
+            question = self.question_bank.draw(seen, category, difficulty)
+            if question is None:
+                return "❓ Bu kategoride soru bulunamadı."
+        
+        seen |= 1 << question.id
+        self._quiz_seen[user_id] = seen
+        self.db.set_quiz_seen(user_id, seen)
+        
+        # Oturuma yalnızca soru id'si yazılır
+        self.games.put(GameState(user_id, type=self.GameType.QUIZ.value, question=question.id), ttl=300)
+        
+        options_text = "\n".join([f"{i+1}. {opt}" for i, opt in enumerate(question.options)])
+        
+        return (
+            f"❓ Bilgi Yarışması!\n\n"
+            f"{question.text}\n\n"
+            f"{options_text}\n\n"
+            f"Cevap numarasını yaz!"
+        )
+    
+    def _get_quiz_seen(self, user_id: int) -> int:
+        seen = self._quiz_seen.get(user_id)
+        if seen is None:
+            seen = self._quiz_seen[user_id] = self.db.get_quiz_seen(user_id)
+        return seen
+    
+    def check_quiz_answer(self, user_id: int, answer: str) -> str:
+        """Quiz cevabını kontrol et"""
+        game = self.games.get(user_id)
+        if not game or game.type != self.GameType.QUIZ.value:
+            return "Aktif bir quiz oyunun yok."
+        
+        question = self.question_bank.get(game.question)
+        if question is None:
+            self.games.remove(user_id)
+            return "Aktif bir quiz oyunun yok."
+        
+        try:
+            answer_num = int(answer) - 1
+        except ValueError:
+            return "Geçersiz cevap."
+        
+        self.games.remove(user_id)
+        if answer_num == question.answer:
+            self.db.update_user_stats(user_id, 'game_wins')
+            return "✅ Doğru cevap! 🏆"
+        
+        return f"❌ Yanlış cevap. Doğrusu: {question.options[question.answer]}"
+    
+    def roll_dice(self) -> str:
+        """Zar at"""
+        return f"🎲 Zar: {random.randint(1, 6)}"
+    
+    def flip_coin(self) -> str:
+        """Yazı tura"""
+        return f"🪙 {random.choice(['Yazı', 'Tura'])}!"
@@ -0,0 +1,308 @@
+"""Anlık (push) mesaj alımı: olay kaynakları ve yoklamayı seyrek uzlaştırmaya indiren alıcı.
+
+Kaynaklar gelen DM'leri `IncomingMessage` olarak bir alıcı fonksiyona
+iletir; `PushIngestor` bunları bekleme süresi olmadan botun işleme yoluna
+(handle_messages) verir. Yoklama (`direct_threads`) yalnızca
+`PUSH_RECONCILE_INTERVAL` saniyede bir, kaçırılan mesajlar için çalışır.
+"""
+import importlib
+import json
+import logging
+import queue
+import re
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional
+
+from .config import Config
+from .models import IncomingMessage
+
+if TYPE_CHECKING:
+    from .bot import InstagramAIBot
+
+logger = logging.getLogger(__name__)
+
+Sink = Callable[[IncomingMessage], None]
+
+# Anlık mesaj senkronizasyonu yaması: /direct_v2/threads/<sohbet>/items/<mesaj>
+_ITEM_PATH = re.compile(r'^/direct_v2/threads/(\d+)/items/(\d+)$')
+
+
+def parse_realtime_event(event: Dict) -> List[IncomingMessage]:
+    """Instagram'ın anlık mesaj senkronizasyonu olayından ('patch') yeni metin mesajlarını çıkar"""
+    messages = []
+    if event.get('event') != 'patch':
+        return messages
+    
+    for op in event.get('data', ()):
+        match = _ITEM_PATH.match(op.get('path', ''))
+        if op.get('op') != 'add' or not match:
+            continue
+        item = op.get('value') or {}
+        if isinstance(item, str):
+            try:
+                item = json.loads(item)
+            except ValueError:
+                continue
+        if item.get('item_type', 'text') != 'text' or not item.get('text'):
+            continue
+        messages.append(IncomingMessage(
+            str(item.get('item_id', match.group(2))), match.group(1), int(item['user_id']),
+            item.get('username') or "Unknown", item['text']
+        ))
+    return messages
+
+
+def parse_webhook_message(data: Dict) -> IncomingMessage:
+    """Sade webhook kaydı: {id, thread_id, user_id, text, username?}"""
+    return IncomingMessage(str(data['id']), str(data['thread_id']), int(data['user_id']),
+                           data.get('username') or "Unknown", str(data['text']))
+
+
+class EventSource:
+    """Gelen DM kaynağı arayüzü: `start` ile alıcıyı alır, `stop` ile kapanır"""
+    
+    name = 'source'
+    
+    def start(self, sink: Sink):
+        raise NotImplementedError
+    
+    def stop(self):
+        pass
+
+class PollingSource(EventSource):
+    """Sohbet listesini yoklayan kaynak; anlık modda uzlaştırma taramasıdır.
+    
+    Kendi iş parçacığı yoktur: `poll()` çağrıldıkça sohbetlerin son
+    mesajlarını alıcıya iletir.
+    """
+    
+    name = 'polling'
+    
+    def __init__(self, bot: 'InstagramAIBot'):
+        self.bot = bot
+        self.sink: Optional[Sink] = None
+    
+    def start(self, sink: Sink):
+        self.sink = sink
+    
+    def poll(self) -> int:
+        """Son sohbetleri tara; alıcıya iletilen mesaj sayısını döndürür"""
+        count = 0
+        for thread in self.bot.client.direct_threads(amount=20):
+            if not thread.messages:
+                continue
+            last_msg = thread.messages[0]
+            self.sink(IncomingMessage(last_msg.id, thread.id, last_msg.user_id,
+                                      thread.users[0].username if thread.users else "Unknown",
+                                      last_msg.text or ""))
+            count += 1
+        return count
+
+class RealtimeSource(EventSource):
+    """Instagram anlık (MQTT) bağlantısı için uyarlayıcı.
+    
+    instagrapi anlık bağlantı sağlamadığından bağlantının kendisi bir
+    dinleyici nesnesidir: `connect(on_event)` ile ham olayları geri çağırır,
+    `disconnect()` ile kapanır. Dinleyici `REALTIME_LISTENER`
+    ('paket.modül:fabrika', fabrika Instagram istemcisini alır) ile verilir.
+    Bu sınıf yalnızca mesaj senkronizasyonu yamalarını ayrıştırır.
+    """
+    
+    name = 'realtime'
+    
+    def __init__(self, listener: Any):
+        self.listener = listener
+        self.sink: Optional[Sink] = None
+        self.events = 0
+    
+    @classmethod
+    def from_config(cls, client: Any) -> 'RealtimeSource':
+        module_name, _, factory = Config.REALTIME_LISTENER.partition(':')
+        module = importlib.import_module(module_name)
+        return cls(getattr(module, factory or 'create_listener')(client))
+    
+    def start(self, sink: Sink):
+        self.sink = sink
+        self.listener.connect(self.on_event)
+        logger.info("Realtime listener connected")
+    
+    def on_event(self, event: Dict):
+        self.events += 1
+        for message in parse_realtime_event(event):
+            self.sink(message)
+    
+    def stop(self):
+        try:
+            self.listener.disconnect()
+        except Exception as e:
+            logger.error(f"Realtime listener disconnect error: {e}")
+
+class WebhookSource(EventSource):
+    """Yerel HTTP webhook'u: test ve köprü süreçleri için anlık kaynak.
+    
+    `POST /messages` gövdesi tek bir kayıt, kayıt listesi ya da ham anlık
+    senkronizasyon olayı ({"event": "patch", ...}) olabilir.
+    `WEBHOOK_TOKEN` ayarlıysa `X-Webhook-Token` başlığı eşleşmelidir.
+    """
+    
+    name = 'webhook'
+    
+    def __init__(self, host: Optional[str] = None, port: Optional[int] = None):
+        self.host = host or Config.WEBHOOK_HOST
+        self.port = Config.WEBHOOK_PORT if port is None else port
+        self.sink: Optional[Sink] = None
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self, sink: Sink):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        
+        self.sink = sink
+        source = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                if self.path.rstrip('/') != '/messages':
+                    return self._reply(404, {'error': 'not found'})
+                if Config.WEBHOOK_TOKEN and self.headers.get('X-Webhook-Token') != Config.WEBHOOK_TOKEN:
+                    return self._reply(403, {'error': 'forbidden'})
+                try:
+                    length = int(self.headers.get('Content-Length', 0))
+                    accepted = source.accept(json.loads(self.rfile.read(length) or b'null'))
+                except (ValueError, KeyError, TypeError) as e:
+                    return self._reply(400, {'error': str(e)})
+                self._reply(202, {'accepted': accepted})
+            
+            def _reply(self, status: int, body: Dict):
+                data = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+            
+            def log_message(self, format, *args):
+                logger.debug(f"Webhook {self.address_string()} {format % args}")
+        
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name='webhook', daemon=True)
+        self._thread.start()
+        logger.info(f"Webhook listening on {self.host}:{self.port}")
+    
+    def accept(self, payload: Any) -> int:
+        """Gövdeyi ayrıştırıp alıcıya ilet; kabul edilen mesaj sayısını döndürür"""
+        if isinstance(payload, dict) and 'event' in payload:
+            messages = parse_realtime_event(payload)
+        else:
+            records = payload if isinstance(payload, list) else [payload]
+            messages = [parse_webhook_message(record) for record in records]
+        for message in messages:
+            self.sink(message)
+        return len(messages)
+    
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def create_sources(bot: 'InstagramAIBot', names: Optional[Iterable[str]] = None) -> List[EventSource]:
+    """`PUSH_SOURCES` adlarından anlık kaynakları oluştur"""
+    sources = []
+    for name in names or Config.PUSH_SOURCES:
+        if name == 'webhook':
+            sources.append(WebhookSource())
+        elif name == 'realtime':
+            if not Config.REALTIME_LISTENER:
+                logger.error("Realtime source requested but REALTIME_LISTENER is not set")
+                continue
+            sources.append(RealtimeSource.from_config(bot.client))
+        else:
+            logger.error(f"Unknown push source: {name}")
+    return sources
+
+
+class PushIngestor:
+    """Anlık kaynaklardan gelen mesajları bekletmeden işleyen bot adımı.
+    
+    `once()` ilk mesaj için en fazla `PUSH_WAIT` saniye bekler, gelenleri
+    toplu olarak işler; `PUSH_RECONCILE_INTERVAL` saniyede bir de yoklama
+    kaynağıyla kaçırılan mesajları tarar. Aynı mesaj iki yoldan gelirse
+    botun cevaplanan mesaj kümesi tekrarı eler.
+    """
+    
+    def __init__(self, bot: 'InstagramAIBot', sources: Optional[List[EventSource]] = None):
+        self.bot = bot
+        self.sources = sources if sources is not None else create_sources(bot)
+        self.polling = PollingSource(bot)
+        self.events: 'queue.Queue[IncomingMessage]' = queue.Queue(maxsize=Config.PUSH_QUEUE_SIZE)
+        self._started = False
+        self._last_sweep: Optional[float] = None
+        self.stats = {'pushed': 0, 'dropped': 0, 'swept': 0, 'sweeps': 0}
+    
+    def start(self):
+        for source in self.sources:
+            source.start(self.submit)
+        self.polling.start(self.submit)
+        self._started = True
+    
+    def stop(self):
+        if not self._started:
+            return
+        for source in self.sources:
+            source.stop()
+        self._started = False
+    
+    def submit(self, message: IncomingMessage):
+        """Kaynaklar için alıcı (herhangi bir iş parçacığından çağrılabilir)"""
+        if message.received_at is None:
+            message = message._replace(received_at=self.bot.clock.time())
+        try:
+            self.events.put_nowait(message)
+            self.stats['pushed'] += 1
+        except queue.Full:
+            # Uzlaştırma taraması kaçırılan mesajı sonra yakalar
+            self.stats['dropped'] += 1
+            logger.warning(f"Push queue full, dropping message {message.id}")
+    
+    def _drain(self, wait: float) -> List[IncomingMessage]:
+        try:
+            batch = [self.events.get(timeout=wait)]
+        except queue.Empty:
+            return []
+        while len(batch) < Config.PUSH_BATCH_SIZE:
+            try:
+                batch.append(self.events.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+    
+    def once(self) -> int:
+        """Gelen mesajları işle; zamanı geldiyse uzlaştırma taraması yap"""
+        if not self._started:
+            self.start()
+        
+        now = self.bot.clock.time()
+        if self._last_sweep is None or now - self._last_sweep >= Config.PUSH_RECONCILE_INTERVAL:
+            self._last_sweep = now
+            self.stats['sweeps'] += 1
+            self.stats['swept'] += self.polling.poll()
+        
+        # Aşırı yükte ertelenen mesajlar süreleri dolunca kuyruğa geri döner
+        for message in self.bot.load.due_deferred():
+            self.submit(message)
+        
+        batch = self._drain(Config.PUSH_WAIT)
+        if not batch:
+            return 0
+        try:
+            return self.bot.handle_messages(batch)
+        except Exception:
+            # Tur boyu hata: cevaplanmamış mesajlar geri çekilmeden sonra tekrar denenir
+            for message in batch:
+                if message.id not in self.bot.answered_messages:
+                    self.submit(message)
+            raise
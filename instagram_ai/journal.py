@@ -0,0 +1,261 @@
+"""Olay günlüğü: yalnızca-ekleme ikili kayıt ve ondan türetilen projeksiyon"""
+import json
+import logging
+import os
+import struct
+import threading
+import zlib
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from .clock import Clock, SystemClock
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class EventJournal:
+    """Tüm durum değişiklikleri için yalnızca-ekleme ikili günlük.
+    
+    Kayıt: <uzunluk u32><crc32 u32><seq u64><JSON yük>. Segmentler ilk
+    sıra numarasıyla adlandırılır ve boyut eşiğinde döndürülür; fsync
+    kayıt sayısı/süreye göre toplu yapılır.
+    """
+    
+    HEADER = struct.Struct('<IIQ')
+    
+    def __init__(self, directory: str = Config.JOURNAL_DIR, clock: Optional[Clock] = None):
+        self.directory = directory
+        self.clock = clock or SystemClock()
+        os.makedirs(directory, exist_ok=True)
+        
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[int, str, float, Dict], None]] = []
+        self._retainers: List[Callable[[], int]] = []
+        self._unsynced = 0
+        self._last_sync = self.clock.time()
+        
+        self._segments = sorted(
+            int(name[:-4]) for name in os.listdir(directory) if name.endswith('.log')
+        )
+        if not self._segments:
+            self._segments.append(1)
+        
+        self.seq = self._recover(self._segment_path(self._segments[-1]), self._segments[-1] - 1)
+        self._file = open(self._segment_path(self._segments[-1]), 'ab')
+    
+    def _segment_path(self, first_seq: int) -> str:
+        return os.path.join(self.directory, f"{first_seq:020d}.log")
+    
+    def _recover(self, path: str, last_seq: int) -> int:
+        """Son segmenti tara, yarım kalmış kuyruğu kes, son sıra numarasını döndür"""
+        if not os.path.exists(path):
+            return last_seq
+        
+        good = 0
+        for seq, _, offset in self._scan(path):
+            last_seq, good = seq, offset
+        
+        if good < os.path.getsize(path):
+            logger.warning(f"Truncating torn journal tail in {path} at {good}")
+            with open(path, 'r+b') as f:
+                f.truncate(good)
+        return last_seq
+    
+    def _scan(self, path: str) -> Iterator[Tuple[int, bytes, int]]:
+        """Geçerli kayıtları (seq, yük, kayıt sonu ofseti) olarak üret"""
+        with open(path, 'rb') as f:
+            offset = 0
+            while True:
+                header = f.read(self.HEADER.size)
+                if len(header) < self.HEADER.size:
+                    return
+                length, crc, seq = self.HEADER.unpack(header)
+                payload = f.read(length)
+                if len(payload) < length or zlib.crc32(payload) != crc:
+                    return
+                offset += self.HEADER.size + length
+                yield seq, payload, offset
+    
+    def subscribe(self, listener: Callable[[int, str, float, Dict], None]):
+        """Her yeni olayda (seq, tür, zaman, alanlar) ile çağrılacak dinleyici ekle"""
+        self._listeners.append(listener)
+    
+    def retain(self, watermark: Callable[[], int]):
+        """Segment silinirken korunacak alt sınır: `watermark()`'tan sonraki olaylar yeniden oynatılabilir kalır"""
+        self._retainers.append(watermark)
+    
+    def append(self, event_type: str, **fields) -> int:
+        """Olayı ekle ve sıra numarasını döndür"""
+        ts = self.clock.time()
+        payload = json.dumps([event_type, ts, fields], ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        
+        with self._lock:
+            self.seq += 1
+            seq = self.seq
+            self._file.write(self.HEADER.pack(len(payload), zlib.crc32(payload), seq))
+            self._file.write(payload)
+            self._unsynced += 1
+            
+            if (self._unsynced >= Config.JOURNAL_FSYNC_EVERY or
+                    ts - self._last_sync >= Config.JOURNAL_FSYNC_INTERVAL):
+                self._sync_locked()
+            if self._file.tell() >= Config.JOURNAL_SEGMENT_SIZE:
+                self._rotate_locked()
+            
+            # Dinleyiciler sıra korunsun diye kilit altında çağrılır
+            for listener in self._listeners:
+                try:
+                    listener(seq, event_type, ts, fields)
+                except Exception as e:
+                    logger.error(f"Journal listener error: {e}")
+        
+        return seq
+    
+    def paused(self):
+        """Eklemeleri geçici olarak durduran bağlam (tutarlı okuma için)"""
+        return self._lock
+    
+    def sync(self):
+        """Bekleyen kayıtları diske zorla"""
+        with self._lock:
+            if self._unsynced:
+                self._sync_locked()
+    
+    def _sync_locked(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = self.clock.time()
+    
+    def _rotate_locked(self):
+        self._sync_locked()
+        self._file.close()
+        self._segments.append(self.seq + 1)
+        self._file = open(self._segment_path(self.seq + 1), 'ab')
+    
+    def replay(self, after_seq: int = 0) -> Iterator[Tuple[int, str, float, Dict]]:
+        """after_seq'ten sonraki olayları sırayla üret"""
+        with self._lock:
+            self._file.flush()
+            segments = list(self._segments)
+        
+        for index, first_seq in enumerate(segments):
+            # Tamamı anlık görüntüden eski segmentleri atla
+            if index + 1 < len(segments) and segments[index + 1] <= after_seq + 1:
+                continue
+            path = self._segment_path(first_seq)
+            if not os.path.exists(path):
+                continue
+            for seq, payload, _ in self._scan(path):
+                if seq > after_seq:
+                    event_type, ts, fields = json.loads(payload)
+                    yield seq, event_type, ts, fields
+    
+    def _snapshot_path(self) -> str:
+        return os.path.join(self.directory, 'snapshot.bin')
+    
+    def write_snapshot(self, seq: int, state: Dict):
+        """Anlık görüntüyü atomik yaz; anlık görüntü ve tüm su seviyelerince kapsanan segmentleri sil"""
+        blob = zlib.compress(json.dumps({'seq': seq, 'state': state}, ensure_ascii=False).encode('utf-8'))
+        tmp_path = self._snapshot_path() + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(blob)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self._snapshot_path())
+        
+        keep_after = min([seq] + [watermark() for watermark in self._retainers])
+        with self._lock:
+            while len(self._segments) > 1 and self._segments[1] <= keep_after + 1:
+                os.remove(self._segment_path(self._segments.pop(0)))
+    
+    def read_snapshot(self) -> Tuple[int, Dict]:
+        """(seq, durum) döndür; anlık görüntü yoksa (0, {})"""
+        try:
+            with open(self._snapshot_path(), 'rb') as f:
+                data = json.loads(zlib.decompress(f.read()))
+            return data['seq'], data['state']
+        except FileNotFoundError:
+            return 0, {}
+        except (ValueError, zlib.error) as e:
+            logger.error(f"Corrupt journal snapshot ignored: {e}")
+            return 0, {}
+    
+    def close(self):
+        with self._lock:
+            self._sync_locked()
+            self._file.close()
+
+class StateProjection:
+    """Günlükten türetilen bellek içi durum: anlık görüntü + yeniden oynatma ile kurulur.
+    
+    Oturumlar verileriyle (oyun durumu dahil) tutulur: user_id ->
+    [durum, bitiş zamanı, veri]. Liderlik sayaçları kendi su seviyesinden
+    yeniden oynatılır (bkz. RollupStore).
+    """
+    
+    def __init__(self, journal: EventJournal):
+        self.journal = journal
+        self.seq, state = journal.read_snapshot()
+        self.snapshot_seq = self.seq
+        
+        self.users: Dict[int, Dict] = {int(k): v for k, v in state.get('users', {}).items()}
+        # Eski anlık görüntülerde oturum verisi yoktur
+        self.sessions: Dict[int, List] = {int(k): (v + [{}])[:3] for k, v in state.get('sessions', {}).items()}
+        self.commands: Dict[str, int] = state.get('commands', {})
+        
+        replayed = 0
+        for event in journal.replay(self.seq):
+            self.apply(*event)
+            replayed += 1
+        if replayed:
+            logger.info(f"Replayed {replayed} journal events after snapshot {self.snapshot_seq}")
+        
+        journal.subscribe(self.apply)
+    
+    def apply(self, seq: int, event_type: str, ts: float, fields: Dict):
+        """Tek bir olayı duruma uygula"""
+        self.seq = seq
+        user_id = fields.get('user_id')
+        
+        if event_type == 'user_created':
+            self.users.setdefault(user_id, {'username': fields.get('username', '')})
+        elif event_type == 'user_stat':
+            user = self.users.setdefault(user_id, {})
+            user[fields['field']] = user.get(fields['field'], 0) + fields['increment']
+        elif event_type == 'user_blocked':
+            user = self.users.setdefault(user_id, {})
+            user['is_blocked'] = fields.get('blocked', True)
+            user['blocked_until'] = fields.get('until')
+        elif event_type == 'message_logged':
+            command = fields.get('command')
+            if command:
+                self.commands[command] = self.commands.get(command, 0) + 1
+        elif event_type == 'session_set':
+            self.sessions[user_id] = [fields['state'], fields['expires'], dict(fields.get('data') or {})]
+        elif event_type == 'session_data':
+            session = self.sessions.get(user_id)
+            if session is not None:
+                session[2].update(fields['fields'])
+        elif event_type in ('session_cleared', 'sessions_expired'):
+            for uid in fields.get('user_ids', [user_id]):
+                self.sessions.pop(uid, None)
+    
+    def snapshot(self):
+        """Mevcut durumu anlık görüntü olarak yaz"""
+        # Tutarlı kopya günlük kilidi altında alınır, yazım kilit dışında yapılır
+        with self.journal.paused():
+            seq = self.seq
+            state = {
+                'users': {uid: dict(user) for uid, user in self.users.items()},
+                'sessions': {uid: [state, expires, dict(data)]
+                             for uid, (state, expires, data) in self.sessions.items()},
+                'commands': dict(self.commands)
+            }
+        
+        self.journal.write_snapshot(seq, state)
+        self.snapshot_seq = seq
+    
+    def maybe_snapshot(self):
+        if self.seq - self.snapshot_seq >= Config.SNAPSHOT_EVERY:
+            self.snapshot()
@@ -0,0 +1,172 @@
+"""Aşırı yük denetimi: kuyruk derinliği ve gecikme hedefine göre kademeli hizmet (degraded) modu"""
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+from .clock import Clock, SystemClock
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+NORMAL = 'normal'
+DEGRADED = 'degraded'
+
+
+def _p95(values: List[float]) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(0.95 * len(values)))]
+
+
+class LoadController:
+    """Her tur sonunda derinlik ve gecikmeyi değerlendirip modu belirler.
+    
+    Bekleyen mesaj sayısı `LOAD_DEPTH_HIGH`'ı ya da turda cevaplanan
+    mesajların alınmasından cevaplanmasına kadar geçen sürenin p95'i
+    `LOAD_LATENCY_SLO`'yu `LOAD_ENTER_ROUNDS` tur üst üste aşarsa kademeli
+    moda geçilir. Bu modda bayat önbellek kabul edilir,
+    mesaj günlüğü yazılmaz, cevaplar tur sonunda birleştirilerek gönderilir,
+    yorumlar ve ağ komutları (en fazla `LOAD_MAX_DEFER` saniye) ertelenir;
+    ertelenen mesajlar süreleri dolunca (ya da normale dönülünce)
+    `due_deferred` ile yeniden işlenmek üzere geri verilir.
+    Derinlik `LOAD_DEPTH_LOW`'un, gecikme hedefin yarısının altında
+    `LOAD_EXIT_ROUNDS` tur kalınca normale dönülür (histerezis).
+    """
+    
+    def __init__(self, clock: Optional[Clock] = None):
+        self.clock = clock or SystemClock()
+        self.mode = NORMAL
+        self.reason: Optional[str] = None
+        self._latencies: List[float] = []
+        self._depth = 0
+        self._pressure = 0      # ardışık baskılı tur
+        self._relief = 0        # ardışık rahat tur
+        self._since = self.clock.time()
+        self._deferred: Dict[str, float] = {}   # mesaj id -> ilk erteleme zamanı
+        self._held: Dict[str, Any] = {}         # mesaj id -> tekrar işlenecek ertelenen mesaj
+        self._listeners: List[Callable[[str], None]] = []
+        self.metrics = {
+            'transitions': 0, 'degraded_seconds': 0.0, 'rounds': 0, 'depth': 0, 'p95_latency': 0.0,
+            'shed': {'log_message': 0, 'deferred': 0, 'comment_poll': 0}
+        }
+    
+    @property
+    def degraded(self) -> bool:
+        return self.mode == DEGRADED
+    
+    def add_listener(self, listener: Callable[[str], None]):
+        """Mod değişince yeni modla çağrılır"""
+        self._listeners.append(listener)
+    
+    # ---- Gözlem ----
+    
+    def observe_depth(self, depth: int):
+        self._depth = max(self._depth, depth)
+    
+    def observe_latency(self, seconds: float, message_id: Optional[str] = None):
+        """Mesajın alınmasından cevabına geçen süre; bilerek ertelenen mesajlar hedefe sayılmaz"""
+        if message_id is not None and str(message_id) in self._deferred:
+            return
+        self._latencies.append(seconds)
+    
+    def shed(self, what: str):
+        """Kademeli modda atlanan işi say"""
+        self.metrics['shed'][what] = self.metrics['shed'].get(what, 0) + 1
+    
+    def should_defer(self, message_id: str, message: Any = None) -> bool:
+        """Düşük öncelikli mesaj bu tur ertelensin mi? Çok bekleyen mesaj ertelenmez.
+        
+        `message` verilirse süresi dolunca `due_deferred` ile geri verilmek üzere saklanır.
+        """
+        if not self.degraded:
+            return False
+        first = self._deferred.setdefault(str(message_id), self.clock.time())
+        if self.clock.time() - first >= Config.LOAD_MAX_DEFER:
+            return False
+        if message is not None:
+            self._held[str(message_id)] = message
+        self.shed('deferred')
+        return True
+    
+    def deferred_until(self, message_id: str) -> float:
+        """Ertelenen mesajın en geç işleneceği zaman"""
+        return self._deferred.get(str(message_id), self.clock.time()) + Config.LOAD_MAX_DEFER
+    
+    def due_deferred(self) -> List[Any]:
+        """Erteleme süresi dolan mesajları (normal modda hepsini) geri ver"""
+        if not self._held:
+            return []
+        now = self.clock.time()
+        due = [key for key in self._held
+               if not self.degraded or now >= self._deferred.get(key, now) + Config.LOAD_MAX_DEFER]
+        return [self._held.pop(key) for key in due]
+    
+    # ---- Değerlendirme ----
+    
+    def evaluate(self) -> str:
+        """Turun gözlemlerini değerlendir, gerekirse modu değiştir; modu döndürür"""
+        depth, p95 = self._depth, _p95(self._latencies)
+        self._depth, self._latencies = 0, []
+        self.metrics['rounds'] += 1
+        self.metrics['depth'] = depth
+        self.metrics['p95_latency'] = round(p95, 3)
+        
+        if depth > Config.LOAD_DEPTH_HIGH:
+            self._pressure, self._relief = self._pressure + 1, 0
+            reason = f"depth {depth} > {Config.LOAD_DEPTH_HIGH}"
+        elif p95 > Config.LOAD_LATENCY_SLO:
+            self._pressure, self._relief = self._pressure + 1, 0
+            reason = f"p95 latency {p95:.1f}s > {Config.LOAD_LATENCY_SLO:g}s"
+        elif depth <= Config.LOAD_DEPTH_LOW and p95 <= Config.LOAD_LATENCY_SLO / 2:
+            self._pressure, self._relief = 0, self._relief + 1
+            reason = None
+        else:
+            # Eşikler arası: mevcut mod korunur
+            self._pressure = self._relief = 0
+            reason = None
+        
+        if self.mode == NORMAL and self._pressure >= Config.LOAD_ENTER_ROUNDS:
+            self._switch(DEGRADED, reason)
+        elif self.mode == DEGRADED and self._relief >= Config.LOAD_EXIT_ROUNDS:
+            self._switch(NORMAL, None)
+        
+        # Cevaplanan ya da kaybolan mesajların erteleme kayıtları (geri verilmeyi bekleyenler kalır);
+        # kuyruk modunda ertelenen mesaj sonra geri gelir, gecikmesi yine sayılmasın diye kayıt bir süre tutulur
+        if self._deferred:
+            cutoff = self.clock.time() - 2 * Config.LOAD_MAX_DEFER
+            self._deferred = {key: ts for key, ts in self._deferred.items()
+                              if ts >= cutoff or key in self._held}
+        return self.mode
+    
+    def _switch(self, mode: str, reason: Optional[str]):
+        now = self.clock.time()
+        if self.mode == DEGRADED:
+            self.metrics['degraded_seconds'] += now - self._since
+        
+        logger.warning(f"Load mode {self.mode} -> {mode}" + (f" ({reason})" if reason else ""),
+                       extra={'load_mode': mode})
+        self.mode, self.reason, self._since = mode, reason, now
+        self._pressure = self._relief = 0
+        self.metrics['transitions'] += 1
+        
+        for listener in self._listeners:
+            try:
+                listener(mode)
+            except Exception as e:
+                logger.error(f"Load mode listener error: {e}")
+    
+    def snapshot(self) -> Dict:
+        """Mod ve ölçümler (yönetim konsolu ve izleme için)"""
+        now = self.clock.time()
+        degraded_seconds = self.metrics['degraded_seconds'] + (now - self._since if self.degraded else 0.0)
+        return {
+            'mode': self.mode,
+            'reason': self.reason,
+            'mode_seconds': round(now - self._since, 1),
+            'transitions': self.metrics['transitions'],
+            'degraded_seconds': round(degraded_seconds, 1),
+            'rounds': self.metrics['rounds'],
+            'depth': self.metrics['depth'],
+            'p95_latency': self.metrics['p95_latency'],
+            'shed': dict(self.metrics['shed'])
+        }
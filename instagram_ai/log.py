@@ -0,0 +1,165 @@
+"""Loglama kurulumu: kuyruk üzerinden asenkron, JSON kayıtlı, döndürmeli ve örneklemeli"""
+import atexit
+import gzip
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from .config import Config
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+# LogRecord'un standart alanları; kalanlar `extra` ile gelmiştir
+_RESERVED = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'sampled'}
+
+
+class JsonFormatter(logging.Formatter):
+    """Her kaydı tek satırlık JSON nesnesine çevirir"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+            'thread': record.threadName
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED:
+                data[key] = value
+        if record.exc_info:
+            data['exc'] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+class SamplingFilter(logging.Filter):
+    """Yüksek hacimli INFO olaylarını örnekler.
+    
+    Yalnızca `extra={'sampled': True}` ile işaretlenmiş INFO kayıtları etkilenir:
+    her kaynak satırı için dakikada ilk `burst` kayıt geçer, sonrasında her
+    `every` kayıttan biri geçer. WARNING ve üstü asla düşürülmez.
+    """
+    
+    def __init__(self, burst: int, every: int, window: float = 60.0):
+        super().__init__()
+        self.burst = burst
+        self.every = max(1, every)
+        self.window = window
+        self.dropped = 0
+        self._counters: Dict[Tuple[str, int], List[float]] = {}  # kaynak -> [pencere başı, sayaç]
+        self._lock = threading.Lock()  # filtre, log çağıran her thread'de çalışır
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno != logging.INFO or not getattr(record, 'sampled', False):
+            return True
+        
+        key = (record.name, record.lineno)
+        with self._lock:
+            counter = self._counters.get(key)
+            if counter is None or record.created - counter[0] >= self.window:
+                counter = self._counters[key] = [record.created, 0]
+            counter[1] += 1
+            
+            count = counter[1]
+            if count <= self.burst or (count - self.burst) % self.every == 0:
+                return True
+            self.dropped += 1
+            return False
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Kaydı biçimlendirmeden kuyruğa atar; biçimlendirme dinleyici thread'inde yapılır"""
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+    
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # Disk yetişemiyorsa mesaj döngüsünü bekletmek yerine kaydı bırak
+            pass
+
+class CompressingRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Boyut veya süre eşiğinde döndüren, eski dosyaları gzip'leyen dosya handler'ı"""
+    
+    def __init__(self, filename: str, max_bytes: int, interval: float, backup_count: int):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+        self.interval = interval
+        self.rollover_at = time.time() + interval
+        self.namer = lambda name: name + '.gz'
+        self.rotator = self._compress
+    
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if self.interval and time.time() >= self.rollover_at:
+            return True
+        return bool(super().shouldRollover(record))
+    
+    def doRollover(self):
+        super().doRollover()
+        self.rollover_at = time.time() + self.interval
+    
+    @staticmethod
+    def _compress(source: str, dest: str):
+        with open(source, 'rb') as src, gzip.open(dest, 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(source)
+
+
+def setup_logger():
+    """Loglama sistemini kur (import sırasında değil, çalıştırmada çağrılır).
+    
+    Uygulama thread'leri kayıtları yalnızca bir kuyruğa atar; dosya ve konsol
+    yazımı tek bir dinleyici thread'inde yapılır.
+    """
+    global _listener
+    
+    if _listener is not None:
+        return logging.getLogger('instagram_ai')
+    
+    file_handler = CompressingRotatingFileHandler(
+        Config.LOG_FILE, Config.LOG_MAX_BYTES, Config.LOG_ROTATE_INTERVAL, Config.LOG_BACKUP_COUNT
+    )
+    file_handler.setFormatter(JsonFormatter() if Config.LOG_JSON else
+                              logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    
+    log_queue = queue.Queue(Config.LOG_QUEUE_SIZE)
+    queue_handler = NonBlockingQueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(Config.LOG_SAMPLE_BURST, Config.LOG_SAMPLE_EVERY))
+    
+    root = logging.getLogger()
+    root.setLevel(Config.LOG_LEVEL)
+    root.addHandler(queue_handler)
+    
+    _listener = logging.handlers.QueueListener(log_queue, file_handler, stream_handler,
+                                               respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logger)
+    
+    return logging.getLogger('instagram_ai')
+
+
+def queue_depth() -> int:
+    """Yazılmayı bekleyen log kaydı sayısı"""
+    return _listener.queue.qsize() if _listener is not None else 0
+
+
+def shutdown_logger():
+    """Kuyrukta kalan kayıtları yaz ve dinleyiciyi durdur"""
+    global _listener
+    
+    listener, _listener = _listener, None
+    if listener is None or threading.current_thread() is getattr(listener, '_thread', None):
+        return
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
@@ -0,0 +1,57 @@
+"""Veri yapıları"""
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import NamedTuple, Optional, Tuple
+
+
+@dataclass
+class UserStats:
+    """Kullanıcı istatistikleri"""
+    user_id: int
+    message_count: int = 0
+    fikra_count: int = 0
+    bilgi_count: int = 0
+    game_wins: int = 0
+    last_active: Optional[datetime] = None
+
+@dataclass
+class BotStats:
+    """Bot istatistikleri"""
+    start_time: datetime
+    total_messages: int = 0
+    total_users: int = 0
+    uptime: timedelta = timedelta(0)
+
+class NewsItem(NamedTuple):
+    """Kompakt haber kaydı"""
+    title: str
+    link: str
+
+class FeedState(NamedTuple):
+    """RSS kaynağının koşullu istek durumu"""
+    etag: Optional[str]
+    last_modified: Optional[str]
+    items: Tuple[NewsItem, ...]
+
+class IncomingMessage(NamedTuple):
+    """Yoklamadan ya da anlık bir kaynaktan gelen tek DM"""
+    id: str
+    thread_id: str
+    user_id: int
+    username: str
+    text: str
+    received_at: Optional[float] = None  # Botun mesajı aldığı an; cevap gecikmesi buradan ölçülür
+
+class CommandCategory(Enum):
+    """Komut kategorileri"""
+    WEATHER = "🌤️ Hava Durumu"
+    FUN = "😂 Eğlence"
+    KNOWLEDGE = "🧠 Bilgi"
+    MOTIVATION = "💪 Motivasyon"
+    FOOD = "🍽️ Yemek"
+    NEWS = "📰 Haberler"
+    GAMES = "🎲 Oyunlar"
+    TIME = "🕒 Zaman"
+    UTILITIES = "🛠️ Araçlar"
+    ADMIN = "🔧 Yönetici"
@@ -0,0 +1,276 @@
+"""Kuyruk modu: çekici, işçi ve gönderici süreçleri.
+
+Instagram bağlantısı yalnızca çekici ve gönderici süreçlerde bulunur;
+mesajları işleyen (ayrıştırma, komutlar, AI cevapları) işçiler yerel kuyruk
+üzerinden beslenir ve çekirdek sayısı kadar çoğaltılabilir.
+"""
+import logging
+import multiprocessing
+import os
+import random
+import time
+from typing import TYPE_CHECKING, Dict, Optional
+
+from .config import Config
+from .resilience import AUTH, CONNECTION, THROTTLE, classify_error
+from .scheduler import NETWORK, classify
+from .workqueue import LocalQueue
+
+if TYPE_CHECKING:
+    from .bot import InstagramAIBot
+
+logger = logging.getLogger(__name__)
+
+MODES = ('single', 'push', 'poller', 'worker', 'sender', 'cluster')
+
+
+class Poller:
+    """Gelen kutusunu çekip yeni mesajları kuyruğa yazan adım"""
+    
+    def __init__(self, bot: 'InstagramAIBot', queue: LocalQueue):
+        self.bot = bot
+        self.queue = queue
+    
+    def once(self) -> int:
+        """Tek çekme turu; kuyruğa yeni eklenen mesaj sayısını döndürür"""
+        threads = self.bot.client.direct_threads(amount=20)
+        messages = []
+        
+        for thread in threads:
+            if not thread.messages:
+                continue
+            
+            last_msg = thread.messages[0]
+            if last_msg.user_id == self.bot.client.user_id:
+                continue
+            
+            messages.append((
+                last_msg.id,
+                thread.id,
+                last_msg.user_id,
+                thread.users[0].username if thread.users else "Unknown",
+                last_msg.text or ""
+            ))
+        
+        # Daha önce görülen mesajlar birincil anahtarda elenir
+        added = self.queue.put_messages(messages)
+        if added:
+            logger.info(f"Queued {added} new messages", extra={'sampled': True})
+        return added
+
+class Worker:
+    """Kendi bölümündeki mesajları işleyip cevapları kuyruğa yazan süreç"""
+    
+    SYNC_INTERVAL = 30.0  # Engel listesinin yenilenmesi ve kuyruk temizliği (saniye)
+    
+    def __init__(self, bot: 'InstagramAIBot', queue: LocalQueue, partition: int = 0, partitions: int = 1):
+        self.bot = bot
+        self.queue = queue
+        self.partition = partition
+        self.partitions = partitions
+        self.is_running = False
+        self._last_sync = self.bot.clock.time()
+    
+    def once(self) -> int:
+        """Kiralanabilen mesajları işle; işlenen mesaj sayısını döndürür"""
+        messages = self.queue.lease_messages(self.partition, self.partitions)
+        
+        # Aynı partideki mesajlar öncelik sınıfı ve kullanıcı bazında adil sırayla işlenir
+        scheduler = self.bot.scheduler
+        scheduler.clear()
+        for msg in messages:
+            # Engelli kullanıcının mesajı sınıflandırılmadan cevapsız tamamlanır
+            if msg['user_id'] not in Config.ADMIN_IDS and self.bot.security.is_user_blocked(msg['user_id']):
+                self.queue.complete_message(msg['message_id'], msg['thread_id'], None)
+                continue
+            priority, cost = classify(self.bot, msg['user_id'], msg['text'])
+            scheduler.push(msg['user_id'], msg, priority, cost)
+        
+        # Aşırı yük denetimi: bayat önbellek ve günlük atlama bu süreçte de geçerli
+        self.bot.load.observe_depth(len(messages))
+        for priority, msg in scheduler.drain():
+            # Aşırı yükte ağ komutları süreleri dolana kadar kuyrukta bekletilir
+            if priority == NETWORK and self.bot.load.should_defer(msg['message_id']):
+                delay = self.bot.load.deferred_until(msg['message_id']) - self.bot.clock.time()
+                self.queue.defer_message(msg['message_id'], delay)
+                continue
+            try:
+                response = self.bot.process_message(msg['user_id'], msg['username'], msg['text'])
+            except Exception as e:
+                logger.error(f"Failed to process message {msg['message_id']}: {e}", exc_info=True)
+                if self.queue.fail_message(msg['message_id']):
+                    self.bot.db.add_dead_letter(msg['message_id'], msg['thread_id'], msg['user_id'],
+                                                msg['text'], f"{type(e).__name__}: {e}", msg['attempts'])
+                    logger.error(f"Message {msg['message_id']} quarantined after {msg['attempts']} failures")
+                continue
+            
+            self.queue.complete_message(msg['message_id'], msg['thread_id'], response)
+            # Gecikme, çekicinin mesajı kuyruğa yazdığı andan ölçülür
+            self.bot.load.observe_latency(self.bot.clock.time() - msg['created_at'], msg['message_id'])
+        
+        self.bot.load.evaluate()
+        return len(messages)
+    
+    def sync(self):
+        """Diğer süreçlerin yaptığı değişiklikleri al ve eski kayıtları temizle"""
+        self.bot.security.blocklist.reload()
+        self.queue.purge()
+        self._last_sync = self.bot.clock.time()
+    
+    def run(self):
+        logger.info(f"Worker {self.partition}/{self.partitions} started")
+        self.is_running = True
+        self.bot.db.start_maintenance()
+        self.bot.restore_state()
+        
+        try:
+            while self.is_running:
+                self.bot.admin.sync_shared()
+                if not self.once():
+                    self.bot.clock.sleep(random.uniform(*Config.QUEUE_POLL_INTERVAL))
+                if self.bot.clock.time() - self._last_sync >= self.SYNC_INTERVAL:
+                    self.sync()
+                if Config.CHECKPOINT_FILE:
+                    self.bot.checkpoint.maybe_save()
+        except KeyboardInterrupt:
+            logger.info("Worker stopped by user")
+        finally:
+            self.is_running = False
+            if Config.CHECKPOINT_FILE:
+                self.bot.checkpoint.save()
+            self.bot.db.shutdown()
+            self.bot.data_provider.shutdown()
+            self.queue.close()
+
+class Sender:
+    """Kuyruktaki cevapları Instagram'a gönderen adım"""
+    
+    def __init__(self, bot: 'InstagramAIBot', queue: LocalQueue):
+        self.bot = bot
+        self.queue = queue
+    
+    def once(self) -> int:
+        """Kiralanan cevapları sohbet bazında birleştirip gönder; gönderilen cevap sayısını döndürür"""
+        for reply in self.queue.lease_replies():
+            self.bot.outbox.add(reply['thread_id'], reply['id'], reply['text'])
+        
+        sent = 0
+        batches = list(self.bot.outbox.drain())
+        for index, (thread_id, reply_ids, chunks) in enumerate(batches):
+            try:
+                for i, chunk in enumerate(chunks):
+                    if i:
+                        self.bot.clock.sleep(1)  # Rate limit için
+                    self.bot.outbound.acquire()
+                    self.bot.client.direct_send(chunk, thread_ids=[thread_id])
+                
+                self.queue.complete_replies(reply_ids)
+                self.bot.isolator.thread_succeeded(thread_id)
+                sent += len(reply_ids)
+                logger.info(f"Response sent to thread {thread_id}", extra={'sampled': True})
+            
+            except Exception as e:
+                if classify_error(e) in (CONNECTION, THROTTLE, AUTH):
+                    # Tur boyu hata: bu ve kalan cevaplar geri çekilmeden sonra tekrar denenir
+                    self.queue.release_replies([reply_id for _, ids, _ in batches[index:] for reply_id in ids])
+                    raise
+                delay = self.bot.isolator.thread_failed(thread_id)
+                self.queue.release_replies(reply_ids, delay)
+                logger.error(f"Failed to send message to thread {thread_id}: {e}. "
+                             f"Retrying thread in {delay:.0f}s")
+        
+        # Yorum cevapları da gönderici sürecin jeton kovasını paylaşır
+        if Config.COMMENT_REPLIES:
+            sent += self.bot.comments.run_once()
+        
+        return sent
+
+
+def _configure_role(role: str):
+    """Süreç başına ayrı günlük dizini ve log dosyası (aynı dosyaya birden çok süreç yazmaz);
+    hız sınırı ve spam sayaçları ile çalışırken yapılan ayarlar ise tüm süreçlerde ortak"""
+    Config.SHARED_COUNTERS = True
+    Config.SHARED_ADMIN = True
+    Config.JOURNAL_DIR = os.path.join(Config.JOURNAL_DIR, role)
+    base, ext = os.path.splitext(Config.LOG_FILE)
+    Config.LOG_FILE = f"{base}.{role}{ext}"
+    if Config.CHECKPOINT_FILE:
+        base, ext = os.path.splitext(Config.CHECKPOINT_FILE)
+        Config.CHECKPOINT_FILE = f"{base}.{role}{ext}"
+
+
+def _supervise(processes: Dict[str, multiprocessing.Process], targets: Dict[str, tuple], context):
+    """Beklenmedik şekilde çıkan alt süreçleri yeniden başlat"""
+    try:
+        while True:
+            time.sleep(1.0)
+            for role, process in list(processes.items()):
+                if process.is_alive():
+                    continue
+                logger.warning(f"{role} exited with code {process.exitcode}; restarting")
+                processes[role] = context.Process(target=run_mode, args=targets[role], name=role)
+                processes[role].start()
+    except KeyboardInterrupt:
+        logger.info("Cluster stopping")
+    finally:
+        for process in processes.values():
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+
+
+def run_mode(mode: str = 'single', partition: int = 0, partitions: Optional[int] = None):
+    """Botu verilen modda çalıştır.
+    
+    single: tek süreç (çek, işle, gönder). push: tek süreç, mesajlar anlık
+    kaynaklardan gelir (bkz. ingest). poller / worker / sender: kuyruk
+    modunun tek bir rolü. cluster: çekici, `partitions` işçi ve göndericiyi
+    ayrı süreçler olarak başlatır ve denetler.
+    """
+    from .bot import InstagramAIBot
+    from .log import setup_logger
+    
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode: {mode}")
+    partitions = partitions or Config.QUEUE_WORKERS
+    
+    if mode == 'cluster':
+        setup_logger()
+        # Çalışırken yapılan ayarlar bu çalıştırmaya özeldir; önceki kümenin değişiklikleri uygulanmaz
+        queue = LocalQueue()
+        queue.clear_admin_changes()
+        queue.close()
+        context = multiprocessing.get_context('spawn')
+        targets = {'poller': ('poller',), 'sender': ('sender',)}
+        for k in range(partitions):
+            targets[f'worker-{k}'] = ('worker', k, partitions)
+        
+        processes: Dict[str, multiprocessing.Process] = {}
+        for role, args in targets.items():
+            processes[role] = context.Process(target=run_mode, args=args, name=role)
+            processes[role].start()
+        logger.info(f"Cluster started: {', '.join(processes)}")
+        _supervise(processes, targets, context)
+        return
+    
+    if mode not in ('single', 'push'):
+        _configure_role(f'worker-{partition}' if mode == 'worker' else mode)
+    setup_logger()
+    bot = InstagramAIBot()
+    
+    if mode == 'single':
+        bot.run()
+    elif mode == 'push':
+        from .ingest import PushIngestor
+        
+        ingestor = PushIngestor(bot)
+        try:
+            bot.run(ingestor.once, (0.0, 0.0))
+        finally:
+            ingestor.stop()
+    elif mode == 'poller':
+        bot.run(Poller(bot, LocalQueue(clock=bot.clock)).once)
+    elif mode == 'sender':
+        bot.run(Sender(bot, LocalQueue(clock=bot.clock)).once, Config.QUEUE_POLL_INTERVAL, control_socket=False)
+    else:
+        Worker(bot, LocalQueue(clock=bot.clock), partition, partitions).run()
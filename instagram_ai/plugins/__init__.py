@@ -0,0 +1,73 @@
+"""Yerleşik komut eklentileri.
+
+Burada yalnızca hafif metadata tanımlanır; her eklenti modülü komutu ilk
+kullanıldığında içe aktarılır. Yeni komut eklemek için tek yapılması gereken
+bir modül yazıp buraya tek satır `declare` eklemektir.
+"""
+from ..commands import CommandRegistry, CostClass
+from ..models import CommandCategory
+from ..templates import ResponseTemplates
+
+
+def register_builtins(registry: CommandRegistry):
+    """Yerleşik komutları kayıt defterine tanımla"""
+    pkg = __name__
+    
+    registry.declare('yardım', f'{pkg}.help', category=CommandCategory.UTILITIES,
+                     description='Tüm komutları göster', aliases=('komutlar', 'help', 'menu'))
+    registry.declare('hava', f'{pkg}.weather', category=CommandCategory.WEATHER,
+                     description='Hava durumu bilgisi', aliases=('havadurumu', 'weather'),
+                     usage='hava [şehir]', cost=CostClass.NETWORK, cache_ttl=300)
+    registry.declare('fıkra', f'{pkg}.fun', handler_name='handle_fikra', category=CommandCategory.FUN,
+                     description='Rastgele fıkra', aliases=('şaka', 'güldür', 'joke'))
+    registry.declare('bilgi', f'{pkg}.fun', handler_name='handle_bilgi', category=CommandCategory.KNOWLEDGE,
+                     description='İlginç bilgi', aliases=('ilginç', 'fact', 'öğren'))
+    registry.declare('söz', f'{pkg}.fun', handler_name='handle_soz', category=CommandCategory.MOTIVATION,
+                     description='Motivasyon sözü', aliases=('motivasyon', 'moral', 'quote'))
+    registry.declare('yemek', f'{pkg}.fun', handler_name='handle_yemek', category=CommandCategory.FOOD,
+                     description='Yemek önerisi', aliases=('neyesem', 'acıktım', 'food'))
+    registry.declare('haber', f'{pkg}.news', category=CommandCategory.NEWS,
+                     description='Güncel haberler', aliases=('gündem', 'news'),
+                     cost=CostClass.NETWORK, cache_ttl=120)
+    registry.declare('oyun', f'{pkg}.games', handler_name='handle_menu', category=CommandCategory.GAMES,
+                     description='Oyun menüsü', aliases=('games', 'play'))
+    registry.declare('saat', f'{pkg}.clock', category=CommandCategory.TIME,
+                     description='Saat ve tarih', aliases=('tarih', 'time', 'zaman'))
+    registry.declare('döviz', f'{pkg}.exchange', category=CommandCategory.UTILITIES,
+                     description='Döviz kurları', aliases=('kur', 'exchange'),
+                     cost=CostClass.NETWORK, cache_ttl=60)
+    registry.declare('istatistik', f'{pkg}.stats', category=CommandCategory.UTILITIES,
+                     description='Kişisel istatistikler', aliases=('stats', 'stat'), cost=CostClass.DB)
+    registry.declare('liderlik', f'{pkg}.stats', handler_name='handle_leaderboard',
+                     category=CommandCategory.GAMES, description='Liderlik tablosu',
+                     aliases=('sıralama', 'leaderboard'), cost=CostClass.DB)
+    registry.declare('bot', f'{pkg}.info', category=CommandCategory.UTILITIES,
+                     description='Bot bilgisi', aliases=('botbilgi', 'info', 'hakkında'))
+    
+    # Oyun komutları mesajın başında aranır
+    registry.declare('sayı tahmin', f'{pkg}.games', handler_name='handle_number_game',
+                     category=CommandCategory.GAMES, description='Sayı tahmin oyunu',
+                     prefixes=('sayı tahmin',), hidden=True)
+    registry.declare('tkm', f'{pkg}.games', handler_name='handle_rps',
+                     category=CommandCategory.GAMES, description='Taş kağıt makas',
+                     prefixes=('tkm',), usage='tkm [taş/kağıt/makas]', hidden=True)
+    registry.declare('bilgi yarışması', f'{pkg}.games', handler_name='handle_quiz',
+                     category=CommandCategory.GAMES, description='Quiz oyunu',
+                     prefixes=('bilgi yarışması',), usage='bilgi yarışması [kategori] [kolay/orta/zor]',
+                     hidden=True)
+    registry.declare('zar at', f'{pkg}.games', handler_name='handle_dice',
+                     category=CommandCategory.GAMES, description='Zar atma',
+                     prefixes=('zar at',), hidden=True)
+    registry.declare('yazı tura', f'{pkg}.games', handler_name='handle_coin',
+                     category=CommandCategory.GAMES, description='Yazı tura',
+                     prefixes=('yazı tura',), hidden=True)
+
+
+def register_templates(templates: ResponseTemplates):
+    """Yerleşik önceden derlenmiş cevapları tanımla"""
+    pkg = __name__
+    
+    templates.declare('help', f'{pkg}.help', 'build_help')
+    templates.declare('games_menu', f'{pkg}.games', 'build_menu')
+    templates.declare('bot_info', f'{pkg}.info', 'build_info',
+                      slots=('uptime', 'total_messages', 'total_users', 'start_time'))
@@ -0,0 +1,11 @@
+"""Saat komutu"""
+
+
+def handle(bot, user_id: int, message: str) -> str:
+    time_info = bot.utils.get_current_time()
+    return (
+        f"🕒 Saat: {time_info['time']}\n"
+        f"📅 Tarih: {time_info['date']}\n"
+        f"📌 Gün: {time_info['day']}\n"
+        f"🌍 Zaman Dilimi: {time_info['timezone']}"
+    )
@@ -0,0 +1,37 @@
+"""Döviz komutu"""
+from datetime import timedelta
+
+from ..config import Config
+
+
+def handle(bot, user_id: int, message: str) -> str:
+    """Döviz kurları cevabı oluştur (son 24 saatin özetiyle)"""
+    rates = bot.data_provider.get_exchange_rates()
+    if not rates:
+        return "💱 Döviz kurları şu anda alınamıyor. Biraz sonra tekrar dene."
+    
+    history = bot.data_provider.rate_history()
+    updated_at, _ = history.latest()
+    
+    response = "💱 Döviz Kurları:\n"
+    for currency, rate in rates.items():
+        response += f"\n{currency}: {rate:.2f} TL"
+        
+        stats = history.stats(currency, 86400, now=updated_at)
+        if stats and stats['samples'] > 1:
+            arrow = "▲" if stats['change'] > 0 else "▼" if stats['change'] < 0 else "▬"
+            response += (
+                f"  {arrow} %{abs(stats['change_pct']):.2f}\n"
+                f"   24s: {stats['min']:.2f} – {stats['max']:.2f} | Ort. {stats['avg']:.2f}"
+                f" | HO: {stats['moving_avg']:.2f}"
+            )
+    
+    age = bot.clock.time() - updated_at if updated_at is not None else 0.0
+    if age > Config.RATE_STALE_AFTER:
+        elapsed = bot.utils.format_time_delta(timedelta(seconds=int(age)))
+        response += f"\n\n⚠️ Güncel kur alınamadı; {elapsed} önceki son bilinen değerler gösteriliyor."
+    else:
+        time_info = bot.utils.get_current_time()
+        response += f"\n\n📅 {time_info['date']} {time_info['time']}"
+    
+    return response
@@ -0,0 +1,26 @@
+"""Eğlence komutları: fıkra, bilgi, söz, yemek"""
+
+
+def handle_fikra(bot, user_id: int, message: str) -> str:
+    bot.db.update_user_stats(user_id, 'fikra_count')
+    return f"😂 Fıkra:\n\n{bot.content_manager.get_random_fikra()}"
+
+
+def handle_bilgi(bot, user_id: int, message: str) -> str:
+    bot.db.update_user_stats(user_id, 'bilgi_count')
+    return f"🧠 İlginç Bilgi:\n\n{bot.content_manager.get_random_bilgi()}"
+
+
+def handle_soz(bot, user_id: int, message: str) -> str:
+    return f"💪 {bot.content_manager.get_random_soz()}"
+
+
+def handle_yemek(bot, user_id: int, message: str) -> str:
+    yemek = bot.content_manager.get_random_yemek()
+    return (
+        f"🍽️ Yemek Önerisi:\n\n"
+        f"{yemek['name']}\n"
+        f"{yemek['desc']}\n"
+        f"⭐ {yemek['rating']:.1f}/5 | 💰 ~{yemek['price']} TL\n"
+        f"🔥 {yemek['calories']} kalori"
+    )
@@ -0,0 +1,46 @@
+"""Oyun komutları"""
+from ..questions import QuestionBank
+
+
+def handle_menu(bot, user_id: int, message: str) -> str:
+    return bot.templates.render('games_menu')
+
+
+def build_menu(registry) -> str:
+    """Oyun menüsü"""
+    return (
+        "🎮 OYUN MENÜSÜ 🎮\n\n"
+        "1. 🎯 Sayı Tahmin Oyunu - 'sayı tahmin'\n"
+        "2. 🪨📄✂️ Taş Kağıt Makas - 'tkm [seçimin]'\n"
+        "3. ❓ Bilgi Yarışması - 'bilgi yarışması [kategori]'\n"
+        "4. 🎲 Zar At - 'zar at'\n"
+        "5. 🪙 Yazı Tura - 'yazı tura'\n\n"
+        "💡 Örnek: 'sayı tahmin' veya 'tkm taş'"
+    )
+
+
+def handle_number_game(bot, user_id: int, message: str) -> str:
+    return bot.game_engine.start_number_game(user_id)
+
+
+def handle_quiz(bot, user_id: int, message: str) -> str:
+    # İsteğe bağlı: 'bilgi yarışması [kategori] [kolay/orta/zor]'
+    category = difficulty = None
+    for word in message[len('bilgi yarışması'):].split():
+        if word in QuestionBank.DIFFICULTIES:
+            difficulty = QuestionBank.DIFFICULTIES[word]
+        elif word in bot.game_engine.question_bank.categories:
+            category = word
+    return bot.game_engine.start_quiz(user_id, category, difficulty)
+
+
+def handle_rps(bot, user_id: int, message: str) -> str:
+    return bot.game_engine.rock_paper_scissors(message[3:].strip())
+
+
+def handle_dice(bot, user_id: int, message: str) -> str:
+    return bot.game_engine.roll_dice()
+
+
+def handle_coin(bot, user_id: int, message: str) -> str:
+    return bot.game_engine.flip_coin()
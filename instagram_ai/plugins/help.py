@@ -0,0 +1,29 @@
+"""Yardım komutu"""
+
+
+def handle(bot, user_id: int, message: str) -> str:
+    return bot.templates.render('help')
+
+
+def build_help(registry) -> str:
+    """Yardım metnini kayıt defterinden oluştur (kayıt değiştiğinde bir kez)"""
+    # Komutları kategorilere göre grupla
+    categories = {}
+    game_commands = []
+    for spec in registry:
+        if spec.hidden:
+            game_commands.append(f"• `{spec.usage or spec.name}` - {spec.description}")
+            continue
+        
+        aliases = '/'.join(spec.aliases[:2])
+        categories.setdefault(spec.category.value, []).append(
+            f"• `{spec.name}` ({aliases}) - {spec.description}"
+        )
+    
+    sections = ["🤖 **ASİSTAN BOT KOMUTLARI** 🤖"]
+    sections.extend(f"{category}:\n" + "\n".join(commands) for category, commands in categories.items())
+    if game_commands:
+        sections.append("🎮 **Oyun Komutları:**\n" + "\n".join(game_commands))
+    sections.append("💡 *Örnek: 'hava İstanbul' veya 'fıkra'*")
+    
+    return "\n\n".join(sections)
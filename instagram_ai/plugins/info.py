@@ -0,0 +1,34 @@
+"""Bot bilgisi komutu"""
+
+
+def handle(bot, user_id: int, message: str) -> str:
+    """Bot bilgilerini getir"""
+    bot.bot_stats.total_users = bot.db.rollups.total('totals', 'users')
+    
+    return bot.templates.render(
+        'bot_info',
+        uptime=bot.utils.format_time_delta(bot.clock.now() - bot.bot_stats.start_time),
+        total_messages=bot.bot_stats.total_messages,
+        total_users=bot.bot_stats.total_users,
+        start_time=bot.bot_stats.start_time.strftime('%d/%m/%Y %H:%M')
+    )
+
+
+def build_info(registry) -> str:
+    """Bot bilgisi şablonu; `{...}` yuvaları her istekte doldurulur"""
+    return (
+        "🤖 INSTAGRAM AI BOT v3.0\n\n"
+        "🚀 Çalışma Süresi: {uptime}\n"
+        "💬 Toplam Mesaj: {total_messages}\n"
+        "👥 Toplam Kullanıcı: {total_users}\n"
+        "📅 Başlangıç: {start_time}\n\n"
+        "✨ Özellikler:\n"
+        "• Akıllı komut sistemi\n"
+        "• Gerçek hava durumu\n"
+        "• Güncel haberler\n"
+        "• Eğlenceli oyunlar\n"
+        "• İstatistik takibi\n"
+        "• Güvenlik sistemi\n\n"
+        "🛠️ Geliştirici: @kullanici_adiniz\n"
+        "🔒 Sürüm: 3.0.0 | Python 3.9+"
+    )
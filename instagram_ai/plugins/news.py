@@ -0,0 +1,13 @@
+"""Haber komutu"""
+import random
+
+
+def handle(bot, user_id: int, message: str) -> str:
+    """Haber cevabı oluştur"""
+    news_items = bot.data_provider.get_news()
+    
+    if news_items:
+        news = random.choice(news_items[:5])
+        return f"📰 Güncel Haber:\n\n{news.title}\n\n🔗 {news.link}"
+    else:
+        return "📰 Şu anda haber bulunamadı. Daha sonra tekrar deneyin."
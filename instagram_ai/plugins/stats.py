@@ -0,0 +1,50 @@
+"""İstatistik ve liderlik komutları"""
+from datetime import datetime
+
+
+def handle(bot, user_id: int, message: str) -> str:
+    """Kullanıcı istatistiklerini getir"""
+    user = bot.db.get_user(user_id)
+    
+    if not user:
+        return "İstatistik bulunamadı."
+    
+    first_seen = datetime.fromisoformat(user['first_seen']).strftime('%d/%m/%Y %H:%M')
+    last_seen = datetime.fromisoformat(user['last_seen']).strftime('%d/%m/%Y %H:%M')
+    
+    return (
+        f"📊 {user['username'] or 'Kullanıcı'} İstatistikleri:\n\n"
+        f"📅 İlk Görülme: {first_seen}\n"
+        f"🕒 Son Görülme: {last_seen}\n"
+        f"💬 Toplam Mesaj: {user['message_count']}\n"
+        f"😂 Fıkra Dinleme: {user['fikra_count']}\n"
+        f"🧠 Bilgi Öğrenme: {user['bilgi_count']}\n"
+        f"🏆 Oyun Kazanma: {user['game_wins']}\n"
+        f"👤 Kullanıcı ID: {user_id}"
+    )
+
+
+def handle_leaderboard(bot, user_id: int, message: str) -> str:
+    """Liderlik tablosunu oluştur (artımlı sayaçlardan)"""
+    rollups = bot.db.rollups
+    medals = ['🥇', '🥈', '🥉', '4.', '5.']
+    
+    sections = [
+        ("🎮 Oyun Kazanma", rollups.top_users('game_wins')),
+        ("💬 En Çok Mesaj", rollups.top_users('message_count'))
+    ]
+    
+    lines = ["🏆 LİDERLİK TABLOSU 🏆"]
+    for title, rows in sections:
+        lines.append(f"\n{title}:")
+        if not rows:
+            lines.append("Henüz veri yok.")
+        for medal, (_, username, value) in zip(medals, rows):
+            lines.append(f"{medal} {username or 'Kullanıcı'} - {value}")
+    
+    commands = rollups.top('commands')
+    if commands:
+        lines.append("\n⭐ Popüler Komutlar:")
+        lines.extend(f"{medal} {cmd} - {value}" for medal, (cmd, value) in zip(medals, commands))
+    
+    return "\n".join(lines)
@@ -0,0 +1,81 @@
+"""Hava durumu komutu"""
+import random
+import re
+
+
+def handle(bot, user_id: int, message: str) -> str:
+    """Hava durumu komutunu işle"""
+    # Şehir adını çıkar
+    city = None
+    patterns = [
+        r'hava\s+(durumu\s+)?(.+)',
+        r'weather\s+(.+)$'
+    ]
+    
+    for pattern in patterns:
+        match = re.search(pattern, message, re.IGNORECASE)
+        if match:
+            city = match.group(2) if match.lastindex == 2 else match.group(1)
+            break
+    
+    if city and city.strip():
+        return weather_response(bot, city.strip())
+    else:
+        # Şehir sor
+        bot.db.set_session(user_id, 'awaiting_city', {}, ttl=60)
+        return "🌍 Hangi şehrin hava durumunu merak ediyorsun?"
+
+
+def weather_response(bot, city: str) -> str:
+    """Hava durumu cevabı oluştur"""
+    # API'den gerçek veri al
+    real_weather = bot.data_provider.get_weather(city)
+    
+    if real_weather:
+        city_formatted = bot.utils.add_city_suffix(city)
+        emoji = weather_emoji(real_weather['icon'])
+        
+        return (
+            f"{city_formatted} hava durumu:\n\n"
+            f"🌡️ Sıcaklık: {real_weather['temp']}°C\n"
+            f"🤔 Hissedilen: {real_weather['feels_like']}°C\n"
+            f"🌤️ Durum: {real_weather['description'].title()} {emoji}\n"
+            f"💧 Nem: %{real_weather['humidity']}\n"
+            f"💨 Rüzgar: {real_weather['wind_speed']} m/s"
+        )
+    else:
+        # Simüle edilmiş hava durumu
+        temp = random.randint(-5, 35)
+        conditions = [
+            ("Güneşli", "☀️"), ("Parçalı Bulutlu", "⛅"), 
+            ("Yağmurlu", "🌧️"), ("Karlı", "❄️"), 
+            ("Rüzgarlı", "💨"), ("Sisli", "🌫️")
+        ]
+        condition, emoji = random.choice(conditions)
+        city_formatted = bot.utils.add_city_suffix(city)
+        
+        return (
+            f"{city_formatted} hava durumu (simüle):\n\n"
+            f"🌡️ Sıcaklık: {temp}°C\n"
+            f"🌤️ Durum: {condition} {emoji}\n"
+            f"💧 Nem: %{random.randint(30, 90)}\n"
+            f"💨 Rüzgar: {random.randint(0, 15)} km/s"
+        )
+
+
+def weather_emoji(icon_code: str) -> str:
+    """Hava durumu ikonu için emoji"""
+    icon_map = {
+        '01': '☀️',  # açık
+        '02': '⛅',  # az bulutlu
+        '03': '☁️',  # parçalı bulutlu
+        '04': '☁️',  # bulutlu
+        '09': '🌧️',  # sağanak
+        '10': '🌦️',  # yağmurlu
+        '11': '⛈️',  # gök gürültülü
+        '13': '❄️',  # kar
+        '50': '🌫️'   # sis
+    }
+    
+    code = icon_code[:2]
+    return icon_map.get(code, '🌤️')
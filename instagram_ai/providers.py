@@ -0,0 +1,377 @@
+"""Harici veri sağlayıcıları ve istek birleştirme"""
+import logging
+import threading
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .clock import Clock, SystemClock
+from .config import Config
+from .models import FeedState, NewsItem
+
+if TYPE_CHECKING:
+    from .rates import RateHistory
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """Aynı anahtara yapılan eşzamanlı çağrıları tek upstream isteğinde birleştir"""
+    
+    class _Call:
+        __slots__ = ('event', 'result', 'error')
+        
+        def __init__(self):
+            self.event = threading.Event()
+            self.result = None
+            self.error = None
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, 'SingleFlight._Call'] = {}
+        self._async_calls: Dict[Tuple[int, str], Any] = {}
+        self.stats = {'calls': 0, 'executions': 0, 'deduplicated': 0, 'errors': 0}
+    
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """fn'i çalıştır; aynı anahtarla uçuşta bir çağrı varsa onun sonucunu paylaş"""
+        with self._lock:
+            self.stats['calls'] += 1
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self._Call()
+                self._calls[key] = call
+                self.stats['executions'] += 1
+            else:
+                self.stats['deduplicated'] += 1
+        
+        if is_leader:
+            try:
+                call.result = fn()
+            except Exception as e:
+                call.error = e
+                with self._lock:
+                    self.stats['errors'] += 1
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.event.set()
+        else:
+            call.event.wait()
+        
+        if call.error is not None:
+            raise call.error
+        return call.result
+    
+    async def do_async(self, key: str, fn: Callable[[], Any]) -> Any:
+        """asyncio sürümü; lider çağrı iş parçacığı havuzunda do() üzerinden çalışır,
+        böylece thread ve asyncio çağıranları da birbiriyle birleşir"""
+        import asyncio
+        
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), key)
+        
+        with self._lock:
+            future = self._async_calls.get(flight_key)
+            is_leader = future is None
+            if is_leader:
+                future = loop.create_future()
+                self._async_calls[flight_key] = future
+            else:
+                self.stats['calls'] += 1
+                self.stats['deduplicated'] += 1
+        
+        if not is_leader:
+            return await asyncio.shield(future)
+        
+        try:
+            future.set_result(await loop.run_in_executor(None, self.do, key, fn))
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._async_calls[flight_key]
+        
+        return future.result()
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Sayaçların kopyasını döndür"""
+        with self._lock:
+            return dict(self.stats)
+
+class DataProvider:
+    """Harici veri sağlayıcıları"""
+    
+    # Eşzamanlı aynı istekler (ör. viral 'hava istanbul') tek HTTP çağrısına iner
+    _flight = SingleFlight()
+    
+    # Kur geçmişi tüm çağıranlar arasında paylaşılır
+    _rates: Optional['RateHistory'] = None
+    _rates_lock = threading.Lock()
+    
+    # Kur zaman damgaları bu saatten okunur (bot kendi saatini verir)
+    clock: Clock = SystemClock()
+    
+    def __init__(self, clock: Optional[Clock] = None):
+        if clock is not None:
+            DataProvider.clock = clock
+    
+    @staticmethod
+    def get_weather(city: str) -> Optional[Dict]:
+        """OpenWeatherMap API ile hava durumu"""
+        if not Config.WEATHER_API_KEY:
+            return None
+        
+        return DataProvider._flight.do(
+            DataProvider._weather_key(city),
+            lambda: DataProvider._fetch_weather(city)
+        )
+    
+    @staticmethod
+    async def get_weather_async(city: str) -> Optional[Dict]:
+        """get_weather'ın asyncio sürümü"""
+        if not Config.WEATHER_API_KEY:
+            return None
+        
+        return await DataProvider._flight.do_async(
+            DataProvider._weather_key(city),
+            lambda: DataProvider._fetch_weather(city)
+        )
+    
+    @staticmethod
+    def _weather_key(city: str) -> str:
+        return f"weather:{city.strip().casefold()}"
+    
+    @staticmethod
+    def _fetch_weather(city: str) -> Optional[Dict]:
+        try:
+            url = f"http://api.openweathermap.org/data/2.5/weather"
+            params = {
+                'q': city,
+                'appid': Config.WEATHER_API_KEY,
+                'units': 'metric',
+                'lang': 'tr'
+            }
+            
+            import requests
+            
+            response = requests.get(url, params=params, timeout=10)
+            if response.status_code == 200:
+                data = response.json()
+                return {
+                    'city': data['name'],
+                    'temp': data['main']['temp'],
+                    'feels_like': data['main']['feels_like'],
+                    'humidity': data['main']['humidity'],
+                    'description': data['weather'][0]['description'],
+                    'wind_speed': data['wind']['speed'],
+                    'icon': data['weather'][0]['icon']
+                }
+        except Exception as e:
+            logger.error(f"Weather API error: {e}")
+        
+        return None
+    
+    # Türk haber sitelerinden RSS
+    NEWS_SOURCES = (
+        "https://www.bbc.com/turkce/topics/cjgn7n9zzq7t?page=1",
+        "https://www.trthaber.com/manset_articles.rss"
+    )
+    NEWS_PER_SOURCE = 5
+    
+    _feeds: Dict[str, FeedState] = {}
+    # Haber çekme havuzu ilk haber isteğinde oluşturulur, `shutdown` ile kapanır
+    _news_pool: Optional[ThreadPoolExecutor] = None
+    _news_pool_lock = threading.Lock()
+    
+    @staticmethod
+    def get_news() -> List[NewsItem]:
+        """Haberleri getir"""
+        return DataProvider._flight.do('news', DataProvider._fetch_news)
+    
+    @staticmethod
+    async def get_news_async() -> List[NewsItem]:
+        """get_news'in asyncio sürümü"""
+        return await DataProvider._flight.do_async('news', DataProvider._fetch_news)
+    
+    @staticmethod
+    def set_news_workers(count: int):
+        """Haber çekme havuzunu yeniden boyutlandır (uçuştaki işler eski havuzda biter)"""
+        with DataProvider._news_pool_lock:
+            old, DataProvider._news_pool = DataProvider._news_pool, None
+            Config.NEWS_WORKERS = count
+        if old is not None:
+            old.shutdown(wait=False)
+    
+    @staticmethod
+    def _news_executor() -> ThreadPoolExecutor:
+        with DataProvider._news_pool_lock:
+            if DataProvider._news_pool is None:
+                DataProvider._news_pool = ThreadPoolExecutor(max_workers=Config.NEWS_WORKERS,
+                                                             thread_name_prefix='news')
+            return DataProvider._news_pool
+    
+    @staticmethod
+    def shutdown():
+        """Haber çekme havuzunu kapat (bot dururken); sonraki haber isteği yenisini açar"""
+        with DataProvider._news_pool_lock:
+            pool, DataProvider._news_pool = DataProvider._news_pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+    
+    @staticmethod
+    def clear_feeds():
+        """Koşullu istek durumlarını (ETag/Last-Modified) unut; sonraki çekim tam yapılır"""
+        DataProvider._feeds.clear()
+    
+    @staticmethod
+    def _fetch_news() -> List[NewsItem]:
+        # Kaynaklar paralel çekilir, sıralama kaynak sırasına göre korunur
+        pool = DataProvider._news_executor()
+        futures = [
+            pool.submit(DataProvider._fetch_feed, source)
+            for source in DataProvider.NEWS_SOURCES
+        ]
+        
+        news_items = []
+        for future in futures:
+            news_items.extend(future.result())
+        return news_items
+    
+    @staticmethod
+    def _fetch_feed(source: str) -> Tuple[NewsItem, ...]:
+        """Tek kaynağı koşullu istekle çek; değişmemişse önceki kayıtları döndür"""
+        cached = DataProvider._feeds.get(source)
+        headers = {}
+        if cached:
+            if cached.etag:
+                headers['If-None-Match'] = cached.etag
+            if cached.last_modified:
+                headers['If-Modified-Since'] = cached.last_modified
+        
+        try:
+            import requests
+            
+            with requests.get(source, headers=headers, timeout=10, stream=True) as response:
+                if response.status_code == 304 and cached:
+                    return cached.items
+                if response.status_code != 200:
+                    return cached.items if cached else ()
+                
+                items = DataProvider._parse_feed(
+                    response.iter_content(chunk_size=8192),
+                    DataProvider.NEWS_PER_SOURCE
+                )
+                DataProvider._feeds[source] = FeedState(
+                    etag=response.headers.get('ETag'),
+                    last_modified=response.headers.get('Last-Modified'),
+                    items=items
+                )
+                return items
+        
+        except Exception as e:
+            logger.error(f"News fetch error ({source}): {e}")
+            return cached.items if cached else ()
+    
+    @staticmethod
+    def _parse_feed(chunks: Iterable[bytes], limit: int) -> Tuple[NewsItem, ...]:
+        """RSS/Atom akışını parça parça işle, ilk `limit` kayıttan sonra dur"""
+        chunks = iter(chunks)
+        parser = ET.XMLPullParser(events=('start', 'end'))
+        consumed = []
+        items = []
+        in_item = False
+        title = link = None
+        
+        try:
+            for chunk in chunks:
+                consumed.append(chunk)
+                parser.feed(chunk)
+                
+                for event, elem in parser.read_events():
+                    tag = elem.tag.rsplit('}', 1)[-1]
+                    
+                    if event == 'start':
+                        if tag in ('item', 'entry'):
+                            in_item = True
+                            title = link = None
+                        continue
+                    
+                    if not in_item:
+                        continue
+                    
+                    if tag == 'title':
+                        title = (elem.text or '').strip()
+                    elif tag == 'link' and not link:
+                        link = (elem.text or elem.get('href') or '').strip()
+                    elif tag in ('item', 'entry'):
+                        in_item = False
+                        if title and link:
+                            items.append(NewsItem(title, link))
+                            if len(items) >= limit:
+                                return tuple(items)
+                    
+                    elem.clear()
+        
+        except ET.ParseError:
+            # Bozuk/HTML içerik: kalan akışı okuyup toleranslı ayrıştırıcıya bırak
+            from bs4 import BeautifulSoup
+            
+            consumed.extend(chunks)
+            soup = BeautifulSoup(b''.join(consumed), 'xml')
+            return tuple(
+                NewsItem(item.find('title').text, item.find('link').text)
+                for item in soup.find_all('item')[:limit]
+                if item.find('title') and item.find('link')
+            )
+        
+        return tuple(items)
+    
+    @staticmethod
+    def get_exchange_rates() -> Dict:
+        """Döviz kurlarını getir"""
+        return DataProvider._flight.do('exchange', DataProvider._fetch_exchange_rates)
+    
+    @staticmethod
+    async def get_exchange_rates_async() -> Dict:
+        """get_exchange_rates'in asyncio sürümü"""
+        return await DataProvider._flight.do_async('exchange', DataProvider._fetch_exchange_rates)
+    
+    @staticmethod
+    def rate_history() -> 'RateHistory':
+        """Kur geçmişi (ilk kullanımda açılır)"""
+        if DataProvider._rates is None:
+            from .rates import RateHistory
+            
+            with DataProvider._rates_lock:
+                if DataProvider._rates is None:
+                    DataProvider._rates = RateHistory(clock=DataProvider.clock)
+        return DataProvider._rates
+    
+    @staticmethod
+    def _fetch_exchange_rates() -> Dict:
+        """Kurları çek ve geçmişe ekle; çekim başarısızsa son bilinen gerçek kurları döndür"""
+        history = DataProvider.rate_history()
+        try:
+            url = "https://api.exchangerate-api.com/v4/latest/TRY"
+            import requests
+            
+            response = requests.get(url, timeout=10)
+            response.raise_for_status()
+            data = response.json()
+            # API 1 TL'nin karşılığını verir; kullanıcıya 1 birimin TL değeri gösterilir
+            rates = {code: 1 / data['rates'][code] for code in Config.EXCHANGE_CURRENCIES}
+            history.record(rates)
+            return rates
+        except Exception as e:
+            logger.warning(f"Exchange rate fetch failed, serving last known rates: {e}")
+        
+        return history.latest()[1]
+    
+    @staticmethod
+    def flight_stats() -> Dict[str, int]:
+        """Birleştirilen (deduplicated) upstream çağrı sayaçları"""
+        return DataProvider._flight.get_stats()
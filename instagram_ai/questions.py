@@ -0,0 +1,124 @@
+"""Bilgi yarışması soru bankası"""
+import logging
+import random
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class Question(NamedTuple):
+    """Bilgi yarışması sorusu"""
+    id: int
+    category: str
+    difficulty: int
+    text: str
+    options: Tuple[str, ...]
+    answer: int
+
+class QuestionBank:
+    """Dosyadan bir kez yüklenen, kategori ve zorluğa göre bit maskeleriyle indekslenen soru bankası"""
+    
+    DIFFICULTIES = {'kolay': 1, 'orta': 2, 'zor': 3}
+    REJECTION_TRIES = 8   # Sıra seçimine düşmeden önce rastgele üye denemesi
+    
+    _default: Optional['QuestionBank'] = None
+    
+    def __init__(self, questions: List[Question]):
+        self.questions: Dict[int, Question] = {q.id: q for q in questions}
+        self.categories = sorted({q.category for q in questions})
+        
+        # (kategori, zorluk) -> soru id bit maskesi; None "hepsi" demektir.
+        # Bitler dosyadaki sıraya değil kalıcı soru id'sine göredir.
+        self._pools: Dict[Tuple[Optional[str], Optional[int]], int] = {}
+        members: Dict[Tuple[Optional[str], Optional[int]], List[int]] = {}
+        for q in questions:
+            bit = 1 << q.id
+            for key in ((None, None), (q.category, None), (None, q.difficulty), (q.category, q.difficulty)):
+                self._pools[key] = self._pools.get(key, 0) | bit
+                members.setdefault(key, []).append(q.id)
+        # Havuz üyeleri listesi: tekdüze örnekleme için
+        self._members: Dict[Tuple[Optional[str], Optional[int]], Tuple[int, ...]] = {
+            key: tuple(ids) for key, ids in members.items()
+        }
+    
+    @classmethod
+    def load(cls, path: str) -> 'QuestionBank':
+        """TSV dosyasından yükle: id, kategori, zorluk, soru, seçenekler (|), doğru seçenek"""
+        questions = []
+        ids = set()
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                line = line.rstrip('\n')
+                if not line or line.startswith('#'):
+                    continue
+                
+                question_id, category, difficulty, text, options, answer = line.split('\t')
+                question_id = int(question_id)
+                if question_id < 0 or question_id in ids:
+                    raise ValueError(f"Invalid or duplicate question id: {question_id}")
+                ids.add(question_id)
+                questions.append(Question(
+                    question_id, category, int(difficulty), text,
+                    tuple(options.split('|')), int(answer)
+                ))
+        
+        logger.info(f"Loaded {len(questions)} quiz questions")
+        return cls(questions)
+    
+    @classmethod
+    def default(cls) -> 'QuestionBank':
+        """Config.QUESTIONS_FILE'dan yüklenen paylaşılan banka"""
+        if cls._default is None:
+            try:
+                cls._default = cls.load(Config.QUESTIONS_FILE)
+            except (OSError, ValueError) as e:
+                logger.error(f"Failed to load question bank: {e}")
+                cls._default = cls([])
+        return cls._default
+    
+    def get(self, question_id: int) -> Optional[Question]:
+        if isinstance(question_id, int):
+            return self.questions.get(question_id)
+        return None
+    
+    def pool(self, category: Optional[str] = None, difficulty: Optional[int] = None) -> int:
+        return self._pools.get((category, difficulty), 0)
+    
+    def draw(self, seen: int, category: Optional[str] = None,
+             difficulty: Optional[int] = None) -> Optional[Question]:
+        """Görülmemiş sorular arasından tekdüze rastgele seç; havuzda görülmemiş soru yoksa None.
+        
+        Önce havuz üyelerinden rastgele id çekilip görülmüş mü diye bakılır
+        (ret örneklemesi: boş soru oranı yüksekken beklenen O(1)). Birkaç
+        denemede boş soru bulunamazsa boş bitler arasından sıra seçimiyle
+        (k. boş bit) seçilir; bu yol havuz boyutuyla doğrusal ama her boş
+        soruya yine eşit olasılık verir.
+        """
+        key = (category, difficulty)
+        free = self._pools.get(key, 0) & ~seen
+        if not free:
+            return None
+        
+        members = self._members[key]
+        for _ in range(self.REJECTION_TRIES):
+            question_id = random.choice(members)
+            if free >> question_id & 1:
+                return self.questions[question_id]
+        
+        return self.questions[_select_bit(free, random.randrange(free.bit_count()))]
+
+
+def _select_bit(value: int, rank: int) -> int:
+    """`value`'daki `rank`. (0'dan) set bitin konumu"""
+    shift = 0
+    while True:
+        word = (value >> shift) & 0xFFFFFFFFFFFFFFFF
+        count = word.bit_count()
+        if rank < count:
+            for _ in range(rank):
+                word &= word - 1   # En düşük set biti sil
+            return shift + (word & -word).bit_length() - 1
+        rank -= count
+        shift += 64
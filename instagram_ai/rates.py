@@ -0,0 +1,226 @@
+"""Döviz kuru geçmişi: dosyaya eşlenmiş (mmap) halka tamponda sıkıştırılmış seriler"""
+import logging
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_left
+from itertools import chain
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from .clock import Clock, SystemClock
+from .config import Config
+
+try:
+    import fcntl
+except ImportError:  # Windows: yalnızca süreç içi kilit
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Yuva sıra numaralarının en düşük baytı ve tek/çift tablosu: yazılmakta olan
+# yuva aramasını Python döngüsü yerine bytes işlemleriyle yapmak için
+_LOW_BYTE = 0 if sys.byteorder == 'little' else 7
+_PARITY = bytes(i & 1 for i in range(256))
+
+
+def _writing(seqs: array) -> bool:
+    """Sıra numaralarından biri tek mi (o yuvaya şu an yazılıyor)"""
+    return 1 in seqs.tobytes()[_LOW_BYTE::8].translate(_PARITY)
+
+
+class RateHistory:
+    """Para birimi başına sabit kapasiteli halka tampon (float64), mmap ile kalıcı.
+    
+    Dosya düzeni: 64 baytlık başlık (sihirli sayı, sürüm, kapasite, toplam
+    kayıt sayısı, para birimi kodları), ardından yuva sıra numaraları, zaman
+    damgaları ve her para birimi için birer `capacity` uzunluklu double
+    dizisi. Seriler doğrudan mmap üzerinden `memoryview` ile okunur; sorgular
+    (min/max/ortalama) Python döngüsü yerine dizi dilimleri üzerinde C
+    seviyesinde çalışır.
+    
+    Okuyucular kilit almaz. Her yuvanın sıra numarası yazım boyunca tektir
+    (seqlock): okuyucu numarayı okumadan önce ve sonra karşılaştırır, tek ya
+    da değişmiş yuvayı (yarım kayıt) atlar.
+    """
+    
+    MAGIC = b'IGRH'
+    VERSION = 2
+    HEADER = struct.Struct('<4sHHIQ')  # sihirli sayı, sürüm, para birimi sayısı, kapasite, toplam kayıt
+    HEADER_SIZE = 64
+    
+    def __init__(self, path: Optional[str] = None, currencies: Optional[Sequence[str]] = None,
+                 capacity: Optional[int] = None, clock: Optional[Clock] = None):
+        self.path = path or Config.RATES_FILE
+        self.clock = clock or SystemClock()
+        self.currencies = tuple(currencies or Config.EXCHANGE_CURRENCIES)
+        self.capacity = capacity or Config.RATE_HISTORY_SIZE
+        self._lock = threading.Lock()
+        
+        size = self.HEADER_SIZE + (2 + len(self.currencies)) * self.capacity * 8
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        with self._file_lock():
+            if not self._compatible(size):
+                if os.fstat(self._fd).st_size:
+                    logger.warning(f"Rate history layout changed, starting a new one in {self.path}")
+                os.ftruncate(self._fd, 0)
+                os.ftruncate(self._fd, size)
+                codes = b''.join(code.encode('ascii')[:3].ljust(3) for code in self.currencies)
+                os.pwrite(self._fd, self.HEADER.pack(self.MAGIC, self.VERSION, len(self.currencies),
+                                                     self.capacity, 0) + codes, 0)
+        
+        self._map = mmap.mmap(self._fd, size)
+        view = memoryview(self._map)
+        body = self.capacity * 8
+        self._seqs = view[self.HEADER_SIZE:self.HEADER_SIZE + body].cast('Q')
+        self._times = view[self.HEADER_SIZE + body:self.HEADER_SIZE + 2 * body].cast('d')
+        self._series = {
+            code: view[self.HEADER_SIZE + (i + 2) * body:self.HEADER_SIZE + (i + 3) * body].cast('d')
+            for i, code in enumerate(self.currencies)
+        }
+        
+        with self._file_lock():
+            # Yazarken ölen süreç yuvasını tek bırakmış olabilir; kayıt olduğu gibi kabul edilir
+            if _writing(array('Q', self._seqs)):
+                for i, seq in enumerate(self._seqs):
+                    if seq & 1:
+                        self._seqs[i] = seq + 1
+    
+    def _compatible(self, size: int) -> bool:
+        if os.fstat(self._fd).st_size != size:
+            return False
+        header = os.pread(self._fd, self.HEADER.size + 3 * len(self.currencies), 0)
+        magic, version, n_currencies, capacity, _ = self.HEADER.unpack_from(header)
+        codes = header[self.HEADER.size:].decode('ascii', 'replace')
+        return (magic == self.MAGIC and version == self.VERSION and n_currencies == len(self.currencies)
+                and capacity == self.capacity and codes == ''.join(c[:3].ljust(3) for c in self.currencies))
+    
+    def _file_lock(self):
+        return _FileLock(self._fd)
+    
+    @property
+    def total(self) -> int:
+        """Şimdiye kadar eklenen toplam kayıt (kapasiteyi aşanlar dahil)"""
+        return self.HEADER.unpack_from(self._map)[4]
+    
+    def __len__(self) -> int:
+        return min(self.total, self.capacity)
+    
+    # ---- Yazma ----
+    
+    def record(self, rates: Dict[str, float], ts: Optional[float] = None) -> bool:
+        """Yeni kurları ekle; son kayda `RATE_SAMPLE_INTERVAL`'dan yakınsa son kaydın üzerine yazar"""
+        ts = self.clock.time() if ts is None else ts
+        with self._lock, self._file_lock():
+            total = self.total
+            last = (total - 1) % self.capacity
+            if total and ts - self._times[last] < Config.RATE_SAMPLE_INTERVAL:
+                index, appended = last, False
+            else:
+                index, appended = total % self.capacity, True
+            
+            # Yuva önce kirli işaretlenir, sayaç sonra artar: yeni toplamı gören
+            # okuyucu yarım kaydı tek sıra numarasından tanır ve atlar
+            self._seqs[index] += 1
+            if appended:
+                struct.pack_into('<Q', self._map, self.HEADER.size - 8, total + 1)
+            
+            self._times[index] = ts
+            for code, series in self._series.items():
+                series[index] = rates.get(code, series[last] if total else 0.0)
+            self._seqs[index] += 1
+            return appended
+    
+    # ---- Sorgular ----
+    
+    def _snapshot(self, *views: memoryview) -> Tuple[int, List[array], Set[int]]:
+        """Kilitsiz okuma: (toplam kayıt, dizi kopyaları, okuma sırasında yazılan yuvalar)"""
+        before = array('Q', self._seqs)
+        total = self.total
+        copies = [array('d', view) for view in views]
+        after = array('Q', self._seqs)
+        
+        if before == after and not _writing(before):
+            return total, copies, set()
+        torn = {i for i, (first, second) in enumerate(zip(before, after)) if first != second or first & 1}
+        return total, copies, torn
+    
+    def _ordered(self, total: int, values: array, torn: Set[int]) -> array:
+        """Halka tampon kopyasını eskiden yeniye sıralı bir diziye aç (yarım kayıtlar atlanır)"""
+        head = total % self.capacity if total > self.capacity else 0
+        if torn:
+            slots = chain(range(head, self.capacity), range(head)) if head else range(min(total, self.capacity))
+            return array('d', (values[i] for i in slots if i not in torn))
+        if total <= self.capacity:
+            return values[:total]
+        return values[head:] + values[:head]
+    
+    def latest(self) -> Tuple[Optional[float], Dict[str, float]]:
+        """(zaman, para birimi -> son kur); kayıt yoksa (None, {}).
+        
+        Son yuvaya o an yazılıyorsa bir önceki tam kayıt döner.
+        """
+        total = self.total
+        for back in range(min(total, self.capacity)):
+            index = (total - 1 - back) % self.capacity
+            seq = self._seqs[index]
+            ts = self._times[index]
+            rates = {code: series[index] for code, series in self._series.items()}
+            if not seq & 1 and self._seqs[index] == seq:
+                return ts, rates
+        return None, {}
+    
+    def series(self, code: str, seconds: Optional[float] = None,
+               now: Optional[float] = None) -> Tuple[array, array]:
+        """Son `seconds` saniyelik (zamanlar, kurlar) dizileri"""
+        total, (times, values), torn = self._snapshot(self._times, self._series[code])
+        times = self._ordered(total, times, torn)
+        values = self._ordered(total, values, torn)
+        if seconds is not None:
+            start = bisect_left(times, (self.clock.time() if now is None else now) - seconds)
+            times, values = times[start:], values[start:]
+        return times, values
+    
+    def stats(self, code: str, seconds: float = 86400, window: int = 12,
+              now: Optional[float] = None) -> Optional[Dict[str, float]]:
+        """Pencere içi değişim, en düşük/en yüksek, ortalama ve son `window` kaydın hareketli ortalaması"""
+        _, values = self.series(code, seconds, now)
+        if not values:
+            return None
+        
+        first, last = values[0], values[-1]
+        recent = values[-window:]
+        return {
+            'last': last,
+            'change': last - first,
+            'change_pct': (last - first) / first * 100 if first else 0.0,
+            'min': min(values),
+            'max': max(values),
+            'avg': sum(values) / len(values),
+            'moving_avg': sum(recent) / len(recent),
+            'samples': len(values)
+        }
+    
+    def close(self):
+        self._seqs.release()
+        self._times.release()
+        for series in self._series.values():
+            series.release()
+        self._map.close()
+        os.close(self._fd)
+
+class _FileLock:
+    """Tüm dosya üzerinde süreçler arası özel kilit (fcntl yoksa hiçbir şey yapmaz)"""
+    
+    def __init__(self, fd: int):
+        self.fd = fd
+    
+    def __enter__(self):
+        if fcntl is not None:
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+    
+    def __exit__(self, *exc):
+        if fcntl is not None:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
@@ -0,0 +1,175 @@
+"""Hata sınıfına göre geri çekilme ve sohbet/mesaj bazında hata izolasyonu"""
+import logging
+import random
+import threading
+from typing import TYPE_CHECKING, Dict, Optional, Set, Tuple
+
+from .clock import Clock, SystemClock
+from .config import Config
+
+if TYPE_CHECKING:
+    from .database import Database
+
+logger = logging.getLogger(__name__)
+
+# Hata sınıfları
+CONNECTION = 'connection'    # Zaman aşımı, bağlantı kopması
+THROTTLE = 'throttle'        # Instagram "biraz bekleyin"
+AUTH = 'auth'                # Oturum geçersiz
+CLIENT = 'client'            # Diğer Instagram API hataları
+UNEXPECTED = 'unexpected'    # Kod hataları
+
+
+def classify_error(error: BaseException) -> str:
+    """İstisnayı geri çekilme politikası sınıfına eşle"""
+    from instagrapi.exceptions import ClientConnectionError, ClientError, LoginRequired, PleaseWaitFewMinutes
+    from requests.exceptions import ConnectionError, ReadTimeout
+    
+    if isinstance(error, (ReadTimeout, ConnectionError, ClientConnectionError)):
+        return CONNECTION
+    if isinstance(error, PleaseWaitFewMinutes):
+        return THROTTLE
+    if isinstance(error, LoginRequired):
+        return AUTH
+    if isinstance(error, ClientError):
+        return CLIENT
+    return UNEXPECTED
+
+
+class Backoff:
+    """Hata sınıfı başına üstel geri çekilme (eşit jitter'lı).
+    
+    Her sınıfın ardışık hata sayısı ayrı tutulur; başarılı bir turda hepsi
+    sıfırlanır. Gecikme `base * 2^n` ile büyür, `cap` ile sınırlanır ve
+    yarısı rastgele seçilir, böylece yeniden denemeler aynı ana yığılmaz.
+    """
+    
+    def __init__(self, policies: Optional[Dict[str, Tuple[float, float]]] = None):
+        self.policies = policies or Config.BACKOFF_POLICIES
+        self.attempts: Dict[str, int] = {}
+    
+    def failure(self, error_class: str) -> float:
+        """Hatayı kaydet ve beklenecek süreyi döndür"""
+        base, cap = self.policies.get(error_class, self.policies[UNEXPECTED])
+        attempt = self.attempts.get(error_class, 0)
+        self.attempts[error_class] = attempt + 1
+        
+        delay = min(cap, base * (2 ** attempt))
+        return delay / 2 + random.uniform(0, delay / 2)
+    
+    def success(self):
+        self.attempts.clear()
+
+
+class TokenBucket:
+    """Giden Instagram isteklerini biçimlendiren jeton kovası.
+    
+    DM cevapları ve yorum cevapları aynı kovadan jeton alır; böylece toplam
+    gönderim hızı `rate` (saniyede jeton) ile sınırlı kalır, kısa süreli
+    patlamalara `burst` kadar izin verilir.
+    """
+    
+    def __init__(self, rate: Optional[float] = None, burst: Optional[int] = None,
+                 clock: Optional[Clock] = None):
+        self.rate = rate or Config.OUTBOUND_RATE
+        self.burst = burst or Config.OUTBOUND_BURST
+        self.clock = clock or SystemClock()
+        self._tokens = float(self.burst)
+        self._updated = self.clock.time()
+        self._lock = threading.Lock()
+    
+    def _refill(self):
+        now = self.clock.time()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    def try_acquire(self) -> bool:
+        """Jeton varsa al; beklemeden sonucu döndür"""
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+    
+    def acquire(self):
+        """Jeton açılana kadar bekle ve al"""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            self.clock.sleep(wait)
+    
+    @property
+    def available(self) -> float:
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+
+class FailureIsolator:
+    """Tek bir sohbetin ya da mesajın hatası diğer kullanıcıları durdurmasın.
+    
+    Bir mesaj `POISON_THRESHOLD` kez işlenemezse karantinaya alınır
+    (dead_letters tablosu) ve bir daha denenmez. Gönderimi başarısız olan
+    sohbet ise kendi üstel süresi boyunca atlanır.
+    """
+    
+    def __init__(self, db: 'Database'):
+        self.db = db
+        self._failures: Dict[str, int] = {}                       # mesaj id -> hata sayısı
+        self._dead: Set[str] = db.dead_letter_ids()
+        self._thread_backoff: Dict[str, Tuple[int, float]] = {}   # sohbet -> (hata sayısı, tekrar zamanı)
+    
+    def is_quarantined(self, message_id: str) -> bool:
+        return str(message_id) in self._dead
+    
+    def message_failed(self, message_id: str, thread_id: str, user_id: int, text: str,
+                       error: BaseException) -> bool:
+        """Mesaj işleme hatasını kaydet; karantinaya alındıysa True"""
+        count = self._failures.get(message_id, 0) + 1
+        if count < Config.POISON_THRESHOLD:
+            self._failures[message_id] = count
+            return False
+        
+        self._failures.pop(message_id, None)
+        self._dead.add(str(message_id))
+        self.db.add_dead_letter(message_id, thread_id, user_id, text, f"{type(error).__name__}: {error}", count)
+        logger.error(f"Message {message_id} quarantined after {count} failures: {error}")
+        return True
+    
+    def message_succeeded(self, message_id: str):
+        self._failures.pop(message_id, None)
+    
+    def thread_ready(self, thread_id: str) -> bool:
+        state = self._thread_backoff.get(thread_id)
+        return state is None or self.db.clock.time() >= state[1]
+    
+    def thread_failed(self, thread_id: str) -> float:
+        """Sohbet gönderim hatası; sohbetin bekleme süresini döndürür"""
+        count = self._thread_backoff.get(thread_id, (0, 0.0))[0]
+        base, cap = Config.BACKOFF_POLICIES[CLIENT]
+        delay = min(cap, base * (2 ** count))
+        delay = delay / 2 + random.uniform(0, delay / 2)
+        self._thread_backoff[thread_id] = (count + 1, self.db.clock.time() + delay)
+        return delay
+    
+    def backed_off_threads(self) -> int:
+        now = self.db.clock.time()
+        return sum(1 for _, retry_at in self._thread_backoff.values() if retry_at > now)
+    
+    def thread_succeeded(self, thread_id: str):
+        self._thread_backoff.pop(thread_id, None)
+    
+    def dump_state(self) -> Dict:
+        """Kontrol noktası: karantina öncesi hata sayıları ve sohbet bekleme süreleri"""
+        return {'failures': dict(self._failures), 'threads': dict(self._thread_backoff)}
+    
+    def load_state(self, state: Dict):
+        for message_id, count in state['failures'].items():
+            self._failures.setdefault(message_id, count)
+        for thread_id, backoff in state['threads'].items():
+            self._thread_backoff.setdefault(thread_id, backoff)
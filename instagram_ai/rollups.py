@@ -0,0 +1,256 @@
+"""Artımlı toplam sayaçları (liderlik tabloları ve aktivite)"""
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple
+
+if TYPE_CHECKING:
+    from .database import Database
+
+logger = logging.getLogger(__name__)
+
+
+class RollupStore:
+    """Olay anında güncellenen toplam sayaçları; top-K ve zaman dilimi sorguları O(K) okumadır"""
+    
+    # Liderlik tablosu tutulan kullanıcı alanları
+    USER_METRICS = ('message_count', 'game_wins', 'fikra_count', 'bilgi_count')
+    
+    FLUSH_EVERY = 100       # Bekleyen artış sayısı
+    FLUSH_INTERVAL = 5.0    # Saniye
+    
+    def __init__(self, db: 'Database'):
+        self.db = db
+        self._pending_counters: Dict[Tuple[str, str], int] = {}
+        self._pending_activity: Dict[Tuple[str, str], int] = {}
+        self._pending = 0
+        self._seq = 0            # Tampondaki en son günlük olayı
+        self.flushed_seq = 0     # Veritabanına yazılmış en son günlük olayı
+        self._last_flush = db.clock.time()
+        self._lock = threading.Lock()
+        # Küme modunda her rolün ayrı günlüğü var (JOURNAL_DIR/<rol>); su seviyesi günlük başına tutulur
+        self._state_name = f"journal_seq:{os.path.basename(os.path.normpath(db.journal.directory))}"
+        
+        with db.lock:
+            empty = db.conn.execute('SELECT 1 FROM rollup_counters LIMIT 1').fetchone() is None
+            has_users = db.conn.execute('SELECT 1 FROM users LIMIT 1').fetchone() is not None
+            row = db.conn.execute('SELECT value FROM rollup_state WHERE name = ?', (self._state_name,)).fetchone()
+            # Eski sürümlerin tüm rollerce paylaşılan tek su seviyesi hangi günlüğe ait olduğunu bilmez
+            db.conn.execute("DELETE FROM rollup_state WHERE name = 'journal_seq'")
+            db.conn.commit()
+        
+        if empty and has_users:
+            # Sayaçlar hiç oluşmamışsa (eski veritabanı) ham kayıtlardan kur
+            self.rebuild()
+            self._mark(db.journal.seq)
+        elif row is None:
+            # Su seviyesi olmayan eski sayaçlar: günlüğün neresine kadar yazıldıkları bilinmez
+            self._mark(db.journal.seq)
+        else:
+            self._replay(row[0])
+        
+        db.journal.subscribe(self.on_event)
+        db.journal.retain(lambda: self.flushed_seq)
+    
+    def _replay(self, after_seq: int):
+        """Çökme anında tamponda kalmış artışları günlükten yeniden türet"""
+        self.flushed_seq = self._seq = after_seq
+        replayed = 0
+        for event in self.db.journal.replay(after_seq):
+            self.on_event(*event)
+            replayed += 1
+        self.flush()
+        if replayed:
+            logger.info(f"Rollups replayed {replayed} journal events after seq {after_seq}")
+    
+    def _mark(self, seq: int):
+        self.flushed_seq = self._seq = seq
+        with self.db.lock:
+            self._save_seq(seq)
+            self.db.conn.commit()
+    
+    def _save_seq(self, seq: int):
+        self.db.conn.execute(
+            'INSERT OR REPLACE INTO rollup_state (name, value) VALUES (?, ?)', (self._state_name, seq)
+        )
+    
+    @property
+    def pending(self) -> int:
+        """Henüz veritabanına yazılmamış artış sayısı"""
+        return self._pending
+    
+    def on_event(self, seq: int, event_type: str, ts: float, fields: Dict):
+        """Günlük olaylarından sayaçları türet.
+        
+        Artışlar ve olayın sıra numarası aynı kilit altında tamponlanır;
+        böylece yazılan su seviyesi tam olarak yazılan artışları kapsar.
+        """
+        with self._lock:
+            if event_type == 'user_created':
+                self._add_counter('totals', 'users', 1)
+            elif event_type == 'user_stat':
+                self._add_counter(fields['field'], fields['user_id'], fields['increment'])
+                if fields['field'] == 'message_count':
+                    self._add_activity(datetime.fromtimestamp(ts), fields['increment'])
+            elif event_type == 'message_logged' and fields.get('command'):
+                self._add_counter('commands', fields['command'], 1)
+            self._seq = max(self._seq, seq)
+        self._maybe_flush()
+    
+    def incr(self, metric: str, key: Any, amount: int = 1):
+        """Sayaç artışını tamponla"""
+        with self._lock:
+            self._add_counter(metric, key, amount)
+        self._maybe_flush()
+    
+    def record_activity(self, when: datetime, amount: int = 1):
+        """Saatlik ve günlük aktivite kovalarını artır"""
+        with self._lock:
+            self._add_activity(when, amount)
+        self._maybe_flush()
+    
+    def _add_counter(self, metric: str, key: Any, amount: int):
+        if metric not in self.USER_METRICS and metric not in ('totals', 'commands'):
+            return
+        counter_key = (metric, str(key))
+        self._pending_counters[counter_key] = self._pending_counters.get(counter_key, 0) + amount
+        self._pending += 1
+    
+    def _add_activity(self, when: datetime, amount: int):
+        for granularity, bucket in (('hour', when.strftime('%Y-%m-%dT%H')),
+                                    ('day', when.strftime('%Y-%m-%d'))):
+            key = (granularity, bucket)
+            self._pending_activity[key] = self._pending_activity.get(key, 0) + amount
+        self._pending += 1
+    
+    def _maybe_flush(self):
+        if self._pending >= self.FLUSH_EVERY or self.db.clock.time() - self._last_flush >= self.FLUSH_INTERVAL:
+            self.flush()
+    
+    def flush(self):
+        """Bekleyen artışları ve günlük su seviyesini tek işlemde yaz"""
+        with self._lock:
+            counters, self._pending_counters = self._pending_counters, {}
+            activity, self._pending_activity = self._pending_activity, {}
+            seq = self._seq
+            self._pending = 0
+            self._last_flush = self.db.clock.time()
+        
+        if not counters and not activity and seq == self.flushed_seq:
+            return
+        
+        with self.db.lock:
+            self.db.conn.executemany('''
+                INSERT INTO rollup_counters (metric, key, value) VALUES (?, ?, ?)
+                ON CONFLICT(metric, key) DO UPDATE SET value = value + excluded.value
+            ''', [(metric, key, value) for (metric, key), value in counters.items()])
+            self.db.conn.executemany('''
+                INSERT INTO activity_buckets (granularity, bucket, messages) VALUES (?, ?, ?)
+                ON CONFLICT(granularity, bucket) DO UPDATE SET messages = messages + excluded.messages
+            ''', [(gran, bucket, value) for (gran, bucket), value in activity.items()])
+            self._save_seq(seq)
+            self.db.conn.commit()
+        self.flushed_seq = seq
+    
+    def top(self, metric: str, k: int = 5) -> List[Tuple[str, int]]:
+        """En yüksek K sayaç (indeks üzerinden)"""
+        self.flush()
+        with self.db.lock:
+            return self.db.conn.execute('''
+                SELECT key, value FROM rollup_counters
+                WHERE metric = ? ORDER BY value DESC LIMIT ?
+            ''', (metric, k)).fetchall()
+    
+    def top_users(self, metric: str, k: int = 5) -> List[Tuple[int, str, int]]:
+        """Kullanıcı adlarıyla birlikte top-K"""
+        self.flush()
+        with self.db.lock:
+            return self.db.conn.execute('''
+                SELECT r.key, u.username, r.value FROM rollup_counters r
+                LEFT JOIN users u ON u.user_id = CAST(r.key AS INTEGER)
+                WHERE r.metric = ? AND r.value > 0
+                ORDER BY r.value DESC LIMIT ?
+            ''', (metric, k)).fetchall()
+    
+    def total(self, metric: str, key: Any) -> int:
+        """Tek bir sayacın değeri (bekleyen artışlar dahil)"""
+        with self._lock:
+            pending = self._pending_counters.get((metric, str(key)), 0)
+        with self.db.lock:
+            row = self.db.conn.execute(
+                'SELECT value FROM rollup_counters WHERE metric = ? AND key = ?', (metric, str(key))
+            ).fetchone()
+        return (row[0] if row else 0) + pending
+    
+    def activity(self, granularity: str = 'hour', limit: int = 24) -> List[Tuple[str, int]]:
+        """Son `limit` saatlik/günlük kova (yeniden eskiye)"""
+        self.flush()
+        with self.db.lock:
+            return self.db.conn.execute('''
+                SELECT bucket, messages FROM activity_buckets
+                WHERE granularity = ? ORDER BY bucket DESC LIMIT ?
+            ''', (granularity, limit)).fetchall()
+    
+    def rebuild(self):
+        """Tüm toplamları artımlı yolun kaynaklarından yeniden hesapla.
+        
+        Kullanıcı sayaçları `users` sütunlarından okunur; bunlar `user_stat`
+        olaylarının toplamıdır. Komutlar `messages`'tan okunur; `message_logged`
+        olayıyla aynı anda yazılır. Aktivite, artımlı yoldaki gibi günlükteki
+        `message_count` artışlarından sayılır. Yalnızca günlükten eski
+        dönemler için `messages` satırlarına bakılır; bu dönemde mesaj
+        günlüğü atlanmadığından ikisi aynı sayıyı verir.
+        """
+        with self._lock:
+            self._pending_counters.clear()
+            self._pending_activity.clear()
+            self._pending = 0
+        
+        activity: Dict[Tuple[str, str], int] = {}
+        journal_start = None
+        for _, event_type, ts, fields in self.db.journal.replay(0):
+            if journal_start is None:
+                journal_start = datetime.fromtimestamp(ts).isoformat()
+            if event_type == 'user_stat' and fields['field'] == 'message_count':
+                when = datetime.fromtimestamp(ts)
+                for granularity, bucket in (('hour', when.strftime('%Y-%m-%dT%H')),
+                                            ('day', when.strftime('%Y-%m-%d'))):
+                    activity[granularity, bucket] = activity.get((granularity, bucket), 0) + fields['increment']
+        
+        with self.db.lock:
+            conn = self.db.conn
+            conn.execute('DELETE FROM rollup_counters')
+            conn.execute('DELETE FROM activity_buckets')
+            
+            for metric in self.USER_METRICS:
+                conn.execute(f'''
+                    INSERT INTO rollup_counters (metric, key, value)
+                    SELECT ?, CAST(user_id AS TEXT), {metric} FROM users WHERE {metric} > 0
+                ''', (metric,))
+            
+            conn.execute('''
+                INSERT INTO rollup_counters (metric, key, value)
+                SELECT 'totals', 'users', COUNT(*) FROM users
+            ''')
+            conn.execute('''
+                INSERT INTO rollup_counters (metric, key, value)
+                SELECT 'commands', command, COUNT(*) FROM messages
+                WHERE command IS NOT NULL GROUP BY command
+            ''')
+            
+            # Günlükten önceki dönem (günlük boşsa tamamı)
+            for granularity, length in (('hour', 13), ('day', 10)):
+                for bucket, messages in conn.execute('''
+                    SELECT substr(timestamp, 1, ?), COUNT(*) FROM messages
+                    WHERE ? IS NULL OR timestamp < ? GROUP BY substr(timestamp, 1, ?)
+                ''', (length, journal_start, journal_start, length)).fetchall():
+                    activity[granularity, bucket] = activity.get((granularity, bucket), 0) + messages
+            
+            conn.executemany(
+                'INSERT INTO activity_buckets (granularity, bucket, messages) VALUES (?, ?, ?)',
+                [(granularity, bucket, value) for (granularity, bucket), value in activity.items()]
+            )
+            conn.commit()
+        
+        logger.info("Rollup counters rebuilt from users, messages and the journal")
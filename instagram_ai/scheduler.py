@@ -0,0 +1,176 @@
+"""Adil paylaşımlı zamanlama: öncelik sınıfları ve sınıf içinde kullanıcı başına deficit round-robin"""
+import logging
+from collections import deque
+from typing import TYPE_CHECKING, Any, Deque, Dict, Iterator, Optional, Tuple
+
+from .clock import Clock, SystemClock
+from .commands import CostClass
+from .config import Config
+
+if TYPE_CHECKING:
+    from .bot import InstagramAIBot
+
+logger = logging.getLogger(__name__)
+
+# Öncelik sınıfları (yüksekten düşüğe)
+ADMIN = 'admin'        # ADMIN_IDS'ten gelen mesajlar
+CHEAP = 'cheap'        # Bellek/veritabanından cevaplanan komutlar ve sohbet
+NETWORK = 'network'    # Harici API bekleyen komutlar (hava, haber, döviz)
+PRIORITIES = (ADMIN, CHEAP, NETWORK)
+
+MIN_COST = 0.001       # Henüz ölçülmemiş komutun tahmini süresi (saniye)
+
+
+def classify(bot: 'InstagramAIBot', user_id: int, text: str) -> Tuple[str, float]:
+    """Mesajın öncelik sınıfı ve tahmini işleme süresi (komut metriklerinden).
+    
+    Yalnızca bellek içi eşleştirme yapılır; veritabanına ya da ağa gidilmez.
+    """
+    if user_id in Config.ADMIN_IDS:
+        return ADMIN, MIN_COST
+    
+    message = (text or "").lower().strip()
+    spec = bot.commands.match_prefix(message) or bot.commands.match(message)
+    if spec is None:
+        return CHEAP, MIN_COST
+    
+    metrics = bot.commands.metrics.get(spec.name)
+    cost = max(metrics.avg_time if metrics else 0.0, MIN_COST)
+    return (NETWORK if spec.cost is CostClass.NETWORK else CHEAP), cost
+
+
+class _UserQueues:
+    """Bir öncelik sınıfındaki kullanıcı kuyrukları; kullanıcılar arasında DRR.
+    
+    Sıra başına gelen kullanıcının hakkı `quantum * ağırlık` kadar artar ve
+    hakkı yettiği sürece kuyruğunun başındaki işler (maliyetleri tahmini
+    işleme süresidir) alınır; yetmezse sıra sonraki kullanıcıya geçer. Ağır
+    komutlar gönderen kullanıcı böylece diğerlerinden fazla süre alamaz.
+    """
+    
+    def __init__(self, quantum: float):
+        self.quantum = quantum
+        self.queues: Dict[int, Deque[Tuple[float, float, Any]]] = {}  # kullanıcı -> (giriş zamanı, maliyet, iş)
+        self.deficit: Dict[int, float] = {}
+        self.weights: Dict[int, float] = {}
+        self.active: Deque[int] = deque()
+        self.size = 0
+        self._credited = False  # Sıradaki kullanıcı bu turun hakkını aldı mı
+    
+    def push(self, user_id: int, item: Any, cost: float, weight: float, now: float):
+        queue = self.queues.get(user_id)
+        if queue is None:
+            queue = self.queues[user_id] = deque()
+            self.deficit[user_id] = 0.0
+            self.active.append(user_id)
+        self.weights[user_id] = weight
+        queue.append((now, cost, item))
+        self.size += 1
+    
+    def oldest(self) -> Tuple[float, int]:
+        """(en eski işin giriş zamanı, kullanıcısı)"""
+        return min((queue[0][0], user_id) for user_id, queue in self.queues.items())
+    
+    def pop(self) -> Tuple[float, Any]:
+        while True:
+            user_id = self.active[0]
+            if not self._credited:
+                self.deficit[user_id] += self.quantum * self.weights[user_id]
+                self._credited = True
+            
+            if self.queues[user_id][0][1] <= self.deficit[user_id]:
+                return self._take(user_id)
+            
+            self.active.rotate(-1)
+            self._credited = False
+    
+    def pop_user(self, user_id: int) -> Tuple[float, Any]:
+        """Kullanıcının sıradaki işini DRR sırasını beklemeden al (açlık koruması)"""
+        return self._take(user_id)
+    
+    def _take(self, user_id: int) -> Tuple[float, Any]:
+        queue = self.queues[user_id]
+        enqueued_at, cost, item = queue.popleft()
+        self.deficit[user_id] -= cost
+        self.size -= 1
+        
+        if not queue:
+            # Kuyruğu boşalan kullanıcının artan hakkı saklanmaz
+            del self.queues[user_id], self.deficit[user_id], self.weights[user_id]
+            if self.active[0] == user_id:
+                self._credited = False
+            self.active.remove(user_id)
+        return enqueued_at, item
+    
+    def __len__(self) -> int:
+        return self.size
+
+class FairScheduler:
+    """Öncelik sınıfları arasında ağırlıklı sıra, sınıf içinde kullanıcılar arasında DRR.
+    
+    Sınıflar `SCHEDULER_WEIGHTS` oranında hizmet alır: doluyken yönetici,
+    ucuz ve ağ sınıfları ör. 16:8:1 oranında seçilir, böylece ağ komutları
+    ucuz cevapları geciktirmez ama hiçbir zaman tamamen durmaz. Ayrıca
+    `SCHEDULER_MAX_WAIT` saniyeden uzun bekleyen iş, sınıfından bağımsız
+    olarak önce alınır.
+    """
+    
+    def __init__(self, weights: Optional[Dict[str, int]] = None, quantum: Optional[float] = None,
+                 max_wait: Optional[float] = None, clock: Optional[Clock] = None):
+        self.weights = weights or Config.SCHEDULER_WEIGHTS
+        self.max_wait = max_wait if max_wait is not None else Config.SCHEDULER_MAX_WAIT
+        self.clock = clock or SystemClock()
+        quantum = quantum or Config.SCHEDULER_QUANTUM
+        self.classes = {priority: _UserQueues(quantum) for priority in PRIORITIES}
+        self._credits = dict(self.weights)
+        self.stats = {priority: {'served': 0, 'promoted': 0, 'max_wait': 0.0} for priority in PRIORITIES}
+    
+    def push(self, user_id: int, item: Any, priority: str = CHEAP, cost: float = MIN_COST,
+             weight: float = 1.0):
+        """İşi kullanıcının sınıf kuyruğuna ekle; `weight` kullanıcının sınıf içi payı"""
+        self.classes[priority].push(user_id, item, cost, weight, self.clock.time())
+    
+    def pop(self) -> Optional[Tuple[str, Any]]:
+        """Sıradaki (öncelik sınıfı, iş); kuyruk boşsa None"""
+        candidates = [priority for priority in PRIORITIES if self.classes[priority].size]
+        if not candidates:
+            return None
+        now = self.clock.time()
+        
+        # Açlık koruması: çok bekleyen iş önce
+        if self.max_wait:
+            for priority in candidates:
+                enqueued_at, user_id = self.classes[priority].oldest()
+                if now - enqueued_at >= self.max_wait:
+                    self.stats[priority]['promoted'] += 1
+                    return self._served(priority, now, *self.classes[priority].pop_user(user_id))
+        
+        # Ağırlıklı sınıf seçimi: hakkı kalan en yüksek öncelikli sınıf; hepsi bittiyse haklar yenilenir
+        if all(self._credits[priority] <= 0 for priority in candidates):
+            self._credits = dict(self.weights)
+        priority = next(priority for priority in candidates if self._credits[priority] > 0)
+        self._credits[priority] -= 1
+        return self._served(priority, now, *self.classes[priority].pop())
+    
+    def _served(self, priority: str, now: float, enqueued_at: float, item: Any) -> Tuple[str, Any]:
+        stats = self.stats[priority]
+        stats['served'] += 1
+        stats['max_wait'] = max(stats['max_wait'], now - enqueued_at)
+        return priority, item
+    
+    def clear(self):
+        """Bekleyen işleri at (ör. tur yarıda kesildiğinde; sayaçlar korunur)"""
+        quantum = self.classes[ADMIN].quantum
+        self.classes = {priority: _UserQueues(quantum) for priority in PRIORITIES}
+        self._credits = dict(self.weights)
+    
+    def drain(self) -> Iterator[Tuple[str, Any]]:
+        """Kuyruk boşalana kadar işleri sırayla ver (işlenirken eklenenler de dahil)"""
+        while True:
+            entry = self.pop()
+            if entry is None:
+                return
+            yield entry
+    
+    def __len__(self) -> int:
+        return sum(len(queues) for queues in self.classes.values())
@@ -0,0 +1,110 @@
+"""Güvenlik yönetimi"""
+import logging
+import re
+from typing import Dict, Optional
+
+from .clock import Clock
+from .config import Config
+from .counters import LocalCounters, SharedCounters
+from .database import Database
+
+logger = logging.getLogger(__name__)
+
+
+class Blocklist:
+    """Engelli kullanıcıların bellek içi kümesi; kontrol veritabanına dokunmadan O(1).
+    
+    Başlangıçta users.is_blocked'dan yüklenir, sonrasında günlükteki
+    'user_blocked' olaylarıyla güncel tutulur; böylece Database.block_user'ı
+    kim çağırırsa çağırsın küme senkron kalır.
+    """
+    
+    def __init__(self, db: Database):
+        self.db = db
+        self._blocked: Dict[int, Optional[float]] = db.get_blocked_users()
+        db.journal.subscribe(self.on_event)
+    
+    def on_event(self, seq: int, event_type: str, ts: float, fields: Dict):
+        if event_type != 'user_blocked':
+            return
+        if fields.get('blocked', True):
+            self._blocked[fields['user_id']] = fields.get('until')
+        else:
+            self._blocked.pop(fields['user_id'], None)
+    
+    def is_blocked(self, user_id: int) -> bool:
+        if user_id not in self._blocked:
+            return False
+        
+        until = self._blocked.get(user_id)
+        if until is None or until > self.db.clock.time():
+            return True
+        
+        # Süresi dolmuş engel: ilk görüldüğünde kaldırılır
+        self.db.block_user(user_id, False)
+        logger.info(f"Block expired for user {user_id}")
+        return False
+    
+    def reload(self):
+        """Veritabanından yeniden yükle (engeli başka bir süreç değiştirdiyse)"""
+        self._blocked = self.db.get_blocked_users()
+    
+    def entries(self) -> Dict[int, Optional[float]]:
+        return dict(self._blocked)
+    
+    def __len__(self) -> int:
+        return len(self._blocked)
+
+class SecurityManager:
+    """Güvenlik yönetimi"""
+    
+    def __init__(self, db: Database, clock: Optional[Clock] = None):
+        self.db = db
+        self.clock = clock or db.clock
+        self.blocklist = Blocklist(db)
+        
+        # Kuyruk modunda birden çok işçi aynı sayaçları paylaşır
+        self.counters = SharedCounters(clock=self.clock) if Config.SHARED_COUNTERS else LocalCounters(self.clock)
+    
+    def check_rate_limit(self, user_id: int) -> bool:
+        """Rate limit kontrolü"""
+        return self.counters.allow(user_id, Config.MAX_MESSAGES_PER_MINUTE)
+    
+    def detect_spam(self, user_id: int, message: str) -> bool:
+        """Spam tespiti"""
+        # Basit spam tespiti
+        spam_patterns = [
+            r"(http|https)://",
+            r"\.com|\.net|\.org",
+            r"@\w+",
+            r"[A-Z]{5,}",  # Çok fazla büyük harf
+        ]
+        
+        for pattern in spam_patterns:
+            if re.search(pattern, message, re.IGNORECASE):
+                if self.counters.add_spam(user_id) > Config.BLOCK_THRESHOLD:
+                    self.block_user(user_id, Config.SPAM_BLOCK_DURATION)
+                    logger.warning(f"User {user_id} blocked for spam")
+                    return True
+        
+        return False
+    
+    def block_user(self, user_id: int, duration: Optional[float] = None):
+        """Kullanıcıyı engelle; `duration` saniye verilirse engel kendiliğinden kalkar"""
+        self.db.block_user(user_id, True, self.clock.time() + duration if duration else None)
+    
+    def unblock_user(self, user_id: int):
+        """Engeli kaldır"""
+        self.db.block_user(user_id, False)
+        self.counters.reset(user_id)
+    
+    def is_user_blocked(self, user_id: int) -> bool:
+        """Kullanıcı engelli mi? (bellekten, veritabanı sorgusu yok)"""
+        return self.blocklist.is_blocked(user_id)
+    
+    def dump_state(self) -> Optional[Dict]:
+        """Kontrol noktası: hız/spam sayaçları (engeller veritabanında)"""
+        return self.counters.dump_state()
+    
+    def load_state(self, state: Dict):
+        self.counters.load_state(state)
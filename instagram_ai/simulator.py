@@ -0,0 +1,339 @@
+"""Sanal saatle ayrık olay simülasyonu: sentetik DM trafiğini botun gerçek döngüsünden geçirir.
+
+Instagram yerine `FakeClient` kullanılır; bot `VirtualClock` ile çalıştığı
+için bekleme süreleri, geri çekilmeler, hız sınırı pencereleri ve oturum
+ömürleri anında akar. Günlerce süren trafik saniyeler içinde oynatılır ve
+cevap süresi, API çağrıları ve kısıtlama olayları raporlanır.
+"""
+import heapq
+import math
+import os
+import random
+import statistics
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+from .clock import VirtualClock
+from .config import Config
+
+if TYPE_CHECKING:
+    from .bot import InstagramAIBot
+
+# Ağ gerektirmeyen komutlar ve sohbet mesajları: (metin, ağırlık)
+DEFAULT_MIX: Sequence[Tuple[str, float]] = (
+    ('merhaba', 3), ('nasılsın', 1), ('teşekkürler', 1), ('yardım', 1),
+    ('fıkra', 2), ('bilgi', 2), ('söz', 1), ('yemek', 1), ('saat', 1),
+    ('zar at', 1), ('yazı tura', 1), ('istatistik', 1), ('bot', 1),
+    ('bugün çok sıkıldım', 1)
+)
+
+# Gönderi yorumları: çoğu cevap beklemeyen sohbet yorumu
+COMMENT_MIX: Sequence[Tuple[str, float]] = (
+    ('harika olmuş 😍', 4), ('çok güzel', 3), ('fıkra', 1), ('bilgi', 1), ('söz', 1), ('saat', 1)
+)
+
+
+@dataclass
+class SimMessage:
+    """Simülasyondaki tek kullanıcı mesajı"""
+    id: str
+    user_id: int
+    thread_id: str
+    text: str
+    sent_at: float
+    replied_at: Optional[float] = None
+
+@dataclass
+class SimMedia:
+    """Hesabın bir gönderisi ve yorumları (pk sırasıyla)"""
+    id: str
+    taken_at: float
+    comments: List[Any] = field(default_factory=list)
+    pending: Dict[str, SimMessage] = field(default_factory=dict)
+
+@dataclass
+class SimThread:
+    """Bir kullanıcıyla sohbet; yalnızca son mesaj ve cevaplanmamış mesajlar tutulur"""
+    id: str
+    username: str
+    last: Any = None
+    pending: List[SimMessage] = field(default_factory=list)
+    last_activity: float = 0.0
+
+
+def generate_traffic(users: int, messages_per_day: float, days: float, start: float,
+                     mix: Sequence[Tuple[str, float]] = DEFAULT_MIX,
+                     rng: Optional[random.Random] = None) -> List[SimMessage]:
+    """Kullanıcı başına gün içi dalgalanan Poisson trafiği üret (zamana göre sıralı).
+    
+    Her varış 1-3 mesajlık kısa bir konuşmadır; yoğunluk öğleden sonra en
+    yüksek, gece en düşük olacak şekilde sinüsle değişir (inceltme yöntemi).
+    """
+    rng = rng or random.Random()
+    texts, weights = zip(*mix)
+    peak = messages_per_day / 86400 * 1.8 / 2  # konuşma başına ortalama 2 mesaj
+    end = start + days * 86400
+    messages = []
+    
+    for user_id in range(1000, 1000 + users):
+        thread_id = f"thread-{user_id}"
+        t = start
+        while True:
+            t += rng.expovariate(peak)
+            if t >= end:
+                break
+            hour = (t % 86400) / 3600
+            if rng.random() > (1 + 0.8 * math.sin((hour - 9) / 24 * 2 * math.pi)) / 1.8:
+                continue
+            
+            sent_at = t
+            for _ in range(rng.randint(1, 3)):
+                text = rng.choices(texts, weights)[0]
+                messages.append(SimMessage(f"m{len(messages)}", user_id, thread_id, text, sent_at))
+                sent_at += rng.uniform(5, 60)
+    
+    messages.sort(key=lambda m: m.sent_at)
+    return messages
+
+
+class FakeClient:
+    """instagrapi.Client yerine geçen, sanal saate bağlı sahte istemci.
+    
+    `direct_threads` çağrıldığı ana kadar gönderilmiş mesajları görünür kılar.
+    `comments` ile verilen yorumlar (thread_id alanı gönderi id'sidir) aynı
+    şekilde gönderi listesi ya da yorum sayfası istendiğinde görünür olur.
+    Son bir saatteki API çağrısı `api_limit`'i aşarsa Instagram gibi
+    PleaseWaitFewMinutes fırlatır.
+    """
+    
+    user_id = 1
+    
+    def __init__(self, clock: VirtualClock, messages: List[SimMessage], api_limit: int = 0,
+                 until: Optional[float] = None, comments: Optional[List[SimMessage]] = None):
+        self.clock = clock
+        self.api_limit = api_limit
+        self.until = until
+        self.on_finish = None
+        
+        self._incoming = messages
+        self._next = 0
+        self.threads: Dict[str, SimThread] = {}
+        self._calls: Deque[float] = deque()
+        
+        self._comments = comments or []
+        self._next_comment = 0
+        self.medias: Dict[str, SimMedia] = {}
+        
+        self.api_calls: Dict[str, int] = {'direct_threads': 0, 'direct_send': 0, 'user_medias_v1': 0,
+                                          'media_comments_chunk': 0, 'media_comment': 0}
+        self.throttle_events = 0
+        self.superseded = 0
+    
+    def _api_call(self, name: str):
+        from instagrapi.exceptions import PleaseWaitFewMinutes
+        
+        now = self.clock.time()
+        self.api_calls[name] += 1
+        while self._calls and now - self._calls[0] >= 3600:
+            self._calls.popleft()
+        if self.api_limit and len(self._calls) >= self.api_limit:
+            self.throttle_events += 1
+            raise PleaseWaitFewMinutes("Please wait a few minutes before you try again.")
+        self._calls.append(now)
+    
+    def _deliver(self):
+        """Şu ana kadar gönderilmiş mesajları sohbetlere ekle"""
+        now = self.clock.time()
+        while self._next < len(self._incoming) and self._incoming[self._next].sent_at <= now:
+            msg = self._incoming[self._next]
+            self._next += 1
+            
+            thread = self.threads.get(msg.thread_id)
+            if thread is None:
+                thread = self.threads[msg.thread_id] = SimThread(msg.thread_id, f"user{msg.user_id}")
+            thread.last = SimpleNamespace(id=msg.id, user_id=msg.user_id, text=msg.text)
+            thread.pending.append(msg)
+            thread.last_activity = msg.sent_at
+    
+    def direct_threads(self, amount: int = 20) -> List[SimpleNamespace]:
+        if self.until is not None and self.clock.time() >= self.until and self.on_finish:
+            self.on_finish()
+            return []
+        
+        self._api_call('direct_threads')
+        self._deliver()
+        
+        recent = heapq.nlargest(amount, self.threads.values(), key=lambda thread: thread.last_activity)
+        return [
+            SimpleNamespace(id=thread.id, users=[SimpleNamespace(username=thread.username)],
+                            messages=[thread.last])
+            for thread in recent
+        ]
+    
+    def direct_send(self, text: str, thread_ids: List[str]):
+        self._api_call('direct_send')
+        now = self.clock.time()
+        
+        for thread_id in thread_ids:
+            thread = self.threads[thread_id]
+            # Bot yalnızca son mesajı görür; öncekiler aynı cevapla karşılanmış sayılır
+            self.superseded += max(0, len(thread.pending) - 1)
+            for msg in thread.pending:
+                msg.replied_at = now
+            thread.pending.clear()
+            thread.last = SimpleNamespace(id=f"r{self.api_calls['direct_send']}", user_id=self.user_id, text=text)
+            thread.last_activity = now
+        
+        return SimpleNamespace(id=f"r{self.api_calls['direct_send']}")
+    
+    # ---- Gönderiler ve yorumlar ----
+    
+    def add_media(self, media_id: str, taken_at: Optional[float] = None) -> SimMedia:
+        media = self.medias[media_id] = SimMedia(media_id, self.clock.time() if taken_at is None else taken_at)
+        return media
+    
+    def add_comment(self, media_id: str, user_id: int, text: str, username: Optional[str] = None) -> SimpleNamespace:
+        """Gönderiye hemen görünür bir yorum ekle"""
+        media = self.medias.get(media_id) or self.add_media(media_id)
+        comment = SimpleNamespace(
+            pk=str(sum(len(m.comments) for m in self.medias.values()) + 1), text=text,
+            user=SimpleNamespace(pk=str(user_id), username=username or f"user{user_id}")
+        )
+        media.comments.append(comment)
+        return comment
+    
+    def _deliver_comments(self):
+        now = self.clock.time()
+        while (self._next_comment < len(self._comments) and
+               self._comments[self._next_comment].sent_at <= now):
+            msg = self._comments[self._next_comment]
+            self._next_comment += 1
+            comment = self.add_comment(msg.thread_id, msg.user_id, msg.text)
+            self.medias[msg.thread_id].pending[comment.pk] = msg
+    
+    def user_medias_v1(self, user_id: int, amount: int = 0) -> List[SimpleNamespace]:
+        self._api_call('user_medias_v1')
+        self._deliver_comments()
+        
+        recent = sorted(self.medias.values(), key=lambda media: media.taken_at, reverse=True)
+        return [
+            SimpleNamespace(id=media.id, comment_count=len(media.comments),
+                            taken_at=datetime.fromtimestamp(media.taken_at, timezone.utc))
+            for media in recent[:amount or None]
+        ]
+    
+    def media_comments_chunk(self, media_id: str, max_amount: int,
+                             min_id: Optional[str] = None) -> Tuple[List[SimpleNamespace], Optional[str]]:
+        """İmleçten (son okunan yorumun pk'si) sonraki yorumlar; imleç yoksa en yeni sayfa"""
+        self._api_call('media_comments_chunk')
+        self._deliver_comments()
+        
+        comments = self.medias[media_id].comments
+        if min_id is None:
+            page = comments[-max_amount:]
+        else:
+            page = [c for c in comments if int(c.pk) > int(min_id)][:max_amount]
+        return list(page), page[-1].pk if page else min_id
+    
+    def media_comment(self, media_id: str, text: str, replied_to_comment_id: Optional[str] = None):
+        self._api_call('media_comment')
+        msg = self.medias[media_id].pending.pop(str(replied_to_comment_id), None)
+        if msg is not None:
+            msg.replied_at = self.clock.time()
+        return self.add_comment(media_id, self.user_id, text, 'bot')
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+class Simulator:
+    """Botu sanal saat ve sahte istemciyle `days` gün boyunca çalıştır.
+    
+    Botun kendi `run()` döngüsü kullanılır; böylece ölçülen şey gerçek
+    kontrol aralığı, geri çekilme ve hız sınırı politikalarıdır. Veritabanı
+    ve günlük `workdir` içine yazılır.
+    """
+    
+    def __init__(self, workdir: str, users: int = 100, messages_per_day: float = 10.0, days: float = 1.0,
+                 api_limit: int = 200, seed: Optional[int] = None,
+                 mix: Sequence[Tuple[str, float]] = DEFAULT_MIX, comments_per_day: float = 0.0,
+                 media: int = 6):
+        self.workdir = workdir
+        self.users = users
+        self.messages_per_day = messages_per_day
+        self.days = days
+        self.api_limit = api_limit
+        self.rng = random.Random(seed)
+        self.mix = mix
+        self.comments_per_day = comments_per_day
+        self.media = media
+    
+    def run(self) -> Dict[str, Any]:
+        """Simülasyonu çalıştır ve ölçümleri döndür"""
+        from .bot import InstagramAIBot
+        
+        Config.DB_FILE = os.path.join(self.workdir, 'sim.db')
+        Config.JOURNAL_DIR = os.path.join(self.workdir, 'journal')
+        Config.CHECKPOINT_FILE = os.path.join(self.workdir, 'sim.ckpt')
+        
+        clock = VirtualClock()
+        start = clock.time()
+        end = start + self.days * 86400
+        messages = generate_traffic(self.users, self.messages_per_day, self.days, start, self.mix, self.rng)
+        comments = []
+        if self.comments_per_day:
+            comments = generate_traffic(self.users, self.comments_per_day, self.days, start, COMMENT_MIX, self.rng)
+            for comment in comments:
+                comment.thread_id = f"media-{self.rng.randrange(self.media)}"
+        
+        bot = InstagramAIBot(clock)
+        client = FakeClient(clock, messages, self.api_limit, until=end, comments=comments)
+        for i in range(self.media):
+            client.add_media(f"media-{i}", start - (i + 1) * 86400)
+        client.on_finish = lambda: setattr(bot, 'is_running', False)
+        bot.__dict__['client'] = client
+        bot.login = lambda: True
+        
+        wall_start = time.perf_counter()
+        bot.run(control_socket=False)
+        wall = time.perf_counter() - wall_start
+        
+        return self.report(bot, client, messages, end, wall, comments)
+    
+    def report(self, bot: 'InstagramAIBot', client: FakeClient, messages: List[SimMessage],
+               end: float, wall: float, comments: Sequence[SimMessage] = ()) -> Dict[str, Any]:
+        delivered = [msg for msg in messages if msg.sent_at < end]
+        latencies = [msg.replied_at - msg.sent_at for msg in delivered if msg.replied_at is not None]
+        comment_latencies = [c.replied_at - c.sent_at for c in comments if c.sent_at < end and c.replied_at is not None]
+        
+        return {
+            'days': self.days,
+            'users': self.users,
+            'check_interval': list(Config.CHECK_INTERVAL),
+            'api_limit': self.api_limit,
+            'messages': len(delivered),
+            'replied': len(latencies),
+            'unreplied': len(delivered) - len(latencies),
+            'superseded': client.superseded,
+            'time_to_reply': {
+                'mean_s': round(statistics.mean(latencies), 1) if latencies else 0.0,
+                'p50_s': round(_percentile(latencies, 0.5), 1),
+                'p95_s': round(_percentile(latencies, 0.95), 1),
+                'max_s': round(max(latencies, default=0.0), 1)
+            },
+            'comments': sum(1 for c in comments if c.sent_at < end),
+            'comment_replies': len(comment_latencies),
+            'comment_reply_p95_s': round(_percentile(comment_latencies, 0.95), 1),
+            'api_calls': dict(client.api_calls),
+            'throttle_events': client.throttle_events,
+            'command_rate_limited': sum(m.rate_limited for m in bot.commands.metrics.values()),
+            'wall_s': round(wall, 2)
+        }
@@ -0,0 +1,92 @@
+"""Önceden derlenmiş statik ve yarı statik cevaplar"""
+import importlib
+import logging
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+from .commands import CommandRegistry
+from .utils import Utilities
+
+logger = logging.getLogger(__name__)
+
+
+class Response(str):
+    """Gönderim parçaları önceden hesaplanmış cevap metni"""
+    
+    chunks: Tuple[str, ...] = ()
+
+class ResponseTemplate:
+    """Derlenmiş cevap şablonu; yalnızca `{ad}` yuvaları istek başına doldurulur"""
+    
+    __slots__ = ('name', 'text', 'slots', 'response')
+    
+    def __init__(self, name: str, text: str, slots: Tuple[str, ...] = ()):
+        self.name = name
+        self.text = text
+        self.slots = slots
+        self.response: Optional[Response] = None
+        
+        if not slots:
+            # Tamamen statik: metin ve parçaları bir kez hazırlanır
+            self.response = Response(text)
+            self.response.chunks = tuple(Utilities.split_message(text))
+    
+    def render(self, **values) -> str:
+        if self.response is not None:
+            return self.response
+        return self.text.format_map(values)
+
+class ResponseTemplates:
+    """Şablon deposu; komut kayıt defteri değiştiğinde şablonlar yeniden derlenir"""
+    
+    def __init__(self, registry: CommandRegistry):
+        self.registry = registry
+        self._builders: Dict[str, Tuple[str, str, Tuple[str, ...]]] = {}
+        self._compiled: Dict[str, ResponseTemplate] = {}
+        self._version = -1
+        self._lock = threading.Lock()
+        self.builds = 0
+    
+    def declare(self, name: str, module: str, builder_name: str, slots: Tuple[str, ...] = ()):
+        """Şablon tanımla; `module.builder_name(registry)` metni üretir"""
+        with self._lock:
+            self._builders[name] = (module, builder_name, slots)
+            self._compiled.pop(name, None)
+    
+    def get(self, name: str) -> ResponseTemplate:
+        """Derlenmiş şablonu döndür; kayıt defteri sürümü değiştiyse önce geçersiz kıl"""
+        if self._version != self.registry.version:
+            with self._lock:
+                if self._version != self.registry.version:
+                    self._compiled.clear()
+                    self._version = self.registry.version
+        
+        template = self._compiled.get(name)
+        if template is None:
+            with self._lock:
+                template = self._compiled.get(name)
+                if template is None:
+                    template = self._compiled[name] = self._build(name)
+        return template
+    
+    def render(self, name: str, **values) -> str:
+        return self.get(name).render(**values)
+    
+    def invalidate(self):
+        with self._lock:
+            self._compiled.clear()
+    
+    def _build(self, name: str) -> ResponseTemplate:
+        module, builder_name, slots = self._builders[name]
+        builder: Callable[[CommandRegistry], str] = getattr(importlib.import_module(module), builder_name)
+        self.builds += 1
+        logger.debug(f"Response template built: {name}")
+        return ResponseTemplate(name, builder(self.registry), slots)
+
+def create_templates(registry: CommandRegistry) -> ResponseTemplates:
+    """Yerleşik şablonları tanımlanmış yeni bir şablon deposu oluştur"""
+    from .plugins import register_templates
+    
+    templates = ResponseTemplates(registry)
+    register_templates(templates)
+    return templates
@@ -0,0 +1,71 @@
+"""Zamanlayıcılar"""
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+
+class TimerWheel:
+    """Karma zamanlayıcı çarkı: O(1) ekleme/iptal, her tikte yalnızca ilgili yuva taranır"""
+    
+    def __init__(self, tick: float = 1.0, slots: int = 512, start: Optional[float] = None):
+        self.tick = tick
+        self.slots: List[set] = [set() for _ in range(slots)]
+        self._deadlines: Dict[Any, float] = {}
+        self._current = int((time.time() if start is None else start) // tick)
+        self._lock = threading.Lock()
+    
+    def _slot(self, deadline: float) -> set:
+        # Geçmişteki son tarihler bir sonraki advance'ta bulunsun diye mevcut tike çekilir
+        index = max(int(deadline // self.tick), self._current)
+        return self.slots[index % len(self.slots)]
+    
+    def schedule(self, key: Any, deadline: float):
+        """Anahtarı son tarihiyle ekle (varsa yeniden planla)"""
+        with self._lock:
+            old = self._deadlines.get(key)
+            if old is not None:
+                self._slot(old).discard(key)
+            self._deadlines[key] = deadline
+            self._slot(deadline).add(key)
+    
+    def cancel(self, key: Any) -> bool:
+        """Planlanmış anahtarı kaldır"""
+        with self._lock:
+            deadline = self._deadlines.pop(key, None)
+            if deadline is None:
+                return False
+            self._slot(deadline).discard(key)
+            return True
+    
+    def deadline(self, key: Any) -> Optional[float]:
+        return self._deadlines.get(key)
+    
+    def __contains__(self, key: Any) -> bool:
+        return key in self._deadlines
+    
+    def __len__(self) -> int:
+        return len(self._deadlines)
+    
+    def advance(self, now: Optional[float] = None) -> List[Any]:
+        """Zamanı ilerlet, süresi dolan anahtarları çıkarıp döndür"""
+        now = time.time() if now is None else now
+        target = int(now // self.tick)
+        expired = []
+        
+        with self._lock:
+            if target < self._current:
+                return expired
+            
+            # Çarkın turundan uzun boşluklarda her yuva en fazla bir kez taranır
+            steps = min(target - self._current + 1, len(self.slots))
+            for offset in range(steps):
+                slot = self.slots[(self._current + offset) % len(self.slots)]
+                due = [key for key in slot if self._deadlines[key] <= now]
+                for key in due:
+                    slot.discard(key)
+                    del self._deadlines[key]
+                expired.extend(due)
+            
+            self._current = target
+        
+        return expired
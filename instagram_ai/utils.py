@@ -0,0 +1,114 @@
+"""Yardımcı fonksiyonlar"""
+import threading
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from .clock import Clock, SystemClock
+
+
+class LazyAttribute:
+    """İlk erişimde bir kez oluşturulan, thread-safe örnek özniteliği.
+    
+    Kilit örnek ve öznitelik başınadır: bir özniteliğin oluşturulması
+    (ör. ısınma iş parçacığında veritabanı) başka bir özniteliğin
+    oluşturulmasını (ör. girişte istemci) bekletmez.
+    """
+    
+    LOCKS = '_lazy_locks'
+    
+    def __init__(self, factory: Callable[[Any], Any]):
+        self.factory = factory
+        self.name = factory.__name__
+        self.__doc__ = factory.__doc__
+    
+    def __set_name__(self, owner, name: str):
+        self.name = name
+    
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        
+        # Değer örnek sözlüğüne yazıldıktan sonra bu tanımlayıcı artık çağrılmaz.
+        # dict.setdefault atomik olduğundan kilit sözlüğü ve kilit yarışsız oluşur.
+        locks = obj.__dict__.setdefault(self.LOCKS, {})
+        with locks.setdefault(self.name, threading.RLock()):
+            if self.name not in obj.__dict__:
+                obj.__dict__[self.name] = self.factory(obj)
+        return obj.__dict__[self.name]
+
+class Utilities:
+    """Yardımcı fonksiyonlar"""
+    
+    def __init__(self, clock: Optional[Clock] = None):
+        self.clock = clock or SystemClock()
+    
+    @staticmethod
+    def format_time_delta(delta: timedelta) -> str:
+        """Zaman farkını formatla"""
+        days = delta.days
+        hours = delta.seconds // 3600
+        minutes = (delta.seconds % 3600) // 60
+        seconds = delta.seconds % 60
+        
+        parts = []
+        if days > 0:
+            parts.append(f"{days} gün")
+        if hours > 0:
+            parts.append(f"{hours} saat")
+        if minutes > 0:
+            parts.append(f"{minutes} dakika")
+        if seconds > 0 or not parts:
+            parts.append(f"{seconds} saniye")
+        
+        return " ".join(parts)
+    
+    @staticmethod
+    def split_message(text: str, max_len: Optional[int] = None) -> List[str]:
+        """Mesajı Instagram uzunluk sınırına göre satır/kelime/grafem sınırlarından böl"""
+        from .chunker import MessageChunker
+        
+        return list(MessageChunker(max_len).chunks(text))
+    
+    @staticmethod
+    def add_city_suffix(city: str) -> str:
+        """Şehir ismine -e hali ekle"""
+        city = city.strip().title()
+        
+        special_cases = {
+            'İstanbul': 'İstanbul\'a',
+            'Ankara': 'Ankara\'ya',
+            'İzmir': 'İzmir\'e',
+            'Antalya': 'Antalya\'ya',
+            'Bursa': 'Bursa\'ya',
+            'Adana': 'Adana\'ya'
+        }
+        
+        if city in special_cases:
+            return special_cases[city]
+        
+        return f"{city}'e"
+    
+    def get_current_time(self) -> Dict:
+        """Mevcut zaman bilgileri"""
+        import pytz
+        
+        now = self.clock.now()
+        turkey_tz = pytz.timezone('Europe/Istanbul')
+        now_tr = now.astimezone(turkey_tz)
+        
+        days = {
+            'Monday': 'Pazartesi',
+            'Tuesday': 'Salı',
+            'Wednesday': 'Çarşamba',
+            'Thursday': 'Perşembe',
+            'Friday': 'Cuma',
+            'Saturday': 'Cumartesi',
+            'Sunday': 'Pazar'
+        }
+        
+        return {
+            'time': now_tr.strftime("%H:%M:%S"),
+            'date': now_tr.strftime("%d/%m/%Y"),
+            'day': days.get(now_tr.strftime("%A"), now_tr.strftime("%A")),
+            'timezone': 'İstanbul (GMT+3)'
+        }
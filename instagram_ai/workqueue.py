@@ -0,0 +1,249 @@
+"""Süreçler arası kalıcı yerel kuyruk (SQLite)"""
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .clock import Clock, SystemClock
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class LocalQueue:
+    """Gelen mesajlar ve giden cevaplar için kalıcı, en-az-bir-kez teslimli kuyruk.
+    
+    Çekici mesajları `inbox`'a yazar; mesaj id birincil anahtar olduğu için
+    aynı mesaj ikinci kez eklenmez. İşçiler kayıtları süreli kiralar; süre
+    dolmadan onaylanmayan (ör. çöken işçinin) kayıt yeniden dağıtılır. Mesajın
+    tamamlanması ve cevabının `outbox`'a eklenmesi tek işlemde yapılır, cevap
+    da mesaj id'ye tekil olduğundan yeniden işlenen mesaj ikinci cevap üretmez.
+    """
+    
+    def __init__(self, path: Optional[str] = None, clock: Optional[Clock] = None):
+        self.path = path or Config.QUEUE_FILE
+        self.clock = clock or SystemClock()
+        self.conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.lock = threading.RLock()
+        
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.create_tables()
+    
+    def create_tables(self):
+        """Kuyruk tablolarını oluştur"""
+        with self._transaction() as cursor:
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS inbox (
+                    message_id TEXT PRIMARY KEY,
+                    thread_id TEXT NOT NULL,
+                    user_id INTEGER NOT NULL,
+                    username TEXT,
+                    text TEXT,
+                    status TEXT DEFAULT 'pending',
+                    attempts INTEGER DEFAULT 0,
+                    available_at REAL NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            ''')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_inbox_ready ON inbox (status, available_at)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_inbox_thread ON inbox (thread_id, created_at)')
+            
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS outbox (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    message_id TEXT UNIQUE NOT NULL,
+                    thread_id TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    status TEXT DEFAULT 'pending',
+                    available_at REAL NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            ''')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_outbox_ready ON outbox (status, available_at)')
+            
+            # Yönetim değişiklikleri ('set', 'cache' komut satırları): her süreç sırayla uygular
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS admin_changes (
+                    version INTEGER PRIMARY KEY AUTOINCREMENT,
+                    command TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            ''')
+    
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Cursor]:
+        """Yazma kilidini baştan alan işlem; kiralama diğer süreçlerle yarışmaz"""
+        with self.lock:
+            cursor = self.conn.cursor()
+            cursor.execute('BEGIN IMMEDIATE')
+            try:
+                yield cursor
+            except BaseException:
+                cursor.execute('ROLLBACK')
+                raise
+            cursor.execute('COMMIT')
+    
+    # ---- Gelen mesajlar ----
+    
+    def put_messages(self, messages: Iterable[Tuple[str, str, int, str, str]]) -> int:
+        """(mesaj id, sohbet, kullanıcı, kullanıcı adı, metin) kayıtlarını ekle; yeni eklenen sayısı"""
+        now = self.clock.time()
+        with self._transaction() as cursor:
+            cursor.executemany(
+                'INSERT OR IGNORE INTO inbox (message_id, thread_id, user_id, username, text, '
+                'available_at, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [(str(message_id), str(thread_id), user_id, username, text, now, now)
+                 for message_id, thread_id, user_id, username, text in messages]
+            )
+            return cursor.rowcount
+    
+    def lease_messages(self, partition: int = 0, partitions: int = 1,
+                       limit: int = Config.QUEUE_BATCH_SIZE) -> List[Dict]:
+        """Bu bölüme düşen hazır mesajları kirala.
+        
+        Mesajlar kullanıcıya göre bölümlenir (`user_id % partitions`); böylece bir
+        kullanıcının oturumu, oyunu ve hız sınırı sayaçları hep aynı işçidedir.
+        """
+        now = self.clock.time()
+        with self._transaction() as cursor:
+            # Kirası defalarca dolan (işçiyi çökerten) mesaj bir daha dağıtılmaz
+            cursor.execute(
+                "UPDATE inbox SET status = 'dead' WHERE status = 'leased' AND available_at <= ? "
+                "AND attempts >= ?", (now, Config.POISON_THRESHOLD)
+            )
+            rows = cursor.execute(
+                "SELECT * FROM inbox WHERE status IN ('pending', 'leased') AND available_at <= ? "
+                "AND user_id % ? = ? ORDER BY created_at LIMIT ?",
+                (now, partitions, partition, limit)
+            ).fetchall()
+            cursor.executemany(
+                "UPDATE inbox SET status = 'leased', attempts = attempts + 1, available_at = ? "
+                "WHERE message_id = ?",
+                [(now + Config.QUEUE_LEASE_TIMEOUT, row['message_id']) for row in rows]
+            )
+        return [dict(row, attempts=row['attempts'] + 1) for row in rows]
+    
+    def complete_message(self, message_id: str, thread_id: str, response: Optional[str]) -> bool:
+        """Mesajı tamamla ve cevabını gönderim kuyruğuna ekle (tek işlem).
+        
+        Mesaj zaten tamamlanmışsa (kirası dolup başka işçide de işlendiyse)
+        cevap eklenmez ve False döner.
+        """
+        now = self.clock.time()
+        with self._transaction() as cursor:
+            cursor.execute(
+                "UPDATE inbox SET status = 'done', available_at = ? WHERE message_id = ? "
+                "AND status NOT IN ('done', 'dead')", (now, str(message_id))
+            )
+            if cursor.rowcount == 0:
+                return False
+            if response:
+                cursor.execute(
+                    'INSERT OR IGNORE INTO outbox (message_id, thread_id, text, available_at, created_at) '
+                    'VALUES (?, ?, ?, ?, ?)', (str(message_id), str(thread_id), str(response), now, now)
+                )
+            return True
+    
+    def fail_message(self, message_id: str, delay: float = 0.0) -> bool:
+        """İşlenemeyen mesajı tekrar kuyruğa bırak; deneme sınırı dolduysa True (karantina)"""
+        with self._transaction() as cursor:
+            cursor.execute(
+                "UPDATE inbox SET status = CASE WHEN attempts >= ? THEN 'dead' ELSE 'pending' END, "
+                "available_at = ? WHERE message_id = ?",
+                (Config.POISON_THRESHOLD, self.clock.time() + delay, str(message_id))
+            )
+            row = cursor.execute('SELECT status FROM inbox WHERE message_id = ?', (str(message_id),)).fetchone()
+        return row is not None and row['status'] == 'dead'
+    
+    def defer_message(self, message_id: str, delay: float):
+        """Kiralanan mesajı deneme saymadan `delay` saniye sonra tekrar dağıtılmak üzere bırak"""
+        with self._transaction() as cursor:
+            cursor.execute(
+                "UPDATE inbox SET status = 'pending', attempts = MAX(attempts - 1, 0), available_at = ? "
+                "WHERE message_id = ? AND status = 'leased'",
+                (self.clock.time() + max(0.0, delay), str(message_id))
+            )
+    
+    # ---- Giden cevaplar ----
+    
+    def lease_replies(self, limit: int = Config.QUEUE_BATCH_SIZE) -> List[Dict]:
+        """Gönderilecek cevapları kirala (ekleme sırasıyla)"""
+        now = self.clock.time()
+        with self._transaction() as cursor:
+            rows = cursor.execute(
+                "SELECT id, message_id, thread_id, text FROM outbox WHERE status IN ('pending', 'leased') "
+                "AND available_at <= ? ORDER BY id LIMIT ?", (now, limit)
+            ).fetchall()
+            cursor.executemany(
+                "UPDATE outbox SET status = 'leased', available_at = ? WHERE id = ?",
+                [(now + Config.QUEUE_LEASE_TIMEOUT, row['id']) for row in rows]
+            )
+        return [dict(row) for row in rows]
+    
+    def complete_replies(self, reply_ids: List[int]):
+        now = self.clock.time()
+        with self._transaction() as cursor:
+            cursor.executemany("UPDATE outbox SET status = 'sent', available_at = ? WHERE id = ?",
+                               [(now, reply_id) for reply_id in reply_ids])
+    
+    def release_replies(self, reply_ids: List[int], delay: float = 0.0):
+        """Gönderilemeyen cevapları `delay` saniye sonra tekrar denenmek üzere bırak"""
+        available_at = self.clock.time() + delay
+        with self._transaction() as cursor:
+            cursor.executemany("UPDATE outbox SET status = 'pending', available_at = ? WHERE id = ?",
+                               [(available_at, reply_id) for reply_id in reply_ids])
+    
+    # ---- Yönetim değişiklikleri ----
+    
+    def publish_admin_change(self, command: str) -> int:
+        """Yönetim komut satırını diğer süreçler için yayınla; sürüm numarasını döndürür"""
+        with self._transaction() as cursor:
+            cursor.execute('INSERT INTO admin_changes (command, created_at) VALUES (?, ?)',
+                           (command, self.clock.time()))
+            return cursor.lastrowid
+    
+    def admin_changes(self, after: int = 0) -> List[Tuple[int, str]]:
+        """`after` sürümünden sonraki yönetim değişiklikleri (sürüm sırasıyla)"""
+        with self.lock:
+            return [(row['version'], row['command']) for row in self.conn.execute(
+                'SELECT version, command FROM admin_changes WHERE version > ? ORDER BY version', (after,)
+            )]
+    
+    def clear_admin_changes(self):
+        """Küme başlangıcında önceki çalıştırmanın değişikliklerini at"""
+        with self._transaction() as cursor:
+            cursor.execute('DELETE FROM admin_changes')
+    
+    # ---- Bakım ----
+    
+    def purge(self, retention: float = Config.QUEUE_RETENTION) -> int:
+        """Saklama süresini aşan tamamlanmış kayıtları sil (karantinadakiler kalır).
+        
+        Her sohbetin en yeni gelen kutusu kaydı silinmez: çekici her turda
+        sohbetin son mesajını yeniden sunar, kaydı silinirse mesaj yeniden
+        eklenip ikinci kez cevaplanırdı.
+        """
+        cutoff = self.clock.time() - retention
+        with self._transaction() as cursor:
+            cursor.execute('''
+                DELETE FROM inbox WHERE status = 'done' AND available_at < ?
+                AND created_at < (SELECT MAX(created_at) FROM inbox i2 WHERE i2.thread_id = inbox.thread_id)
+            ''', (cutoff,))
+            removed = cursor.rowcount
+            cursor.execute("DELETE FROM outbox WHERE status = 'sent' AND available_at < ?", (cutoff,))
+            return removed + cursor.rowcount
+    
+    def stats(self) -> Dict[str, int]:
+        """Tablo ve duruma göre kayıt sayıları (ör. 'inbox_pending')"""
+        counts = {}
+        with self.lock:
+            for table in ('inbox', 'outbox'):
+                for status, count in self.conn.execute(f'SELECT status, COUNT(*) FROM {table} GROUP BY status'):
+                    counts[f'{table}_{status}'] = count
+        return counts
+    
+    def close(self):
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,41 @@
+"""Ortak test düzeni: paket kökü yolu, sanal saat ve geçici veritabanı"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from instagram_ai.clock import VirtualClock  # noqa: E402
+from instagram_ai.config import Config  # noqa: E402
+
+
+@pytest.fixture
+def clock():
+    return VirtualClock(1_700_000_000.0)
+
+
+@pytest.fixture
+def open_db(tmp_path, clock, monkeypatch):
+    """Aynı dosyalar üzerinde Database açan fabrika (yeniden başlatmayı taklit eder)"""
+    from instagram_ai.database import Database
+    
+    monkeypatch.setattr(Config, 'DB_FILE', str(tmp_path / 'bot.db'))
+    monkeypatch.setattr(Config, 'JOURNAL_DIR', str(tmp_path / 'journal'))
+    opened = []
+    
+    def factory():
+        db = Database(clock)
+        opened.append(db)
+        return db
+    
+    yield factory
+    for db in opened:
+        if not db.journal._file.closed:
+            db.shutdown()
+        db.conn.close()
+
+
+@pytest.fixture
+def db(open_db):
+    return open_db()
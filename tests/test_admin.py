@@ -0,0 +1,76 @@
+"""Yönetim konsolu: çalışırken ayarlanan parametreler, engeller ve kontrol soketi"""
+import os
+
+import pytest
+
+from instagram_ai.admin import AdminConsole, ControlServer, send_command
+from instagram_ai.bot import InstagramAIBot
+from instagram_ai.config import Config
+from instagram_ai.providers import DataProvider
+
+
+@pytest.fixture
+def console(db, clock, monkeypatch):
+    monkeypatch.setattr(Config, 'CHECKPOINT_FILE', '')
+    monkeypatch.setattr(Config, 'SHARED_ADMIN', False)
+    monkeypatch.setattr(Config, 'CHECK_INTERVAL', Config.CHECK_INTERVAL)
+    monkeypatch.setattr(Config, 'NEWS_WORKERS', Config.NEWS_WORKERS)
+    bot = InstagramAIBot(clock)
+    bot.__dict__['db'] = db
+    yield AdminConsole(bot)
+    DataProvider.shutdown()
+
+
+def test_news_workers_resizes_the_news_pool(console):
+    assert console.execute('get news_workers') == f"news_workers = {Config.NEWS_WORKERS}"
+    
+    assert console.execute('set news_workers 3') == "✅ news_workers = 3"
+    assert Config.NEWS_WORKERS == 3
+    assert DataProvider._news_executor()._max_workers == 3
+    
+    assert console.execute('set news_workers 0').startswith("Hatalı kullanım")
+    assert Config.NEWS_WORKERS == 3
+
+
+def test_unknown_parameter_lists_the_options(console):
+    response = console.execute('set workers 4')
+    
+    assert response.startswith("Bilinmeyen parametre: workers")
+    assert 'news_workers' in response
+    assert 'news_workers' in console.execute('help')
+
+
+def test_poll_interval_is_validated(console):
+    assert console.execute('set poll_interval 10-20') == "✅ poll_interval = 10-20"
+    assert Config.CHECK_INTERVAL == (10.0, 20.0)
+    assert console.execute('set poll_interval 20-10').startswith("Hatalı kullanım")
+
+
+def test_block_unblock_and_list(console, clock):
+    assert console.execute('blocked') == "Engelli kullanıcı yok."
+    
+    assert console.execute('block 7 30') == "🚫 7 engellendi (30 dk)"
+    assert console.execute('block 8') == "🚫 8 engellendi"
+    listing = console.execute('blocked')
+    assert "• 7 (30 dk)" in listing
+    assert "• 8 (kalıcı)" in listing
+    
+    assert console.execute('unblock 7') == "✅ 7 engeli kaldırıldı"
+    assert "• 7" not in console.execute('blocked')
+
+
+def test_unknown_command_and_bad_arguments(console):
+    assert console.execute('reboot').startswith("Bilinmeyen yönetim komutu")
+    assert console.execute('block abc').startswith("Hatalı kullanım")
+
+
+def test_control_socket_round_trip_is_owner_only(console, tmp_path):
+    path = str(tmp_path / 'control.sock')
+    server = ControlServer(console, path)
+    server.start()
+    try:
+        assert os.stat(path).st_mode & 0o777 == 0o600
+        assert send_command('get news_workers', path) == f"news_workers = {Config.NEWS_WORKERS}"
+    finally:
+        server.stop()
+    assert not os.path.exists(path)
@@ -0,0 +1,153 @@
+"""Oturum yöneticisi: kayıtlı oturumun yeniden kullanımı ve engellemeyen doğrulama kodu akışı"""
+import json
+import threading
+import time
+
+import pytest
+
+from instagram_ai.auth import ChallengePending, SessionManager
+from instagram_ai.config import Config
+
+
+class FakeClient:
+    """instagrapi.Client'ın SessionManager'ın kullandığı kısmı"""
+    
+    def __init__(self, challenge=False, valid=True):
+        self.settings = {}
+        self.sessionid = None
+        self.user_id = None
+        self.challenge = challenge
+        self.valid = valid
+        self.challenge_code_handler = None
+        self.logins = []
+        self.feed_calls = 0
+    
+    def get_settings(self):
+        return dict(self.settings)
+    
+    def set_settings(self, settings):
+        self.settings = dict(settings)
+        self.sessionid = settings.get('authorization_data', {}).get('sessionid')
+        self.user_id = settings.get('authorization_data', {}).get('ds_user_id')
+    
+    def set_uuids(self, uuids):
+        self.settings['uuids'] = uuids
+    
+    def login(self, username, password):
+        code = self.challenge_code_handler(username, 'EMAIL') if self.challenge else None
+        self.logins.append(code)
+        if self.challenge and code != '123456':
+            return False
+        self.valid = True
+        self.set_settings({**self.settings, 'authorization_data': {'sessionid': 's2', 'ds_user_id': '42'}})
+        return True
+    
+    def get_timeline_feed(self):
+        from instagrapi.exceptions import LoginRequired
+        
+        self.feed_calls += 1
+        if not self.valid:
+            raise LoginRequired("expired")
+        return {}
+
+
+@pytest.fixture
+def settings_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'CHALLENGE_TIMEOUT', 5)
+    return str(tmp_path / 'session.json')
+
+
+def _store(path, validated_at):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'uuids': {'phone_id': 'p1'}, 'validated_at': validated_at,
+                   'authorization_data': {'sessionid': 's1', 'ds_user_id': '42'}}, f)
+
+
+def test_recently_validated_session_is_reused_without_network(settings_file, clock):
+    _store(settings_file, clock.time() - 10)
+    client = FakeClient()
+    manager = SessionManager(client, settings_file, clock)
+    
+    assert manager.login() is True
+    assert client.feed_calls == 0
+    assert client.logins == []
+
+
+def test_old_session_is_checked_with_one_light_request(settings_file, clock):
+    _store(settings_file, clock.time() - Config.SESSION_VALIDATE_INTERVAL - 1)
+    client = FakeClient()
+    manager = SessionManager(client, settings_file, clock)
+    
+    assert manager.login() is True
+    assert client.feed_calls == 1
+    assert client.logins == []
+    with open(settings_file, encoding='utf-8') as f:
+        assert json.load(f)['validated_at'] == clock.time()
+
+
+def test_rejected_session_falls_back_to_full_login_keeping_device(settings_file, clock):
+    _store(settings_file, 0)
+    client = FakeClient(valid=False)
+    manager = SessionManager(client, settings_file, clock)
+    
+    assert manager.login() is True
+    assert len(client.logins) == 1
+    assert client.settings['uuids'] == {'phone_id': 'p1'}
+    assert manager.logins == 1
+
+
+def test_challenge_does_not_block_and_completes_when_code_arrives(settings_file, clock):
+    client = FakeClient(challenge=True)
+    manager = SessionManager(client, settings_file, clock)
+    notified = []
+    manager.add_challenge_listener(notified.append)
+    
+    started = time.monotonic()
+    assert manager.login() is False
+    assert time.monotonic() - started < 1.0
+    assert manager.challenge_pending
+    assert notified[0]['choice'] == 'EMAIL'
+    assert manager.relogin() is False
+    
+    with pytest.raises(ChallengePending):
+        with manager.using_client():
+            pass
+    
+    assert manager.submit_challenge_code(' 123456 ') is True
+    manager._login_thread.join(5)
+    assert not manager.challenge_pending
+    assert client.logins == ['123456']
+    assert manager.logins == 1
+    with manager.using_client() as used:
+        assert used is client
+
+
+def test_submit_without_pending_challenge_is_rejected(settings_file, clock):
+    manager = SessionManager(FakeClient(), settings_file, clock)
+    assert manager.submit_challenge_code('123456') is False
+
+
+def test_client_use_is_serialized_with_login(settings_file, clock):
+    manager = SessionManager(FakeClient(), settings_file, clock)
+    inside = threading.Event()
+    release = threading.Event()
+    order = []
+    
+    def step():
+        with manager.using_client():
+            inside.set()
+            release.wait(5)
+            order.append('step')
+    
+    worker = threading.Thread(target=step)
+    worker.start()
+    inside.wait(5)
+    login = threading.Thread(target=lambda: order.append(manager.relogin()))
+    login.start()
+    time.sleep(0.05)
+    assert order == []
+    
+    release.set()
+    worker.join(5)
+    login.join(5)
+    assert order == ['step', True]
@@ -0,0 +1,81 @@
+"""Kontrol noktası: gidiş-dönüş, taşınan bölümler ve bozuk dosya"""
+import pytest
+
+from instagram_ai.checkpoint import Checkpoint
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'state.ckpt')
+
+
+def test_round_trip(path, clock):
+    checkpoint = Checkpoint(path, clock)
+    state = {'answered': {'m1', 'm2'}, 'counts': [1, 2, 3], 'text': 'şöğüç 🙂'}
+    checkpoint.register('bot', lambda: state, lambda restored: pytest.fail("no file yet"))
+    checkpoint.save()
+    
+    restored = []
+    Checkpoint(path, clock).register('bot', lambda: None, restored.append)
+    assert restored == [state]
+
+
+def test_unused_sections_are_carried_over(path, clock):
+    checkpoint = Checkpoint(path, clock)
+    checkpoint.register('games', lambda: {'active': 2}, lambda state: None)
+    checkpoint.register('cache', lambda: ['x'], lambda state: None)
+    checkpoint.save()
+    
+    # Oyun bileşeni hiç oluşturulmadan yeniden yazım
+    second = Checkpoint(path, clock)
+    second.register('cache', lambda: ['y'], lambda state: None)
+    second.save()
+    
+    third = Checkpoint(path, clock)
+    assert third.load('games') == {'active': 2}
+    assert third.load('cache') == ['y']
+    assert third.load('cache') is None
+
+
+def test_dump_returning_none_writes_nothing(path, clock):
+    checkpoint = Checkpoint(path, clock)
+    checkpoint.register('empty', lambda: None, lambda state: None)
+    checkpoint.save()
+    
+    assert Checkpoint(path, clock).load('empty') is None
+
+
+@pytest.mark.parametrize('damage', [
+    lambda data: data[:-5],                                 # yarım yazım
+    lambda data: data[:-1] + bytes([data[-1] ^ 0xFF]),      # bozuk yük (crc)
+    lambda data: b'XXXX' + data[4:],                        # yanlış sihirli sayı
+    lambda data: b'',                                       # boş dosya
+])
+def test_corrupt_file_starts_cold(path, clock, damage):
+    checkpoint = Checkpoint(path, clock)
+    checkpoint.register('bot', lambda: {'answered': ['m1']}, lambda state: None)
+    checkpoint.save()
+    
+    with open(path, 'rb') as f:
+        data = f.read()
+    with open(path, 'wb') as f:
+        f.write(damage(data))
+    
+    restored = []
+    fresh = Checkpoint(path, clock)
+    fresh.register('bot', lambda: {'answered': []}, restored.append)
+    assert restored == []
+    assert fresh.stats['restored'] == 0
+    
+    # Bozuk dosyanın üzerine geçerli bir kontrol noktası yazılabilir
+    fresh.save()
+    assert Checkpoint(path, clock).load('bot') == {'answered': []}
+
+
+def test_unsupported_version_is_ignored(path, clock, monkeypatch):
+    checkpoint = Checkpoint(path, clock)
+    checkpoint.register('bot', lambda: 1, lambda state: None)
+    checkpoint.save()
+    
+    monkeypatch.setattr(Checkpoint, 'VERSION', Checkpoint.VERSION + 1)
+    assert Checkpoint(path, clock).load('bot') is None
@@ -0,0 +1,77 @@
+"""Mesaj parçalama: UTF-16 uzunluğu ve grafem sınırları"""
+import pytest
+
+from instagram_ai.chunker import MessageChunker, ReplyBuffer, chunk_offsets, is_grapheme_boundary, utf16_len
+
+FAMILY = '\U0001F468\u200d\U0001F469\u200d\U0001F467'     # ZWJ dizisi (8 UTF-16 birimi)
+FLAG = '\U0001F1F9\U0001F1F7'                             # bölgesel gösterge çifti (4 birim)
+THUMB = '\U0001F44D\U0001F3FD'                            # ten rengi değiştiricili (4 birim)
+ACCENT = 'e\u0301'                                        # birleşik aksan (2 birim)
+
+
+def _chunks(text, max_len):
+    return [text[start:end] for start, end in chunk_offsets(text, max_len)]
+
+
+def test_utf16_len_counts_surrogate_pairs():
+    assert utf16_len('abc') == 3
+    assert utf16_len('ğüş') == 3
+    assert utf16_len('\U0001F600') == 2
+    assert utf16_len(FAMILY) == 8
+
+
+@pytest.mark.parametrize('unit', [FAMILY, FLAG, THUMB, ACCENT, '\U0001F600', 'a'])
+@pytest.mark.parametrize('max_len', [9, 10, 11, 16])
+def test_chunks_fit_limit_and_never_split_graphemes(unit, max_len):
+    text = unit * 20
+    chunks = _chunks(text, max_len)
+    
+    assert ''.join(chunks) == text
+    for chunk in chunks:
+        assert 0 < utf16_len(chunk) <= max_len
+        assert len(chunk) % len(unit) == 0
+
+
+def test_flags_pair_up():
+    text = FLAG * 3
+    assert not is_grapheme_boundary(text, 1)
+    assert is_grapheme_boundary(text, 2)
+    assert not is_grapheme_boundary(text, 3)
+
+
+def test_prefers_word_boundaries():
+    text = ' '.join(['kelime'] * 30)
+    chunks = _chunks(text, 50)
+    
+    assert all(utf16_len(chunk) <= 50 for chunk in chunks)
+    assert all(word == 'kelime' for chunk in chunks for word in chunk.split(' '))
+    assert ' '.join(chunks) == text
+
+
+def test_overlong_grapheme_is_cut_at_code_points():
+    text = 'a' + '\u0301' * 30
+    chunks = _chunks(text, 10)
+    
+    assert ''.join(chunks) == text
+    assert all(utf16_len(chunk) <= 10 for chunk in chunks)
+
+
+def test_merge_joins_short_replies_within_limit():
+    chunker = MessageChunker(max_len=20, separator='\n\n')
+    merged = list(chunker.merge(['selam', 'nasılsın', 'x' * 15, 'y' * 30]))
+    
+    assert merged == ['selam\n\nnasılsın', 'x' * 15, 'y' * 30]
+
+
+def test_reply_buffer_groups_by_thread_and_drains():
+    buffer = ReplyBuffer(MessageChunker(max_len=20))
+    buffer.add('t1', 'm1', 'selam')
+    buffer.add('t2', 'm2', 'z' * 45)
+    buffer.add('t1', 'm3', 'nasılsın')
+    assert len(buffer) == 2
+    
+    drained = {thread_id: (ids, list(chunks)) for thread_id, ids, chunks in buffer.drain()}
+    assert drained['t1'] == (['m1', 'm3'], ['selam\n\nnasılsın'])
+    assert drained['t2'][0] == ['m2']
+    assert [utf16_len(chunk) for chunk in drained['t2'][1]] == [20, 20, 5]
+    assert len(buffer) == 0
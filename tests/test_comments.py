@@ -0,0 +1,131 @@
+"""Yorum cevapları: artımlı okuma, kalıcı imleç, sınıflandırma ve paylaşılan gönderim hızı"""
+import pytest
+
+from instagram_ai.bot import InstagramAIBot
+from instagram_ai.comments import CommentPipeline
+from instagram_ai.config import Config
+from instagram_ai.resilience import TokenBucket
+from instagram_ai.simulator import FakeClient
+
+
+@pytest.fixture
+def bot(db, clock, monkeypatch):
+    monkeypatch.setattr(Config, 'CHECKPOINT_FILE', '')
+    bot = InstagramAIBot(clock)
+    bot.__dict__['db'] = db
+    bot.__dict__['client'] = FakeClient(clock, [])
+    bot.outbound = TokenBucket(rate=100, burst=100, clock=clock)
+    return bot
+
+
+def _replies(client, media_id):
+    return [c.text for c in client.medias[media_id].comments if c.user.pk == str(client.user_id)]
+
+
+def test_only_new_command_comments_are_answered(bot, clock):
+    client = bot.client
+    client.add_media('old', clock.time() - 86400)
+    client.add_comment('old', 7, 'fıkra')
+    pipeline = CommentPipeline(bot)
+    
+    assert pipeline.poll() == 0  # başlamadan önceki yorumlar yalnızca işaretlenir
+    
+    client.add_comment('old', 7, 'harika olmuş 😍')
+    client.add_comment('old', 8, 'saat')
+    assert pipeline.poll() == 2
+    assert pipeline.flush() == 1
+    
+    replies = _replies(client, 'old')
+    assert len(replies) == 1 and replies[0].startswith('@user8 ')
+
+
+def test_unchanged_media_are_not_fetched(bot, clock):
+    client = bot.client
+    for media_id in ('a', 'b', 'c'):
+        client.add_media(media_id)
+    pipeline = CommentPipeline(bot)
+    pipeline.poll()
+    
+    client.add_comment('b', 7, 'saat')
+    pipeline.poll()
+    assert client.api_calls['media_comments_chunk'] == 1
+    
+    pipeline.poll()
+    assert client.api_calls['media_comments_chunk'] == 1
+
+
+def test_cursor_survives_restart(bot, clock):
+    client = bot.client
+    client.add_media('m')
+    pipeline = CommentPipeline(bot)
+    client.add_comment('m', 7, 'saat')
+    pipeline.run_once()
+    assert len(_replies(client, 'm')) == 1
+    
+    restarted = CommentPipeline(bot)
+    restarted.poll()
+    assert not restarted.queue
+    client.add_comment('m', 8, 'bot')
+    restarted.poll()
+    assert [reply.text.split()[0] for reply in restarted.queue] == ['@user8']
+
+
+def test_large_bursts_are_read_across_rounds(bot, clock, monkeypatch):
+    monkeypatch.setattr(Config, 'COMMENT_BATCH_SIZE', 2)
+    client = bot.client
+    client.add_media('m')
+    client.add_comment('m', 9, 'çok güzel')
+    pipeline = CommentPipeline(bot)
+    pipeline.poll()
+    
+    for user_id in range(10, 15):
+        client.add_comment('m', user_id, 'saat')
+    
+    assert [pipeline.poll() for _ in range(4)] == [2, 2, 1, 0]
+    pipeline.flush()
+    assert len(_replies(client, 'm')) == 5
+
+
+def test_replies_wait_for_outbound_tokens(bot, clock):
+    bot.outbound = TokenBucket(rate=0.5, burst=1, clock=clock)
+    client = bot.client
+    client.add_media('m')
+    pipeline = CommentPipeline(bot)
+    pipeline.poll()
+    for user_id in (10, 11):
+        client.add_comment('m', user_id, 'saat')
+    
+    clock.advance(Config.COMMENT_POLL_INTERVAL)
+    assert pipeline.run_once() == 1
+    assert len(pipeline.queue) == 1
+    assert pipeline.run_once() == 0
+    clock.advance(2)
+    assert pipeline.run_once() == 1
+    assert not pipeline.queue
+
+
+def test_blocked_and_own_comments_are_ignored(bot, clock):
+    client = bot.client
+    client.add_media('m')
+    pipeline = CommentPipeline(bot)
+    pipeline.poll()
+    bot.security.block_user(7)
+    
+    client.add_comment('m', 7, 'saat')
+    client.add_comment('m', client.user_id, 'saat')
+    pipeline.poll()
+    assert not pipeline.queue
+
+
+def test_full_queue_drops_oldest_reply(bot, clock, monkeypatch):
+    monkeypatch.setattr(Config, 'COMMENT_QUEUE_SIZE', 2)
+    client = bot.client
+    client.add_media('m')
+    pipeline = CommentPipeline(bot)
+    pipeline.poll()
+    for user_id in (10, 11, 12):
+        client.add_comment('m', user_id, 'saat')
+    
+    pipeline.poll()
+    assert [reply.text.split()[0] for reply in pipeline.queue] == ['@user11', '@user12']
+    assert pipeline.stats['dropped'] == 1
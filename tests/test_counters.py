@@ -0,0 +1,102 @@
+"""Hız sınırı ve spam sayaçları: süreç içi ve dosyaya eşlenmiş paylaşımlı tablo"""
+import threading
+
+import pytest
+
+from instagram_ai.counters import LocalCounters, SharedCounters
+
+
+@pytest.fixture
+def shared(tmp_path, clock):
+    opened = []
+    
+    def factory(slots=64, stripes=4):
+        counters = SharedCounters(str(tmp_path / 'counters.bin'), slots, stripes, clock)
+        opened.append(counters)
+        return counters
+    
+    yield factory
+    for counters in opened:
+        counters.close()
+
+
+def test_local_counters_use_exact_sliding_window(clock):
+    counters = LocalCounters(clock)
+    
+    assert [counters.allow(7, 3) for _ in range(4)] == [True, True, True, False]
+    clock.advance(59)
+    assert not counters.allow(7, 3)
+    clock.advance(1)
+    assert counters.allow(7, 3)
+    assert counters.snapshot(7) == (1, 0)
+
+
+def test_shared_limit_applies_across_processes(shared):
+    first, second = shared(), shared()
+    
+    assert [first.allow(7, 2), second.allow(7, 2), first.allow(7, 2)] == [True, True, False]
+    assert second.add_spam(7) == 1
+    assert first.add_spam(7) == 2
+    assert second.snapshot(7) == (2.0, 2)
+
+
+def test_shared_window_weighs_previous_window(shared, clock):
+    counters = shared()
+    clock.advance(60 - clock.time() % 60)  # pencereler dakika başına hizalı
+    for _ in range(10):
+        counters.allow(7, 100)
+    
+    clock.advance(90)  # önceki pencerenin yarısı hâlâ sayılır
+    assert counters.snapshot(7) == (pytest.approx(5.0), 0)
+    clock.advance(60)
+    assert counters.snapshot(7) == (pytest.approx(0.0), 0)
+
+
+def test_full_stripe_evicts_least_recently_used(shared, clock):
+    counters = shared(slots=4, stripes=1)
+    for user_id in range(4):
+        counters.add_spam(user_id)
+        clock.advance(1)
+    counters.add_spam(0)  # en eski kullanıcı artık 1
+    
+    counters.add_spam(99)
+    assert len(counters) == 4
+    assert counters.snapshot(1) == (0.0, 0)
+    assert counters.snapshot(0)[1] == 2
+
+
+def test_reads_and_resets_do_not_allocate_slots(shared, clock):
+    counters = shared(slots=4, stripes=1)
+    for user_id in range(4):
+        counters.add_spam(user_id)
+    
+    assert counters.snapshot(99) == (0.0, 0)
+    counters.reset(98)
+    
+    assert len(counters) == 4
+    assert all(counters.snapshot(user_id) == (0.0, 1) for user_id in range(4))
+
+
+def test_shared_counts_are_exact_under_threads(shared):
+    counters = shared()
+    
+    def spam():
+        for _ in range(500):
+            counters.add_spam(7)
+    
+    threads = [threading.Thread(target=spam) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    
+    assert counters.snapshot(7)[1] == 2000
+
+
+def test_reset_clears_only_spam_score(shared):
+    counters = shared()
+    counters.allow(7, 10)
+    counters.add_spam(7)
+    counters.reset(7)
+    
+    assert counters.snapshot(7) == (1.0, 0)
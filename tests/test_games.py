@@ -0,0 +1,93 @@
+"""Oyun durumu: kompakt kayıt, artımlı yazım ve yeniden başlatma sonrası tembel geri yükleme"""
+from instagram_ai.games import GameState, GameStore
+
+
+def test_compact_round_trip():
+    game = GameState(7, 'sayı_tahmin', target=42, min=1, max=100, max_attempts=7, start_time=1000)
+    data = game.to_data()
+    
+    assert data == {'t': 'sayı_tahmin', 'n': 42, 'lo': 1, 'hi': 100, 'a': 0, 'm': 7, 's': 1000}
+    restored = GameState.from_data(7, data, expires=5.0)
+    assert restored.to_data() == data
+    assert restored.expires == 5.0
+
+
+def test_legacy_long_keys_are_read():
+    game = GameState.from_data(7, {'type': 'bilgi_yarismasi', 'question': 3,
+                                   'start_time': '2024-01-01T12:00:00'}, expires=0.0)
+    assert game.type == 'bilgi_yarismasi'
+    assert game.question == 3
+    assert game.attempts == 0
+    assert isinstance(game.start_time, int)
+
+
+def test_only_changed_fields_are_dirty():
+    game = GameState(7, 'sayı_tahmin', target=42)
+    assert game.pop_dirty() == {}
+    
+    game.attempts += 1
+    game.attempts += 1
+    assert game.pop_dirty() == {'a': 2}
+    assert game.pop_dirty() == {}
+
+
+def test_put_stamps_start_time_from_db_clock(db, clock):
+    store = GameStore(db)
+    game = GameState(7, 'sayı_tahmin', target=42)
+    store.put(game, ttl=300)
+    
+    assert game.start_time == int(clock.time())
+    assert game.expires == clock.time() + 300
+
+
+def test_game_is_restored_lazily_after_restart(open_db, clock):
+    db = open_db()
+    store = GameStore(db)
+    game = GameState(7, 'sayı_tahmin', target=42, min=1, max=100, max_attempts=7)
+    store.put(game, ttl=300)
+    game.attempts = 3
+    store.save(game)
+    db.shutdown()
+    
+    store = GameStore(open_db())
+    assert len(store) == 0
+    restored = store.get(7)
+    assert restored is not None
+    assert (restored.target, restored.attempts, restored.max_attempts) == (42, 3, 7)
+    assert len(store) == 1
+    assert store.get(8) is None
+
+
+def test_expired_game_is_not_returned(db, clock):
+    store = GameStore(db)
+    store.put(GameState(7, 'sayı_tahmin', target=42), ttl=60)
+    
+    clock.advance(61)
+    assert store.get(7) is None
+    assert len(store) == 0
+
+
+def test_session_purge_drops_games(db, clock):
+    store = GameStore(db)
+    store.put(GameState(7, 'sayı_tahmin', target=42), ttl=60)
+    store.put(GameState(8, 'sayı_tahmin', target=1), ttl=600)
+    
+    clock.advance(61)
+    db.purge_expired_sessions()
+    assert list(store._games) == [8]
+
+
+def test_checkpoint_state_skips_expired_and_keeps_newer(db, clock):
+    store = GameStore(db)
+    store.put(GameState(7, 'sayı_tahmin', target=42), ttl=60)
+    store.put(GameState(8, 'sayı_tahmin', target=1), ttl=600)
+    clock.advance(61)
+    state = store.dump_state()
+    assert list(state) == [8]
+    
+    fresh = GameStore(db)
+    newer = GameState(8, 'sayı_tahmin', target=99, expires=clock.time() + 10)
+    fresh._games[8] = newer
+    fresh.load_state({**state, 9: ({'t': 'sayı_tahmin', 'n': 5}, clock.time() + 100)})
+    assert fresh._games[8] is newer
+    assert fresh._games[9].target == 5
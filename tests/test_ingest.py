@@ -0,0 +1,134 @@
+"""Anlık mesaj alımı: olay ayrıştırma, webhook kaynağı ve yoklamayla uzlaştırma"""
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from instagram_ai.bot import InstagramAIBot
+from instagram_ai.config import Config
+from instagram_ai.ingest import PushIngestor, WebhookSource, parse_realtime_event, parse_webhook_message
+from instagram_ai.models import IncomingMessage
+from instagram_ai.simulator import FakeClient, SimMessage
+
+
+def _patch(*ops):
+    return {'event': 'patch', 'data': list(ops)}
+
+
+def _add(thread_id, item_id, value):
+    return {'op': 'add', 'path': f'/direct_v2/threads/{thread_id}/items/{item_id}', 'value': value}
+
+
+def test_realtime_patch_yields_new_text_messages():
+    event = _patch(
+        _add(11, 101, {'item_id': '101', 'user_id': 7, 'text': 'saat', 'username': 'ali'}),
+        _add(11, 102, json.dumps({'user_id': 8, 'text': 'fıkra'})),
+        _add(11, 103, {'user_id': 7, 'item_type': 'media'}),
+        _add(11, 104, 'bozuk json'),
+        {'op': 'replace', 'path': '/direct_v2/threads/11/items/105', 'value': {'user_id': 7, 'text': 'x'}},
+        {'op': 'add', 'path': '/direct_v2/inbox/unseen_count', 'value': 3},
+    )
+    
+    messages = parse_realtime_event(event)
+    assert [(m.id, m.thread_id, m.user_id, m.username, m.text) for m in messages] == [
+        ('101', '11', 7, 'ali', 'saat'), ('102', '11', 8, 'Unknown', 'fıkra')
+    ]
+    assert parse_realtime_event({'event': 'typing'}) == []
+
+
+def test_webhook_record_defaults_username():
+    message = parse_webhook_message({'id': 1, 'thread_id': 2, 'user_id': '7', 'text': 'saat'})
+    assert message == IncomingMessage('1', '2', 7, 'Unknown', 'saat')
+
+
+@pytest.fixture
+def webhook(monkeypatch):
+    monkeypatch.setattr(Config, 'WEBHOOK_TOKEN', '')
+    received = []
+    source = WebhookSource('127.0.0.1', 0)
+    source.start(received.append)
+    yield source, received
+    source.stop()
+
+
+def _post(source, body, path='/messages', headers=None):
+    data = body if isinstance(body, bytes) else json.dumps(body).encode('utf-8')
+    request = urllib.request.Request(f'http://127.0.0.1:{source.port}{path}', data=data,
+                                     headers=headers or {}, method='POST')
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_webhook_accepts_records_lists_and_realtime_events(webhook):
+    source, received = webhook
+    record = {'id': 1, 'thread_id': 2, 'user_id': 7, 'text': 'saat'}
+    
+    assert _post(source, record) == (202, {'accepted': 1})
+    assert _post(source, [record, dict(record, id=2)]) == (202, {'accepted': 2})
+    event = _patch(_add(11, 101, {'user_id': 7, 'text': 'bot'}))
+    assert _post(source, event) == (202, {'accepted': 1})
+    assert [m.id for m in received] == ['1', '1', '2', '101']
+
+
+def test_webhook_rejects_bad_requests(webhook, monkeypatch):
+    source, received = webhook
+    
+    assert _post(source, b'{bozuk')[0] == 400
+    assert _post(source, {'id': 1})[0] == 400
+    assert _post(source, {}, path='/other')[0] == 404
+    
+    monkeypatch.setattr(Config, 'WEBHOOK_TOKEN', 'gizli')
+    record = {'id': 1, 'thread_id': 2, 'user_id': 7, 'text': 'saat'}
+    assert _post(source, record)[0] == 403
+    assert _post(source, record, headers={'X-Webhook-Token': 'gizli'})[0] == 202
+    assert len(received) == 1
+
+
+@pytest.fixture
+def bot(db, clock, monkeypatch):
+    monkeypatch.setattr(Config, 'CHECKPOINT_FILE', '')
+    monkeypatch.setattr(Config, 'COMMENT_REPLIES', False)
+    monkeypatch.setattr(Config, 'PUSH_WAIT', 0.01)
+    bot = InstagramAIBot(clock)
+    bot.__dict__['db'] = db
+    return bot
+
+
+def test_message_seen_by_push_and_sweep_is_answered_once(bot, clock):
+    client = bot.__dict__['client'] = FakeClient(clock, [SimMessage('m1', 7, 't7', 'saat', clock.time())])
+    ingestor = PushIngestor(bot, sources=[])
+    ingestor.submit(IncomingMessage('m1', 't7', 7, 'user7', 'saat'))
+    
+    assert ingestor.once() == 1
+    assert ingestor.stats['swept'] == 1
+    assert ingestor.once() == 0
+    assert client.api_calls['direct_send'] == 1
+    assert client.api_calls['direct_threads'] == 1  # uzlaştırma taraması seyrek
+
+
+def test_round_failure_requeues_unanswered_messages(bot, clock, monkeypatch):
+    bot.__dict__['client'] = FakeClient(clock, [])
+    ingestor = PushIngestor(bot, sources=[])
+    ingestor.once()
+    
+    def fail(messages):
+        raise ConnectionError("bağlantı koptu")
+    
+    monkeypatch.setattr(bot, 'handle_messages', fail)
+    ingestor.submit(IncomingMessage('m1', 't7', 7, 'ali', 'saat'))
+    with pytest.raises(ConnectionError):
+        ingestor.once()
+    assert [m.id for m in ingestor._drain(0.01)] == ['m1']
+
+
+def test_full_push_queue_drops_and_leaves_it_to_the_sweep(bot, clock, monkeypatch):
+    monkeypatch.setattr(Config, 'PUSH_QUEUE_SIZE', 1)
+    ingestor = PushIngestor(bot, sources=[])
+    ingestor.submit(IncomingMessage('m1', 't7', 7, 'ali', 'saat'))
+    ingestor.submit(IncomingMessage('m2', 't7', 7, 'ali', 'saat'))
+    
+    assert ingestor.stats == {'pushed': 1, 'dropped': 1, 'swept': 0, 'sweeps': 0}
@@ -0,0 +1,108 @@
+"""Olay günlüğü: yarım kalan kuyruğun kesilmesi, anlık görüntü ve yeniden oynatma"""
+import os
+
+import pytest
+
+from instagram_ai.config import Config
+from instagram_ai.journal import EventJournal, StateProjection
+
+
+@pytest.fixture
+def directory(tmp_path):
+    return str(tmp_path / 'journal')
+
+
+def _segment(directory):
+    names = sorted(name for name in os.listdir(directory) if name.endswith('.log'))
+    return os.path.join(directory, names[-1])
+
+
+def test_torn_tail_is_truncated_on_open(directory, clock):
+    journal = EventJournal(directory, clock)
+    for i in range(3):
+        journal.append('user_stat', user_id=1, field='messages', increment=1)
+    journal.close()
+    
+    path = _segment(directory)
+    good_size = os.path.getsize(path)
+    with open(path, 'ab') as f:
+        # Başlığı yazılmış ama yükü yarım kalmış kayıt
+        f.write(EventJournal.HEADER.pack(100, 0, 4) + b'{"yar')
+    
+    journal = EventJournal(directory, clock)
+    assert journal.seq == 3
+    assert os.path.getsize(path) == good_size
+    
+    assert journal.append('user_created', user_id=2, username='veli') == 4
+    assert [seq for seq, *_ in journal.replay()] == [1, 2, 3, 4]
+    journal.close()
+
+
+def test_corrupt_record_ends_replay(directory, clock):
+    journal = EventJournal(directory, clock)
+    journal.append('user_created', user_id=1, username='ali')
+    journal.append('user_created', user_id=2, username='veli')
+    journal.close()
+    
+    path = _segment(directory)
+    with open(path, 'r+b') as f:
+        f.seek(-2, os.SEEK_END)
+        f.write(b'##')
+    
+    journal = EventJournal(directory, clock)
+    assert journal.seq == 1
+    assert [fields['user_id'] for _, _, _, fields in journal.replay()] == [1]
+    journal.close()
+
+
+def test_projection_restores_from_snapshot_and_replays_tail(directory, clock):
+    journal = EventJournal(directory, clock)
+    projection = StateProjection(journal)
+    journal.append('user_created', user_id=1, username='ali')
+    journal.append('user_stat', user_id=1, field='messages', increment=2)
+    journal.append('message_logged', user_id=1, command='hava')
+    projection.snapshot()
+    
+    journal.append('user_stat', user_id=1, field='messages', increment=3)
+    journal.append('session_set', user_id=1, state='game', expires=clock.time() + 60, data={'step': 1})
+    journal.append('session_data', user_id=1, fields={'step': 2})
+    journal.close()
+    
+    journal = EventJournal(directory, clock)
+    replayed = []
+    original = StateProjection.apply
+    
+    def recording_apply(self, seq, *event):
+        replayed.append(seq)
+        original(self, seq, *event)
+    
+    StateProjection.apply = recording_apply
+    try:
+        projection = StateProjection(journal)
+    finally:
+        StateProjection.apply = original
+    
+    assert projection.snapshot_seq == 3
+    assert replayed == [4, 5, 6]
+    assert projection.users[1] == {'username': 'ali', 'messages': 5}
+    assert projection.commands == {'hava': 1}
+    assert projection.sessions[1][0] == 'game'
+    assert projection.sessions[1][2] == {'step': 2}
+    journal.close()
+
+
+def test_snapshot_drops_covered_segments_but_keeps_retained(directory, clock, monkeypatch):
+    monkeypatch.setattr(Config, 'JOURNAL_SEGMENT_SIZE', 1)  # her kayıtta yeni segment
+    journal = EventJournal(directory, clock)
+    projection = StateProjection(journal)
+    journal.retain(lambda: 2)
+    for i in range(5):
+        journal.append('user_created', user_id=i, username=f'u{i}')
+    
+    projection.snapshot()
+    assert [seq for seq, *_ in journal.replay(2)] == [3, 4, 5]
+    
+    journal = EventJournal(directory, clock)
+    projection = StateProjection(journal)
+    assert sorted(projection.users) == [0, 1, 2, 3, 4]
+    journal.close()
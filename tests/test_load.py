@@ -0,0 +1,100 @@
+"""Aşırı yük denetimi: mod geçişleri, erteleme ve alınma anından ölçülen gecikme"""
+import pytest
+
+from instagram_ai.bot import InstagramAIBot
+from instagram_ai.config import Config
+from instagram_ai.ingest import PushIngestor
+from instagram_ai.load import DEGRADED, NORMAL, LoadController
+from instagram_ai.models import IncomingMessage
+from instagram_ai.pipeline import Worker
+from instagram_ai.simulator import FakeClient
+from instagram_ai.workqueue import LocalQueue
+
+
+@pytest.fixture
+def bot(db, clock, monkeypatch):
+    monkeypatch.setattr(Config, 'CHECKPOINT_FILE', '')
+    monkeypatch.setattr(Config, 'COMMENT_REPLIES', False)
+    bot = InstagramAIBot(clock)
+    bot.__dict__['db'] = db
+    bot.__dict__['client'] = FakeClient(clock, [])
+    return bot
+
+
+def _round(load, depth=0, latencies=()):
+    load.observe_depth(depth)
+    for seconds in latencies:
+        load.observe_latency(seconds)
+    return load.evaluate()
+
+
+def test_enters_after_consecutive_pressure_and_exits_with_hysteresis(clock):
+    load = LoadController(clock)
+    modes = []
+    load.add_listener(modes.append)
+    
+    assert _round(load, depth=Config.LOAD_DEPTH_HIGH + 1) == NORMAL
+    assert _round(load, latencies=[Config.LOAD_LATENCY_SLO * 2]) == DEGRADED
+    assert load.reason.startswith('p95 latency')
+    
+    # Eşikler arası tur rahatlama sayılmaz
+    _round(load, depth=Config.LOAD_DEPTH_LOW + 1)
+    for _ in range(Config.LOAD_EXIT_ROUNDS - 1):
+        assert _round(load) == DEGRADED
+    assert _round(load) == NORMAL
+    assert modes == [DEGRADED, NORMAL]
+    assert load.snapshot()['transitions'] == 2
+
+
+def test_deferred_message_returns_after_max_defer(clock):
+    load = LoadController(clock)
+    assert not load.should_defer('m1', 'mesaj')
+    load.mode = DEGRADED
+    
+    assert load.should_defer('m1', 'mesaj')
+    assert load.due_deferred() == []
+    clock.advance(Config.LOAD_MAX_DEFER)
+    assert load.due_deferred() == ['mesaj']
+    assert not load.should_defer('m1', 'mesaj')
+
+
+def test_deferred_wait_does_not_count_against_the_slo(clock):
+    load = LoadController(clock)
+    load.mode = DEGRADED
+    load.should_defer('m1')
+    
+    load.observe_latency(Config.LOAD_MAX_DEFER, 'm1')
+    load.observe_latency(2.0, 'm2')
+    load.evaluate()
+    assert load.metrics['p95_latency'] == 2.0
+
+
+def test_latency_is_measured_from_receipt(bot, clock):
+    received = clock.time()
+    clock.advance(30)
+    
+    bot.handle_messages([IncomingMessage('m1', 't1', 7, 'ali', 'saat', received)])
+    
+    assert bot.load.metrics['p95_latency'] == pytest.approx(30.0)
+
+
+def test_pushed_messages_are_stamped_on_receipt(bot, clock):
+    ingestor = PushIngestor(bot, sources=[])
+    ingestor.submit(IncomingMessage('m1', 't1', 7, 'ali', 'saat'))
+    assert ingestor.events.get_nowait().received_at == clock.time()
+    
+    stamped = IncomingMessage('m2', 't1', 7, 'ali', 'saat', clock.time() - 5)
+    ingestor.submit(stamped)
+    assert ingestor.events.get_nowait() == stamped
+
+
+def test_worker_latency_is_measured_from_enqueue(bot, clock, tmp_path):
+    queue = LocalQueue(str(tmp_path / 'queue.db'), clock)
+    try:
+        queue.put_messages([('m1', 't1', 7, 'ali', 'saat')])
+        clock.advance(20)
+        Worker(bot, queue).once()
+    finally:
+        queue.close()
+    
+    assert bot.load.metrics['p95_latency'] == pytest.approx(20.0)
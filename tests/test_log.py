@@ -0,0 +1,105 @@
+"""Loglama: örnekleme filtresi, JSON biçimi, engellemeyen kuyruk ve sıkıştırmalı döndürme"""
+import gzip
+import json
+import logging
+import queue
+import threading
+
+from instagram_ai.log import (CompressingRotatingFileHandler, JsonFormatter,
+                              NonBlockingQueueHandler, SamplingFilter)
+
+
+def _record(level=logging.INFO, sampled=True, lineno=10, created=1000.0, **extra):
+    record = logging.LogRecord('instagram_ai.test', level, __file__, lineno, 'olay %s', ('x',), None)
+    record.created = created
+    if sampled:
+        record.sampled = True
+    record.__dict__.update(extra)
+    return record
+
+
+def test_sampling_passes_burst_then_every_nth():
+    sampler = SamplingFilter(burst=3, every=5)
+    passed = [sampler.filter(_record()) for _ in range(18)]
+    
+    assert passed[:3] == [True] * 3
+    assert [i for i, ok in enumerate(passed[3:], start=4) if ok] == [8, 13, 18]
+    assert sampler.dropped == 12
+
+
+def test_sampling_only_touches_marked_info_records():
+    sampler = SamplingFilter(burst=0, every=1000)
+    
+    assert all(sampler.filter(_record(sampled=False)) for _ in range(50))
+    assert all(sampler.filter(_record(level=logging.WARNING)) for _ in range(50))
+    assert sampler.dropped == 0
+
+
+def test_sampling_counts_each_source_line_and_window_separately():
+    sampler = SamplingFilter(burst=1, every=1000, window=60.0)
+    
+    assert sampler.filter(_record(lineno=1))
+    assert not sampler.filter(_record(lineno=1))
+    assert sampler.filter(_record(lineno=2))
+    assert sampler.filter(_record(lineno=1, created=1060.0))
+
+
+def test_sampling_counts_are_exact_under_concurrent_loggers():
+    sampler = SamplingFilter(burst=10, every=7)
+    passed = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(8)
+    
+    def log_many():
+        barrier.wait()
+        ok = sum(sampler.filter(_record()) for _ in range(2000))
+        with lock:
+            passed.append(ok)
+    
+    threads = [threading.Thread(target=log_many) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    
+    total = 8 * 2000
+    assert sum(passed) == 10 + (total - 10) // 7
+    assert sum(passed) + sampler.dropped == total
+
+
+def test_json_formatter_keeps_extra_fields():
+    line = JsonFormatter().format(_record(thread_id='t1', latency=0.25))
+    data = json.loads(line)
+    
+    assert data['msg'] == 'olay x'
+    assert data['level'] == 'INFO'
+    assert data['thread_id'] == 't1'
+    assert data['latency'] == 0.25
+    assert 'sampled' not in data
+
+
+def test_queue_handler_drops_instead_of_blocking_when_full():
+    log_queue = queue.Queue(1)
+    handler = NonBlockingQueueHandler(log_queue)
+    
+    handler.handle(_record(sampled=False))
+    handler.handle(_record(sampled=False))
+    
+    assert log_queue.qsize() == 1
+
+
+def test_rotation_compresses_old_file(tmp_path):
+    path = tmp_path / 'bot.log'
+    handler = CompressingRotatingFileHandler(str(path), max_bytes=200, interval=0, backup_count=2)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    try:
+        for _ in range(100):
+            handler.emit(_record(sampled=False))
+    finally:
+        handler.close()
+    
+    rotated = tmp_path / 'bot.log.1.gz'
+    assert rotated.exists()
+    with gzip.open(rotated, 'rt', encoding='utf-8') as f:
+        assert 'olay x' in f.read()
+    assert not (tmp_path / 'bot.log.3.gz').exists()
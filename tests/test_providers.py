@@ -0,0 +1,230 @@
+"""DataProvider: istek birleştirme (single-flight), RSS akış ayrıştırma ve koşullu çekim"""
+import asyncio
+import threading
+import time
+
+import pytest
+import requests
+
+from instagram_ai.models import NewsItem
+from instagram_ai.providers import DataProvider, SingleFlight
+
+
+def _wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    release = threading.Event()
+    executions = []
+    results = []
+    
+    def fetch():
+        executions.append(1)
+        release.wait(5)
+        return {'temp': 12}
+    
+    def caller():
+        results.append(flight.do('hava:izmir', fetch))
+    
+    threads = [threading.Thread(target=caller) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    _wait_until(lambda: flight.stats['calls'] == 8)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    
+    assert executions == [1]
+    assert results == [{'temp': 12}] * 8
+    assert flight.stats == {'calls': 8, 'executions': 1, 'deduplicated': 7, 'errors': 0}
+
+
+def test_error_reaches_every_waiter_and_is_not_cached():
+    flight = SingleFlight()
+    release = threading.Event()
+    errors = []
+    
+    def fetch():
+        release.wait(5)
+        raise ConnectionError("upstream down")
+    
+    def caller():
+        try:
+            flight.do('news', fetch)
+        except ConnectionError as e:
+            errors.append(e)
+    
+    threads = [threading.Thread(target=caller) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    _wait_until(lambda: flight.stats['calls'] == 4)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    
+    assert len(errors) == 4
+    assert flight.stats['errors'] == 1
+    assert flight.do('news', lambda: 'ok') == 'ok'
+
+
+def test_different_keys_and_sequential_calls_are_not_merged():
+    flight = SingleFlight()
+    
+    assert flight.do('a', lambda: 1) == 1
+    assert flight.do('a', lambda: 2) == 2
+    assert flight.do('b', lambda: 3) == 3
+    assert flight.stats['executions'] == 3
+    assert flight.stats['deduplicated'] == 0
+
+
+def test_async_callers_share_one_execution():
+    flight = SingleFlight()
+    executions = []
+    
+    def fetch():
+        executions.append(1)
+        time.sleep(0.05)
+        return 'kurlar'
+    
+    async def main():
+        return await asyncio.gather(*(flight.do_async('exchange', fetch) for _ in range(5)))
+    
+    assert asyncio.run(main()) == ['kurlar'] * 5
+    assert executions == [1]
+
+
+def test_async_error_is_raised_to_all_callers():
+    flight = SingleFlight()
+    
+    def fetch():
+        raise TimeoutError("yavaş")
+    
+    async def main():
+        return await asyncio.gather(*(flight.do_async('exchange', fetch) for _ in range(3)),
+                                    return_exceptions=True)
+    
+    results = asyncio.run(main())
+    assert all(isinstance(result, TimeoutError) for result in results)
+    with pytest.raises(TimeoutError):
+        asyncio.run(flight.do_async('exchange', fetch))
+
+
+# ---- RSS ----
+
+RSS = (
+    '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>Kanal</title>'
+    + ''.join(f'<item><title>Haber {i}</title><link>https://ornek.com/{i}</link></item>' for i in range(10))
+    + '</channel></rss>'
+).encode('utf-8')
+
+ATOM = (
+    b'<?xml version="1.0"?><feed xmlns="http://www.w3.org/2005/Atom">'
+    b'<entry><title>Atom haberi</title><link href="https://ornek.com/atom"/></entry></feed>'
+)
+
+
+def _pieces(data, size=16):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class _Response:
+    def __init__(self, status_code, body=b'', headers=None):
+        self.status_code = status_code
+        self.body = body
+        self.headers = headers or {}
+    
+    def iter_content(self, chunk_size):
+        return iter(_pieces(self.body, 64))
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+
+
+@pytest.fixture
+def feeds(monkeypatch):
+    """Sahte HTTP: her çağrıda sıradaki cevabı verir, istek başlıklarını kaydeder"""
+    DataProvider.clear_feeds()
+    responses, requests_made = [], []
+    
+    def fake_get(url, headers=None, timeout=None, stream=False):
+        requests_made.append(dict(headers or {}))
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+    
+    monkeypatch.setattr(requests, 'get', fake_get)
+    yield responses, requests_made
+    DataProvider.clear_feeds()
+
+
+def test_parse_feed_stops_after_limit():
+    consumed = []
+    
+    def chunks():
+        for piece in _pieces(RSS):
+            consumed.append(piece)
+            yield piece
+    
+    items = DataProvider._parse_feed(chunks(), 3)
+    assert items == tuple(NewsItem(f'Haber {i}', f'https://ornek.com/{i}') for i in range(3))
+    assert sum(map(len, consumed)) < len(RSS)
+
+
+def test_parse_feed_reads_atom_links():
+    assert DataProvider._parse_feed(_pieces(ATOM), 5) == (NewsItem('Atom haberi', 'https://ornek.com/atom'),)
+
+
+def test_parse_feed_falls_back_on_broken_xml():
+    broken = RSS.replace(b'<title>Kanal</title>', b'<title>Kanal &nbsp; </title>')
+    items = DataProvider._parse_feed(_pieces(broken), 2)
+    assert [item.title for item in items] == ['Haber 0', 'Haber 1']
+
+
+def test_conditional_fetch_reuses_items_on_304(feeds):
+    responses, requests_made = feeds
+    responses += [
+        _Response(200, RSS, {'ETag': '"v1"', 'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'}),
+        _Response(304),
+    ]
+    
+    first = DataProvider._fetch_feed('https://ornek.com/rss')
+    second = DataProvider._fetch_feed('https://ornek.com/rss')
+    
+    assert len(first) == DataProvider.NEWS_PER_SOURCE
+    assert second == first
+    assert requests_made == [{}, {'If-None-Match': '"v1"',
+                                  'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT'}]
+
+
+def test_failed_fetch_keeps_last_items(feeds):
+    responses, _ = feeds
+    responses += [_Response(200, RSS, {'ETag': '"v1"'}), _Response(500), requests.ConnectionError("kapalı")]
+    
+    first = DataProvider._fetch_feed('https://ornek.com/rss')
+    assert DataProvider._fetch_feed('https://ornek.com/rss') == first
+    assert DataProvider._fetch_feed('https://ornek.com/rss') == first
+    assert DataProvider._fetch_feed('https://baska.com/rss') == ()
+
+
+def test_news_pool_is_created_on_first_use_and_shut_down(feeds, monkeypatch):
+    responses, _ = feeds
+    monkeypatch.setattr(DataProvider, 'NEWS_SOURCES', ('https://a.com/rss', 'https://b.com/rss'))
+    DataProvider.shutdown()
+    assert DataProvider._news_pool is None
+    
+    responses += [_Response(200, RSS), _Response(200, ATOM)]
+    news = DataProvider._fetch_news()
+    assert DataProvider._news_pool is not None
+    assert len(news) == DataProvider.NEWS_PER_SOURCE + 1
+    
+    DataProvider.shutdown()
+    assert DataProvider._news_pool is None
@@ -0,0 +1,104 @@
+"""Soru bankası: yükleme, tekrarsız tekdüze çekiliş ve bankanın tükenmesi"""
+import random
+from collections import Counter
+
+import pytest
+
+from instagram_ai.config import Config
+from instagram_ai.games import GameEngine
+from instagram_ai.questions import Question, QuestionBank, _select_bit
+
+
+def _bank(ids, category='genel', difficulty=1):
+    return QuestionBank([Question(i, category, difficulty, f"Soru {i}", ('a', 'b'), 0) for i in ids])
+
+
+def test_shipped_bank_loads_with_valid_answers():
+    bank = QuestionBank.load(Config.QUESTIONS_FILE)
+    
+    assert len(bank.questions) > 0
+    for question_id, question in bank.questions.items():
+        assert question.id == question_id
+        assert 0 <= question.answer < len(question.options)
+        assert question.difficulty in QuestionBank.DIFFICULTIES.values()
+
+
+def test_duplicate_ids_are_rejected(tmp_path):
+    path = tmp_path / 'questions.tsv'
+    path.write_text("1\tgenel\t1\tA?\tx|y\t0\n1\tgenel\t1\tB?\tx|y\t1\n", encoding='utf-8')
+    with pytest.raises(ValueError):
+        QuestionBank.load(str(path))
+
+
+def test_draws_do_not_repeat_until_pool_is_exhausted():
+    bank = _bank(range(20))
+    seen = 0
+    drawn = []
+    for _ in range(20):
+        question = bank.draw(seen)
+        drawn.append(question.id)
+        seen |= 1 << question.id
+    
+    assert sorted(drawn) == list(range(20))
+    assert bank.draw(seen) is None
+
+
+def test_pools_filter_by_category_and_difficulty():
+    bank = QuestionBank([
+        Question(0, 'tarih', 1, 'A', ('x',), 0),
+        Question(1, 'tarih', 3, 'B', ('x',), 0),
+        Question(2, 'spor', 3, 'C', ('x',), 0),
+    ])
+    
+    assert bank.draw(0, 'tarih', 3).id == 1
+    assert bank.draw(0, 'spor').id == 2
+    assert bank.draw(1 << 1, 'tarih', 3) is None
+    assert bank.draw(0, 'bilim') is None
+
+
+@pytest.mark.parametrize('seen_ids', [(), tuple(range(3, 200))])
+def test_draw_is_uniform_over_free_questions(seen_ids):
+    # İkinci durumda boş oran çok düşük: sıra seçimi yolu kullanılır
+    random.seed(7)
+    bank = _bank(range(200))
+    seen = sum(1 << i for i in seen_ids)
+    free = [i for i in range(200) if i not in seen_ids]
+    
+    draws = 300 * len(free)
+    counts = Counter(bank.draw(seen).id for _ in range(draws))
+    assert set(counts) == set(free)
+    expected = draws / len(free)
+    assert all(abs(count - expected) < 0.35 * expected for count in counts.values())
+
+
+def test_select_bit_across_words():
+    value = (1 << 3) | (1 << 64) | (1 << 130)
+    assert [_select_bit(value, rank) for rank in range(3)] == [3, 64, 130]
+
+
+def test_exhausting_the_bank_resets_seen(db, monkeypatch):
+    monkeypatch.setattr(QuestionBank, '_default', _bank(range(3)))
+    engine = GameEngine(db)
+    
+    asked = []
+    for _ in range(4):
+        engine.start_quiz(7)
+        asked.append(engine.games.get(7).question)
+    
+    assert sorted(asked[:3]) == [0, 1, 2]
+    assert asked[3] in (0, 1, 2)
+    # Sıfırlanan küme yalnızca son soruyu içerir ve kalıcıdır
+    assert engine._quiz_seen[7] == 1 << asked[3]
+    assert db.get_quiz_seen(7) == 1 << asked[3]
+
+
+def test_seen_questions_survive_restart(open_db, monkeypatch):
+    monkeypatch.setattr(QuestionBank, '_default', _bank(range(2)))
+    db = open_db()
+    GameEngine(db).start_quiz(7)
+    first = GameEngine(db).games.get(7).question
+    db.shutdown()
+    
+    engine = GameEngine(open_db())
+    engine.start_quiz(7)
+    assert engine.games.get(7).question == 1 - first
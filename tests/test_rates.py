@@ -0,0 +1,120 @@
+"""Kur geçmişi: halka tampon, kalıcılık ve kilitsiz okuyucuların yarım kayıt görmemesi"""
+import threading
+
+import pytest
+
+from instagram_ai.rates import RateHistory
+
+
+@pytest.fixture
+def history(tmp_path, clock):
+    opened = []
+    
+    def factory(capacity=8, currencies=('USD', 'EUR')):
+        history = RateHistory(str(tmp_path / 'rates.bin'), currencies, capacity, clock)
+        opened.append(history)
+        return history
+    
+    yield factory
+    for history in opened:
+        history.close()
+
+
+def _fill(history, clock, count):
+    for i in range(count):
+        history.record({'USD': 30.0 + i, 'EUR': 35.0 + i})
+        clock.advance(60)
+
+
+def test_close_samples_overwrite_the_last_record(history, clock):
+    rates = history()
+    assert rates.latest() == (None, {})
+    
+    assert rates.record({'USD': 30.0, 'EUR': 35.0})
+    clock.advance(30)
+    assert not rates.record({'USD': 31.0})
+    
+    assert len(rates) == 1
+    assert rates.latest() == (clock.time(), {'USD': 31.0, 'EUR': 35.0})
+
+
+def test_ring_buffer_keeps_newest_records_in_order(history, clock):
+    rates = history(capacity=8)
+    _fill(rates, clock, 11)
+    
+    times, values = rates.series('USD')
+    assert rates.total == 11
+    assert list(values) == [33.0 + i for i in range(8)]
+    assert list(times) == sorted(times)
+    
+    _, recent = rates.series('USD', seconds=3 * 60)
+    assert list(recent) == [38.0, 39.0, 40.0]
+
+
+def test_stats_over_window(history, clock):
+    rates = history()
+    _fill(rates, clock, 5)
+    
+    stats = rates.stats('EUR', seconds=3600, window=2)
+    assert stats['last'] == 39.0
+    assert stats['change'] == 4.0
+    assert stats['min'] == 35.0 and stats['max'] == 39.0
+    assert stats['avg'] == 37.0
+    assert stats['moving_avg'] == 38.5
+    assert stats['samples'] == 5
+    assert rates.stats('EUR', seconds=60, now=clock.time() + 3600) is None
+
+
+def test_history_survives_reopen_and_resets_on_layout_change(history, clock):
+    _fill(history(), clock, 3)
+    assert history().total == 3
+    assert history(currencies=('USD', 'GBP')).total == 0
+
+
+def test_torn_slot_is_skipped_by_readers(history, clock):
+    rates = history()
+    _fill(rates, clock, 4)
+    
+    # Son yuvaya yazılıyor: sıra numarası tek
+    rates._seqs[3] += 1
+    _, values = rates.series('USD')
+    assert list(values) == [30.0, 31.0, 32.0]
+    assert rates.latest()[1]['USD'] == 32.0
+    
+    # Yazarken ölen süreç: yeniden açılışta yuva tamamlanmış sayılır
+    assert history().latest()[1]['USD'] == 33.0
+
+
+def test_concurrent_readers_never_see_half_written_records(history, clock):
+    rates = history(capacity=16, currencies=('USD',))
+    stop = threading.Event()
+    errors = []
+    
+    def write():
+        ts = clock.time()
+        while not stop.is_set():
+            ts += 60
+            rates.record({'USD': ts}, ts)
+    
+    def read():
+        for _ in range(2000):
+            times, values = rates.series('USD')
+            if list(times) != list(values) or list(times) != sorted(times):
+                errors.append((list(times), list(values)))
+            ts, latest = rates.latest()
+            if ts is not None and latest['USD'] != ts:
+                errors.append((ts, latest))
+    
+    writer = threading.Thread(target=write)
+    writer.start()
+    try:
+        readers = [threading.Thread(target=read) for _ in range(2)]
+        for t in readers:
+            t.start()
+        for t in readers:
+            t.join()
+    finally:
+        stop.set()
+        writer.join()
+    
+    assert errors == []
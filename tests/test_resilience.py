@@ -0,0 +1,118 @@
+"""Hata sınıfı bazında geri çekilme, gönderim kovası ve hata izolasyonu"""
+import random
+
+import pytest
+from instagrapi.exceptions import ClientError, LoginRequired, PleaseWaitFewMinutes
+from requests.exceptions import ReadTimeout
+
+from instagram_ai.config import Config
+from instagram_ai.resilience import (AUTH, CLIENT, CONNECTION, THROTTLE, UNEXPECTED, Backoff,
+                                     FailureIsolator, TokenBucket, classify_error)
+
+
+@pytest.mark.parametrize('error, expected', [
+    (ReadTimeout(), CONNECTION),
+    (PleaseWaitFewMinutes('bekle'), THROTTLE),
+    (LoginRequired('oturum'), AUTH),
+    (ClientError('hata'), CLIENT),
+    (KeyError('kod'), UNEXPECTED),
+])
+def test_errors_map_to_backoff_classes(error, expected):
+    assert classify_error(error) == expected
+
+
+def test_backoff_grows_per_class_and_resets_on_success(monkeypatch):
+    monkeypatch.setattr(random, 'uniform', lambda low, high: high)
+    backoff = Backoff({CONNECTION: (1.0, 8.0), THROTTLE: (60.0, 600.0), UNEXPECTED: (5.0, 5.0)})
+    
+    assert [backoff.failure(CONNECTION) for _ in range(5)] == [1.0, 2.0, 4.0, 8.0, 8.0]
+    assert backoff.failure(THROTTLE) == 60.0
+    assert backoff.failure('unknown') == 5.0
+    
+    backoff.success()
+    assert backoff.failure(CONNECTION) == 1.0
+
+
+def test_backoff_jitter_stays_within_upper_half():
+    backoff = Backoff({UNEXPECTED: (10.0, 10.0)})
+    delays = [backoff.failure(UNEXPECTED) for _ in range(200)]
+    assert all(5.0 <= d <= 10.0 for d in delays)
+    assert len(set(delays)) > 1
+
+
+def test_token_bucket_allows_burst_then_refills(clock):
+    bucket = TokenBucket(rate=2.0, burst=3, clock=clock)
+    
+    assert [bucket.try_acquire() for _ in range(4)] == [True, True, True, False]
+    clock.advance(0.5)
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+    clock.advance(100)
+    assert bucket.available == 3
+
+
+def test_token_bucket_acquire_waits_for_next_token(clock):
+    bucket = TokenBucket(rate=0.5, burst=1, clock=clock)
+    start = clock.time()
+    
+    bucket.acquire()
+    bucket.acquire()
+    
+    assert clock.time() - start == pytest.approx(2.0)
+
+
+def test_poison_message_is_quarantined_and_persists(open_db):
+    db = open_db()
+    isolator = FailureIsolator(db)
+    error = ValueError('bozuk')
+    
+    results = [isolator.message_failed('m1', 't1', 7, 'metin', error)
+               for _ in range(Config.POISON_THRESHOLD)]
+    
+    assert results == [False] * (Config.POISON_THRESHOLD - 1) + [True]
+    assert isolator.is_quarantined('m1')
+    letter = db.get_dead_letters()[0]
+    assert letter['message_id'] == 'm1'
+    assert letter['attempts'] == Config.POISON_THRESHOLD
+    assert 'ValueError' in letter['error']
+    assert FailureIsolator(db).is_quarantined('m1')
+
+
+def test_success_clears_message_failures(db):
+    isolator = FailureIsolator(db)
+    for _ in range(Config.POISON_THRESHOLD - 1):
+        isolator.message_failed('m1', 't1', 7, 'metin', ValueError())
+    isolator.message_succeeded('m1')
+    
+    assert not isolator.message_failed('m1', 't1', 7, 'metin', ValueError())
+
+
+def test_failing_thread_is_skipped_without_blocking_others(db, clock):
+    isolator = FailureIsolator(db)
+    
+    delay = isolator.thread_failed('t1')
+    assert not isolator.thread_ready('t1')
+    assert isolator.thread_ready('t2')
+    assert isolator.backed_off_threads() == 1
+    
+    clock.advance(delay)
+    assert isolator.thread_ready('t1')
+    assert isolator.backed_off_threads() == 0
+    
+    second = isolator.thread_failed('t1')
+    base, cap = Config.BACKOFF_POLICIES[CLIENT]
+    assert min(cap, base * 2) / 2 <= second <= min(cap, base * 2)
+    isolator.thread_succeeded('t1')
+    assert isolator.thread_ready('t1')
+
+
+def test_isolator_state_round_trip(db):
+    isolator = FailureIsolator(db)
+    isolator.message_failed('m1', 't1', 7, 'metin', ValueError())
+    isolator.thread_failed('t1')
+    
+    restored = FailureIsolator(db)
+    restored.load_state(isolator.dump_state())
+    
+    assert restored.dump_state() == isolator.dump_state()
+    assert not restored.thread_ready('t1')
@@ -0,0 +1,149 @@
+"""Artımlı toplam sayaçları: top-K, aktivite kovaları ve yeniden kurma"""
+import sqlite3
+
+from instagram_ai.config import Config
+
+
+def _traffic(db, clock, logged=True):
+    """Üç kullanıcı, iki saate yayılmış mesajlar; `logged=False` mesaj günlüğünü atlar (kademeli mod)"""
+    for user_id, name, messages in ((1, 'ali', 5), (2, 'veli', 3), (3, 'ayşe', 1)):
+        db.create_user(user_id, name)
+        for i in range(messages):
+            db.update_user_stats(user_id, 'message_count')
+            if logged or i % 2 == 0:
+                db.log_message(user_id, 'fıkra', 'cevap', 'fikra')
+            clock.advance(900)
+    db.update_user_stats(2, 'game_wins', 2)
+
+
+def _state(db):
+    rollups = db.rollups
+    return (rollups.top_users('message_count'), rollups.top('commands'), rollups.top('game_wins'),
+            rollups.total('totals', 'users'), rollups.activity('hour'), rollups.activity('day'))
+
+
+def test_counters_follow_journal_events(db, clock):
+    _traffic(db, clock)
+    rollups = db.rollups
+    
+    assert rollups.top_users('message_count') == [('1', 'ali', 5), ('2', 'veli', 3), ('3', 'ayşe', 1)]
+    assert rollups.top('commands') == [('fikra', 9)]
+    assert rollups.top('game_wins') == [('2', 2)]
+    assert rollups.total('totals', 'users') == 3
+    assert sum(count for _, count in rollups.activity('hour')) == 9
+    assert sum(count for _, count in rollups.activity('day')) == 9
+
+
+def test_increments_are_buffered_until_flush(db, clock):
+    rollups = db.rollups
+    rollups.flush()
+    db.create_user(1, 'ali')
+    db.update_user_stats(1, 'message_count')
+    
+    assert rollups.pending > 0
+    assert rollups.total('message_count', 1) == 1   # bekleyen artış dahil
+    assert db.conn.execute('SELECT COUNT(*) FROM rollup_counters').fetchone()[0] == 0
+    
+    clock.advance(rollups.FLUSH_INTERVAL)
+    db.update_user_stats(1, 'message_count')
+    assert rollups.pending == 0
+    assert db.conn.execute(
+        "SELECT value FROM rollup_counters WHERE metric = 'message_count'"
+    ).fetchone()[0] == 2
+
+
+def _drop_rollups():
+    conn = sqlite3.connect(Config.DB_FILE)
+    conn.execute('DELETE FROM rollup_counters')
+    conn.execute('DELETE FROM activity_buckets')
+    conn.execute('DELETE FROM rollup_state')
+    conn.commit()
+    conn.close()
+
+
+def test_rebuild_matches_incremental_counts(open_db, clock):
+    db = open_db()
+    _traffic(db, clock, logged=False)
+    incremental = _state(db)
+    db.shutdown()
+    
+    _drop_rollups()
+    rebuilt = _state(open_db())
+    assert rebuilt == incremental
+    # Mesaj günlüğü atlansa da aktivite tüm mesajları sayar
+    assert sum(count for _, count in rebuilt[4]) == 9
+
+
+def test_rebuild_of_legacy_database_uses_messages_table(open_db, clock, tmp_path):
+    db = open_db()
+    _traffic(db, clock)
+    incremental = _state(db)
+    db.shutdown()
+    
+    # Günlük öncesi veritabanı: yalnızca ham tablolar
+    for path in (tmp_path / 'journal').iterdir():
+        path.unlink()
+    _drop_rollups()
+    assert _state(open_db()) == incremental
+
+
+def test_unflushed_increments_are_replayed_after_crash(open_db, clock):
+    db = open_db()
+    db.create_user(1, 'ali')
+    db.rollups.flush()
+    for _ in range(3):
+        db.update_user_stats(1, 'message_count')
+    assert db.rollups.pending > 0
+    
+    # Çökme: günlük diskte, tampondaki artışlar ve anlık görüntü yazılmadı
+    db.journal.sync()
+    db.journal._file.close()
+    
+    db = open_db()
+    assert db.rollups.total('message_count', 1) == 3
+    db.shutdown()
+    
+    assert open_db().rollups.total('message_count', 1) == 3
+
+
+def test_each_journal_keeps_its_own_watermark(open_db, clock, tmp_path, monkeypatch):
+    # Küme modu: roller aynı veritabanını, ayrı günlük dizinlerini kullanır
+    monkeypatch.setattr(Config, 'JOURNAL_DIR', str(tmp_path / 'journal' / 'poller'))
+    poller = open_db()
+    poller.create_user(1, 'ali')
+    for _ in range(20):
+        poller.update_user_stats(1, 'message_count')
+    poller.shutdown()
+    
+    monkeypatch.setattr(Config, 'JOURNAL_DIR', str(tmp_path / 'journal' / 'worker'))
+    worker = open_db()
+    worker.create_user(2, 'veli')
+    worker.rollups.flush()
+    for _ in range(3):
+        worker.update_user_stats(2, 'message_count')
+    worker.journal.sync()
+    worker.journal._file.close()
+    
+    # İşçinin günlüğü, çekicinin su seviyesinin gerisinde olsa da kendi yerinden oynatılır
+    worker = open_db()
+    assert worker.rollups.total('message_count', 2) == 3
+    assert worker.rollups.total('message_count', 1) == 20
+    with worker.lock:
+        names = dict(worker.conn.execute('SELECT name, value FROM rollup_state'))
+    assert set(names) == {'journal_seq:poller', 'journal_seq:worker'}
+
+
+def test_legacy_shared_watermark_is_dropped(open_db):
+    db = open_db()
+    db.create_user(1, 'ali')
+    db.shutdown()
+    conn = sqlite3.connect(Config.DB_FILE)
+    conn.execute("INSERT INTO rollup_state (name, value) VALUES ('journal_seq', 999)")
+    conn.commit()
+    conn.close()
+    
+    db = open_db()
+    with db.lock:
+        names = [name for name, in db.conn.execute('SELECT name FROM rollup_state')]
+    assert names == ['journal_seq:journal']
+    assert db.rollups.total('totals', 'users') == 1
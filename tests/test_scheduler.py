@@ -0,0 +1,76 @@
+"""Adil zamanlayıcı: kullanıcılar arasında DRR, sınıf ağırlıkları ve açlık koruması"""
+from collections import Counter
+
+import pytest
+
+from instagram_ai.scheduler import ADMIN, CHEAP, NETWORK, FairScheduler
+
+
+@pytest.fixture
+def scheduler(clock):
+    return FairScheduler(weights={ADMIN: 16, CHEAP: 8, NETWORK: 1}, quantum=0.05, max_wait=0, clock=clock)
+
+
+def test_busy_user_does_not_delay_others(scheduler):
+    # Her iş bir kuantum sürer: kullanıcı başına turda bir iş
+    for i in range(20):
+        scheduler.push(1, ('flood', i), CHEAP, cost=0.05)
+    scheduler.push(2, ('quiet', 0), CHEAP, cost=0.05)
+    scheduler.push(3, ('quiet', 1), CHEAP, cost=0.05)
+    
+    order = [item for _, item in scheduler.drain()]
+    assert order.index(('quiet', 0)) <= 2
+    assert order.index(('quiet', 1)) <= 2
+    assert [item for item in order if item[0] == 'flood'] == [('flood', i) for i in range(20)]
+
+
+def test_service_time_is_shared_by_cost(scheduler):
+    # Kullanıcı 1 pahalı (0.1 s), kullanıcı 2 ucuz (0.01 s) işler gönderir
+    for i in range(50):
+        scheduler.push(1, (1, i), CHEAP, cost=0.1)
+        scheduler.push(2, (2, i), CHEAP, cost=0.01)
+    
+    served = Counter()
+    for _ in range(40):
+        _, (user_id, _) = scheduler.pop()
+        served[user_id] += 0.1 if user_id == 1 else 0.01
+    
+    assert served[1] == pytest.approx(served[2], rel=0.35)
+
+
+def test_weighted_user_gets_larger_share(scheduler):
+    for i in range(40):
+        scheduler.push(1, 1, CHEAP, cost=0.05, weight=3.0)
+        scheduler.push(2, 2, CHEAP, cost=0.05, weight=1.0)
+    
+    counts = Counter(scheduler.pop()[1] for _ in range(40))
+    assert counts[1] == 30
+    assert counts[2] == 10
+
+
+def test_classes_are_served_by_weight(scheduler):
+    for i in range(100):
+        scheduler.push(i, i, CHEAP)
+        scheduler.push(i, i, NETWORK)
+    
+    classes = Counter(scheduler.pop()[0] for _ in range(90))
+    assert classes[CHEAP] == 80
+    assert classes[NETWORK] == 10
+
+
+def test_admin_goes_first(scheduler):
+    scheduler.push(5, 'cheap', CHEAP)
+    scheduler.push(1, 'admin', ADMIN)
+    
+    assert scheduler.pop() == (ADMIN, 'admin')
+
+
+def test_long_waiting_job_is_promoted(clock):
+    scheduler = FairScheduler(weights={ADMIN: 16, CHEAP: 8, NETWORK: 1}, quantum=0.05, max_wait=20, clock=clock)
+    scheduler.push(1, 'slow', NETWORK)
+    clock.advance(25)
+    for i in range(10):
+        scheduler.push(i + 2, i, CHEAP)
+    
+    assert scheduler.pop() == (NETWORK, 'slow')
+    assert scheduler.stats[NETWORK]['promoted'] == 1
@@ -0,0 +1,89 @@
+"""Engel listesi: bellekten kontrol, günlükle senkron, süreli engeller ve erken reddetme"""
+import pytest
+
+from instagram_ai import bot as bot_module
+from instagram_ai.bot import InstagramAIBot
+from instagram_ai.config import Config
+from instagram_ai.models import IncomingMessage
+from instagram_ai.security import SecurityManager
+
+
+class FakeClient:
+    user_id = 1
+    
+    def __init__(self):
+        self.sent = []
+    
+    def direct_send(self, text, thread_ids):
+        self.sent.append((thread_ids[0], text))
+
+
+@pytest.fixture
+def bot(db, clock, monkeypatch):
+    monkeypatch.setattr(Config, 'CHECKPOINT_FILE', '')
+    monkeypatch.setattr(Config, 'COMMENT_REPLIES', False)
+    bot = InstagramAIBot(clock)
+    bot.__dict__['db'] = db
+    bot.__dict__['client'] = FakeClient()
+    return bot
+
+
+def test_blocklist_loads_from_database_and_follows_the_journal(open_db):
+    db = open_db()
+    db.block_user(7)
+    security = SecurityManager(db)
+    assert security.is_user_blocked(7)
+    
+    # Başka bir yoldan yapılan engel de günlük olayıyla kümeye yansır
+    db.block_user(8)
+    assert security.is_user_blocked(8)
+    security.unblock_user(7)
+    assert not security.is_user_blocked(7)
+    assert db.get_blocked_users() == {8: None}
+
+
+def test_timed_block_is_lifted_on_first_message_after_expiry(db, clock):
+    security = SecurityManager(db)
+    security.block_user(7, 600)
+    
+    clock.advance(599)
+    assert security.is_user_blocked(7)
+    clock.advance(1)
+    assert not security.is_user_blocked(7)
+    assert db.get_blocked_users() == {}
+    assert 7 not in security.blocklist.entries()
+
+
+def test_block_survives_restart(open_db):
+    SecurityManager(open_db()).block_user(7)
+    assert SecurityManager(open_db()).is_user_blocked(7)
+
+
+def test_blocked_user_is_rejected_before_any_database_work(bot, monkeypatch):
+    bot.security.block_user(7)
+    monkeypatch.setattr(bot.db, 'create_user', lambda *a: pytest.fail("create_user called"))
+    monkeypatch.setattr(bot.security, 'detect_spam', lambda *a: pytest.fail("detect_spam called"))
+    
+    assert bot.process_message(7, 'spam', 'merhaba') is None
+
+
+def test_blocked_sender_is_skipped_before_classification(bot, monkeypatch):
+    classified = []
+    real_classify = bot_module.classify
+    
+    def spy(bot, user_id, text):
+        classified.append(user_id)
+        return real_classify(bot, user_id, text)
+    
+    monkeypatch.setattr(bot_module, 'classify', spy)
+    bot.security.block_user(7)
+    
+    processed = bot.handle_messages([
+        IncomingMessage('m1', 't7', 7, 'spam', '/yardım'),
+        IncomingMessage('m2', 't8', 8, 'ali', '/yardım'),
+    ])
+    
+    assert processed == 1
+    assert classified == [8]
+    assert [thread for thread, _ in bot.client.sent] == ['t8']
+    assert 'm1' in bot.answered_messages
@@ -0,0 +1,113 @@
+"""Sanal saat, sentetik trafik, sahte istemci ve uçtan uca simülasyon"""
+import json
+import random
+import subprocess
+import sys
+import threading
+
+import pytest
+from instagrapi.exceptions import PleaseWaitFewMinutes
+
+from instagram_ai.clock import VirtualClock
+from instagram_ai.simulator import FakeClient, SimMessage, generate_traffic
+
+ROOT = __file__.rsplit('/tests/', 1)[0]
+
+
+def test_driver_thread_sleep_advances_time():
+    clock = VirtualClock(100.0)
+    clock.sleep(5)
+    clock.advance(-3)
+    assert clock.time() == 105.0
+    assert clock.now().timestamp() == 105.0
+
+
+def test_background_sleep_waits_for_the_driver():
+    clock = VirtualClock(100.0)
+    woke = threading.Event()
+    
+    def background():
+        clock.sleep(30)
+        woke.set()
+    
+    thread = threading.Thread(target=background)
+    thread.start()
+    assert not woke.wait(0.05)
+    assert clock.time() == 100.0
+    
+    clock.advance(29)
+    assert not woke.wait(0.05)
+    clock.advance(1)
+    assert woke.wait(5)
+    thread.join(5)
+
+
+def test_traffic_is_reproducible_sorted_and_in_range():
+    first = generate_traffic(20, 10, 1, 0.0, rng=random.Random(3))
+    second = generate_traffic(20, 10, 1, 0.0, rng=random.Random(3))
+    
+    assert [(m.user_id, m.text, m.sent_at) for m in first] == [(m.user_id, m.text, m.sent_at) for m in second]
+    assert [m.sent_at for m in first] == sorted(m.sent_at for m in first)
+    assert 100 < len(first) < 350
+    assert {m.thread_id for m in first} <= {f"thread-{u}" for u in range(1000, 1020)}
+
+
+def test_fake_client_shows_messages_as_they_arrive(clock):
+    start = clock.time()
+    messages = [SimMessage('m0', 7, 't7', 'merhaba', start + 10),
+                SimMessage('m1', 7, 't7', 'fıkra', start + 20)]
+    client = FakeClient(clock, messages)
+    
+    assert client.direct_threads() == []
+    clock.advance(25)
+    threads = client.direct_threads()
+    assert [(t.id, t.messages[0].id) for t in threads] == [('t7', 'm1')]
+    
+    client.direct_send('cevap', ['t7'])
+    assert [m.replied_at for m in messages] == [start + 25] * 2
+    assert client.superseded == 1
+    assert client.direct_threads()[0].messages[0].user_id == client.user_id
+
+
+def test_fake_client_throttles_over_hourly_limit(clock):
+    client = FakeClient(clock, [], api_limit=2)
+    client.direct_threads()
+    client.direct_threads()
+    
+    with pytest.raises(PleaseWaitFewMinutes):
+        client.direct_threads()
+    assert client.throttle_events == 1
+    
+    clock.advance(3600)
+    client.direct_threads()
+
+
+def test_fake_client_stops_the_run_at_the_end(clock):
+    finished = []
+    client = FakeClient(clock, [], until=clock.time() + 60)
+    client.on_finish = lambda: finished.append(True)
+    
+    client.direct_threads()
+    clock.advance(60)
+    assert client.direct_threads() == []
+    assert finished == [True]
+
+
+def test_simulated_traffic_is_fully_answered(tmp_path):
+    code = (
+        "import sys, json, logging\n"
+        "sys.path.insert(0, %r)\n"
+        "logging.disable(logging.CRITICAL)\n"
+        "from instagram_ai import Config\n"
+        "from instagram_ai.simulator import Simulator\n"
+        "Config.CONTROL_SOCKET = ''\n"
+        "print(json.dumps(Simulator(%r, users=10, messages_per_day=20, days=0.25, seed=1).run()))\n"
+    ) % (ROOT, str(tmp_path))
+    result = subprocess.run([sys.executable, '-c', code], cwd=tmp_path,
+                            capture_output=True, text=True, check=True, timeout=300)
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    
+    assert report['messages'] > 0
+    assert report['unreplied'] == 0
+    assert report['throttle_events'] == 0
+    assert report['time_to_reply']['max_s'] <= 2 * max(report['check_interval']) + 60
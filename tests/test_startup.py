@@ -0,0 +1,87 @@
+"""Soğuk başlangıç: tembel içe aktarma ve LazyAttribute"""
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from instagram_ai.utils import LazyAttribute
+
+ROOT = __file__.rsplit('/tests/', 1)[0]
+
+
+def test_import_and_bot_construction_load_no_heavy_dependencies(tmp_path):
+    code = (
+        "import sys; sys.path.insert(0, %r)\n"
+        "from instagram_ai import InstagramAIBot\n"
+        "InstagramAIBot()\n"
+        "heavy = ('instagrapi', 'requests', 'bs4', 'pytz', 'aiohttp', 'sqlite3')\n"
+        "print(','.join(name for name in heavy if name in sys.modules))\n"
+    ) % ROOT
+    result = subprocess.run([sys.executable, '-c', code], cwd=tmp_path,
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ''
+
+
+def test_unknown_export_raises_attribute_error():
+    import instagram_ai
+    
+    assert instagram_ai.LazyAttribute is LazyAttribute
+    with pytest.raises(AttributeError):
+        instagram_ai.DoesNotExist
+
+
+class _Owner:
+    def __init__(self):
+        self.built = []
+        self.gate = threading.Event()
+    
+    @LazyAttribute
+    def slow(self):
+        self.built.append('slow')
+        self.gate.wait(5)
+        return object()
+    
+    @LazyAttribute
+    def fast(self):
+        self.built.append('fast')
+        return 'fast'
+
+
+def test_concurrent_first_access_builds_once():
+    owner = _Owner()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(owner.slow)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    owner.gate.set()
+    for thread in threads:
+        thread.join(5)
+    
+    assert owner.built == ['slow']
+    assert len({id(value) for value in results}) == 1
+    assert owner.slow is results[0]
+
+
+def test_building_one_attribute_does_not_block_another():
+    owner = _Owner()
+    builder = threading.Thread(target=lambda: owner.slow)
+    builder.start()
+    time.sleep(0.05)
+    
+    started = time.monotonic()
+    assert owner.fast == 'fast'
+    assert time.monotonic() - started < 1.0
+    owner.gate.set()
+    builder.join(5)
+
+
+def test_values_are_per_instance():
+    first, second = _Owner(), _Owner()
+    first.gate.set()
+    second.gate.set()
+    
+    assert first.slow is not second.slow
+    assert first.built == second.built == ['slow']
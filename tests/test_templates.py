@@ -0,0 +1,44 @@
+"""Önceden derlenmiş cevaplar: bir kez kurulum, parçalar ve kayıt defteri değişince yenileme"""
+from instagram_ai.chunker import MessageChunker
+from instagram_ai.commands import create_registry
+from instagram_ai.models import CommandCategory
+from instagram_ai.templates import Response, ResponseTemplate, create_templates
+
+
+def test_static_template_is_built_once_with_chunks(clock):
+    registry = create_registry(clock)
+    templates = create_templates(registry)
+    
+    first = templates.render('help')
+    second = templates.render('help')
+    assert first is second
+    assert isinstance(first, Response)
+    assert ''.join(first.chunks).replace('\n', '') == first.replace('\n', '')
+    assert templates.builds == 1
+
+
+def test_chunker_uses_precomputed_chunks():
+    response = Response("uzun cevap")
+    response.chunks = ('uzun', 'cevap')
+    assert list(MessageChunker(max_len=2000).chunks(response)) == ['uzun', 'cevap']
+
+
+def test_slotted_template_fills_values_per_request():
+    template = ResponseTemplate('info', "Süre: {uptime} | Mesaj: {total}", slots=('uptime', 'total'))
+    assert template.response is None
+    assert template.render(uptime='1s', total=5) == "Süre: 1s | Mesaj: 5"
+    assert template.render(uptime='2s', total=6) == "Süre: 2s | Mesaj: 6"
+
+
+def test_registry_change_rebuilds_templates(clock):
+    registry = create_registry(clock)
+    templates = create_templates(registry)
+    before = templates.render('help')
+    
+    registry.command('yeni komut', category=CommandCategory.UTILITIES,
+                     description='Yeni eklenen komut')(lambda bot, user_id, message: 'ok')
+    after = templates.render('help')
+    
+    assert templates.builds == 2
+    assert 'Yeni eklenen komut' in after
+    assert 'Yeni eklenen komut' not in before
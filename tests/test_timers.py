@@ -0,0 +1,105 @@
+"""Zamanlayıcı çarkı ve bellek içi oturum ömürleri"""
+from instagram_ai.timers import TimerWheel
+
+
+def test_keys_expire_at_their_deadline():
+    wheel = TimerWheel(tick=1.0, slots=8, start=100.0)
+    wheel.schedule('a', 102.5)
+    wheel.schedule('b', 105.0)
+    
+    assert wheel.advance(102.0) == []
+    assert wheel.advance(102.5) == ['a']
+    assert wheel.advance(104.9) == []
+    assert wheel.advance(105.0) == ['b']
+    assert len(wheel) == 0
+
+
+def test_deadlines_beyond_one_rotation_wait_for_their_turn():
+    wheel = TimerWheel(tick=1.0, slots=4, start=0.0)
+    wheel.schedule('far', 9.0)   # 'far' ile aynı yuvaya düşen erken tikler onu çıkarmamalı
+    
+    for now in range(1, 9):
+        assert wheel.advance(float(now)) == []
+    assert wheel.advance(9.0) == ['far']
+
+
+def test_long_gap_scans_each_slot_once():
+    wheel = TimerWheel(tick=1.0, slots=4, start=0.0)
+    for i in range(10):
+        wheel.schedule(i, float(i))
+    
+    assert sorted(wheel.advance(1000.0)) == list(range(10))
+
+
+def test_reschedule_and_cancel():
+    wheel = TimerWheel(tick=1.0, slots=8, start=0.0)
+    wheel.schedule('a', 2.0)
+    wheel.schedule('a', 6.0)
+    assert wheel.deadline('a') == 6.0
+    assert wheel.advance(3.0) == []
+    
+    assert wheel.cancel('a') is True
+    assert wheel.cancel('a') is False
+    assert 'a' not in wheel
+    assert wheel.advance(10.0) == []
+
+
+def test_past_deadline_expires_on_next_advance():
+    wheel = TimerWheel(tick=1.0, slots=8, start=50.0)
+    wheel.schedule('late', 10.0)
+    assert wheel.advance(50.0) == ['late']
+
+
+def test_going_backwards_expires_nothing():
+    wheel = TimerWheel(tick=1.0, slots=8, start=50.0)
+    wheel.schedule('a', 49.0)
+    assert wheel.advance(40.0) == []
+    assert 'a' in wheel
+
+
+# ---- Oturum ömürleri ----
+
+def test_session_lifetime_is_known_without_disk(db, clock):
+    db.set_session(7, 'game', {'t': 'x'}, ttl=60)
+    assert db.has_session(7)
+    assert db.session_count() == 1
+    
+    clock.advance(60)
+    assert not db.has_session(7)
+    assert db.get_session(7) is None
+
+
+def test_expired_sessions_are_purged_in_bulk_and_listeners_notified(db, clock):
+    expired = []
+    db.add_session_expiry_listener(expired.extend)
+    for user_id in range(5):
+        db.set_session(user_id, 'game', {}, ttl=30 + user_id * 30)
+    
+    clock.advance(95)
+    assert db.purge_expired_sessions() == 3
+    assert sorted(expired) == [0, 1, 2]
+    assert db.conn.execute('SELECT COUNT(*) FROM sessions').fetchone()[0] == 2
+
+
+def test_startup_drops_expired_rows_and_keeps_live_ones(open_db, clock):
+    db = open_db()
+    db.set_session(1, 'game', {}, ttl=10)
+    db.set_session(2, 'game', {}, ttl=1000)
+    db.shutdown()
+    
+    clock.advance(20)
+    db = open_db()
+    assert not db.has_session(1)
+    assert db.has_session(2)
+    assert [row[0] for row in db.conn.execute('SELECT user_id FROM sessions')] == [2]
+
+
+def test_cleared_session_is_not_purged_later(db, clock):
+    expired = []
+    db.add_session_expiry_listener(expired.extend)
+    db.set_session(1, 'game', {}, ttl=10)
+    db.clear_session(1)
+    
+    clock.advance(20)
+    assert db.purge_expired_sessions() == 0
+    assert expired == []
@@ -0,0 +1,109 @@
+"""İş kuyruğu: kira süresi, yeniden kiralama ve cevap tekrarının önlenmesi"""
+import pytest
+
+from instagram_ai.config import Config
+from instagram_ai.workqueue import LocalQueue
+
+
+@pytest.fixture
+def queue(tmp_path, clock, monkeypatch):
+    monkeypatch.setattr(Config, 'QUEUE_LEASE_TIMEOUT', 60.0)
+    monkeypatch.setattr(Config, 'POISON_THRESHOLD', 3)
+    queue = LocalQueue(str(tmp_path / 'queue.db'), clock)
+    yield queue
+    queue.close()
+
+
+def test_leased_message_is_hidden_until_lease_expires(queue, clock):
+    queue.put_messages([('m1', 't1', 7, 'ali', 'selam')])
+    
+    first = queue.lease_messages()
+    assert [m['message_id'] for m in first] == ['m1']
+    assert first[0]['attempts'] == 1
+    assert queue.lease_messages() == []
+    
+    clock.advance(59)
+    assert queue.lease_messages() == []
+    
+    clock.advance(1)
+    again = queue.lease_messages()
+    assert [m['message_id'] for m in again] == ['m1']
+    assert again[0]['attempts'] == 2
+
+
+def test_message_that_keeps_crashing_workers_goes_dead(queue, clock):
+    queue.put_messages([('m1', 't1', 7, 'ali', 'selam')])
+    for _ in range(Config.POISON_THRESHOLD):
+        assert queue.lease_messages()
+        clock.advance(Config.QUEUE_LEASE_TIMEOUT)
+    
+    assert queue.lease_messages() == []
+    assert queue.stats()['inbox_dead'] == 1
+
+
+def test_messages_are_partitioned_by_user(queue):
+    queue.put_messages([('m1', 't1', 1, 'a', 'x'), ('m2', 't2', 2, 'b', 'y'), ('m3', 't3', 3, 'c', 'z')])
+    
+    odd = queue.lease_messages(partition=1, partitions=2)
+    even = queue.lease_messages(partition=0, partitions=2)
+    assert sorted(m['message_id'] for m in odd) == ['m1', 'm3']
+    assert [m['message_id'] for m in even] == ['m2']
+
+
+def test_reply_is_queued_once_when_two_workers_complete(queue, clock):
+    queue.put_messages([('m1', 't1', 7, 'ali', 'selam')])
+    queue.lease_messages()
+    clock.advance(Config.QUEUE_LEASE_TIMEOUT)
+    queue.lease_messages()  # kira doldu, ikinci işçi aldı
+    
+    assert queue.complete_message('m1', 't1', 'merhaba') is True
+    assert queue.complete_message('m1', 't1', 'merhaba') is False
+    
+    replies = queue.lease_replies()
+    assert [(r['message_id'], r['text']) for r in replies] == [('m1', 'merhaba')]
+
+
+def test_released_reply_is_retried_after_delay(queue, clock):
+    queue.put_messages([('m1', 't1', 7, 'ali', 'selam')])
+    queue.lease_messages()
+    queue.complete_message('m1', 't1', 'merhaba')
+    
+    reply_ids = [r['id'] for r in queue.lease_replies()]
+    queue.release_replies(reply_ids, delay=30)
+    assert queue.lease_replies() == []
+    
+    clock.advance(30)
+    assert [r['id'] for r in queue.lease_replies()] == reply_ids
+    queue.complete_replies(reply_ids)
+    
+    clock.advance(Config.QUEUE_LEASE_TIMEOUT)
+    assert queue.lease_replies() == []
+
+
+def test_deferred_message_does_not_use_an_attempt(queue, clock):
+    queue.put_messages([('m1', 't1', 7, 'ali', 'hava')])
+    queue.lease_messages()
+    queue.defer_message('m1', 100)
+    
+    assert queue.lease_messages() == []
+    clock.advance(100)
+    assert queue.lease_messages()[0]['attempts'] == 1
+
+
+def test_purge_keeps_latest_message_of_each_thread(queue, clock):
+    queue.put_messages([('m1', 't1', 7, 'ali', 'selam'), ('m3', 't2', 8, 'veli', 'hey')])
+    clock.advance(10)
+    queue.put_messages([('m2', 't1', 7, 'ali', 'nasılsın')])
+    for message in queue.lease_messages():
+        queue.complete_message(message['message_id'], message['thread_id'], 'merhaba')
+    
+    clock.advance(Config.QUEUE_RETENTION + 1)
+    queue.purge()
+    
+    with queue.lock:
+        kept = sorted(row[0] for row in queue.conn.execute('SELECT message_id FROM inbox'))
+    assert kept == ['m2', 'm3']
+    
+    # Çekici sohbetlerin son mesajını yeniden sunar; tekrar cevaplanmaz
+    assert queue.put_messages([('m2', 't1', 7, 'ali', 'nasılsın'), ('m3', 't2', 8, 'veli', 'hey')]) == 0
+    assert queue.lease_messages() == []